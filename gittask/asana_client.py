@@ -1,12 +1,127 @@
+import hashlib
+import os
+import threading
 import asana
-from typing import Optional, List, Dict
+import asana.api_client
+from . import metrics
+from .request_cache import RESPONSE_CACHE
+from typing import Optional, List, Dict, Iterator, Tuple
 import datetime
 
+# Asana accepts between 1 and 100 results per page on collection endpoints
+MAX_PAGE_SIZE = 100
+
+DEFAULT_HOST = "https://app.asana.com/api/1.0"
+
+# Task fields kept in the local task cache, so no-op writes can be skipped
+TASK_OPT_FIELDS = "name,gid,completed,assignee.gid,tags.name,permalink_url"
+GITTASK_URL = "https://github.com/AndreasLF/gittask"
+
+# How long read results are reused. Listings change rarely, search results
+# and open tasks should stay fresh while the user is working.
+USER_TTL = 600.0
+METADATA_TTL = 60.0
+SEARCH_TTL = 15.0
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def _get_shared_pool():
+    """
+    One ThreadPool for the whole process, created on first use.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            from multiprocessing.pool import ThreadPool
+            _shared_pool = ThreadPool()
+        return _shared_pool
+
+# Guards the SDK's ThreadPool while a LazyPoolApiClient swaps it out
+_sdk_pool_lock = threading.Lock()
+
+class LazyPoolApiClient(asana.ApiClient):
+    """
+    asana.ApiClient without the per-client ThreadPool.
+
+    The SDK starts a ThreadPool in every ApiClient and joins it on cleanup, but
+    the pool only serves `async_req` calls, which gittask never makes. Here the
+    pool is a single shared one, created the first time something asks for it.
+    """
+    def __init__(self, *args, **kwargs):
+        # The SDK's __init__ does `self.pool = ThreadPool()`: have it start
+        # nothing, and let it set up everything else (headers, version) itself
+        with _sdk_pool_lock:
+            sdk_thread_pool = asana.api_client.ThreadPool
+            asana.api_client.ThreadPool = lambda: None
+            try:
+                super().__init__(*args, **kwargs)
+            finally:
+                asana.api_client.ThreadPool = sdk_thread_pool
+
+    @property
+    def pool(self):
+        return _get_shared_pool()
+
+    @pool.setter
+    def pool(self, value):
+        # Assigned by the SDK's __init__: the shared pool is used instead
+        pass
+
+    def __del__(self):
+        # The shared pool outlives the clients using it
+        pass
+
+def cache_scope(personal_access_token: str, host: Optional[str]) -> str:
+    """
+    Cache namespace for one user on one API host, so results never leak between tokens.
+    """
+    return hashlib.sha256(f"{host}|{personal_access_token}".encode()).hexdigest()[:16]
+
+def comment_html(text: str, idempotency_key: Optional[str] = None) -> str:
+    """
+    Wrap a comment in <body> with the gittask footer. The idempotency key, if
+    any, is embedded in the footer link.
+    """
+    link = GITTASK_URL
+    if idempotency_key:
+        link = f"{GITTASK_URL}?ref={idempotency_key}"
+    footer = f"\n🤖 created with <a href='{link}'>gittask cli tool</a>"
+    
+    if not text.startswith("<body>"):
+        return f"<body>{text}{footer}</body>"
+    return text.replace("</body>", f"{footer}</body>")
+
+def time_comment_text(duration_seconds: float, branch_name: str) -> str:
+    """
+    Comment text used to log time on free plans.
+    """
+    hours = int(duration_seconds // 3600)
+    minutes = int((duration_seconds % 3600) // 60)
+    
+    time_str = []
+    if hours > 0:
+        time_str.append(f"{hours}h")
+    if minutes > 0:
+        time_str.append(f"{minutes}m")
+        
+    if not time_str:
+        time_str.append("&lt; 1m")
+        
+    return f"⏱️ Worked {' '.join(time_str)} on branch <code>{branch_name}</code>."
+
 class AsanaClient:
-    def __init__(self, personal_access_token: str):
+    def __init__(self, personal_access_token: str, host: Optional[str] = None):
         configuration = asana.Configuration()
         configuration.access_token = personal_access_token
-        self.api_client = asana.ApiClient(configuration)
+        # GITTASK_ASANA_HOST points gittask at another API server, e.g. gittask.fake_asana
+        host = (host or os.environ.get("GITTASK_ASANA_HOST") or "").rstrip("/")
+        if host:
+            configuration.host = host
+        self.cache = RESPONSE_CACHE
+        self.cache_scope = cache_scope(personal_access_token, host or DEFAULT_HOST)
+        self.api_client = LazyPoolApiClient(configuration)
+        metrics.instrument_asana(self.api_client)
         
         self.users_api = asana.UsersApi(self.api_client)
         self.tasks_api = asana.TasksApi(self.api_client)
@@ -20,13 +135,24 @@ class AsanaClient:
         
         # Get current user
         # v5 returns a dict directly
-        self.me = self.users_api.get_user("me", opts={})
+        self.me = self._cached(('me',), lambda: self.users_api.get_user("me", opts={}), USER_TTL)
+
+    def _cached(self, key: Tuple, loader, ttl: float):
+        """
+        Serve a read from the shared response cache. Concurrent identical
+        reads share one request.
+        """
+        return self.cache.get_or_load((self.cache_scope,) + key, loader, ttl)
+
+    def _invalidate(self):
+        """
+        Drop cached reads after a write that may have changed them.
+        """
+        self.cache.invalidate(self.cache_scope)
 
     def close(self):
-        if hasattr(self.api_client, 'pool') and self.api_client.pool:
-            self.api_client.pool.close()
-            self.api_client.pool.join()
-            del self.api_client.pool
+        # Drop kept-alive connections. There is no worker pool to join, see LazyPoolApiClient.
+        self.api_client.rest_client.pool_manager.clear()
 
     def __enter__(self):
         return self
@@ -45,84 +171,139 @@ class AsanaClient:
             "query": query,
             "opt_fields": "name,gid,completed"
         }
-        result = self.typeahead_api.typeahead_for_workspace(
-            workspace_gid,
-            "task",
-            opts
-        )
-        # Result is a generator, convert to list
-        return list(result)
+        def load():
+            result = self.typeahead_api.typeahead_for_workspace(
+                workspace_gid,
+                "task",
+                opts
+            )
+            # Result is a generator, convert to list
+            return list(result)
+        return self._cached(('search_tasks', workspace_gid, query), load, SEARCH_TTL)
 
-    def create_task(self, workspace_gid: str, project_gid: Optional[str], name: str) -> Dict:
+    def create_task(
+        self,
+        workspace_gid: str,
+        project_gid: Optional[str],
+        name: str,
+        tag_gids: Optional[List[str]] = None,
+        follower_gids: Optional[List[str]] = None,
+        notes: Optional[str] = None,
+        assignee_gid: Optional[str] = None,
+    ) -> Dict:
+        """
+        Create a task. Tags, followers and the description are set in the same
+        request, so the task never has to be patched while it propagates.
+        """
         data = {
             "workspace": workspace_gid,
             "name": name,
-            "assignee": self.me['gid']
+            "assignee": assignee_gid or self.me['gid']
         }
         if project_gid:
             data["projects"] = [project_gid]
+        if tag_gids:
+            data["tags"] = list(tag_gids)
+        if follower_gids:
+            data["followers"] = list(follower_gids)
+        if notes:
+            data["notes"] = notes
             
         body = {"data": data}
         result = self.tasks_api.create_task(body, opts={})
+        self._invalidate()
         return result
 
-    def log_time_comment(self, task_gid: str, duration_seconds: float, branch_name: str):
+    def log_time_comment(self, task_gid: str, duration_seconds: float, branch_name: str, idempotency_key: Optional[str] = None):
         """
         Log time as a comment on the task.
         """
-        hours = int(duration_seconds // 3600)
-        minutes = int((duration_seconds % 3600) // 60)
-        
-        time_str = []
-        if hours > 0:
-            time_str.append(f"{hours}h")
-        if minutes > 0:
-            time_str.append(f"{minutes}m")
-            
-        if not time_str:
-            time_str.append("&lt; 1m")
-            
-        text = f"⏱️ Worked {' '.join(time_str)} on branch <code>{branch_name}</code>."
-        self.post_comment(task_gid, text)
+        text = time_comment_text(duration_seconds, branch_name)
+        self.post_comment(task_gid, text, idempotency_key=idempotency_key)
 
-    def post_comment(self, task_gid: str, text: str):
+    def post_comment(self, task_gid: str, text: str, idempotency_key: Optional[str] = None):
         """
         Post a comment to a task.
+        If an idempotency key is given it is embedded in the footer link, so a
+        retried delivery can be detected with has_comment_with_key.
         """
-        
-        if not text.startswith("<body>"):
-            text = f"<body>{text}\n🤖 created with <a href='https://github.com/AndreasLF/gittask'>gittask cli tool</a></body>"
-        else:
-            text = text.replace("</body>", f"\n🤖 created with <a href='https://github.com/AndreasLF/gittask'>gittask cli tool</a></body>")
-            
-        body = {"data": {"html_text": text}}
+        body = {"data": {"html_text": comment_html(text, idempotency_key)}}
         self.stories_api.create_story_for_task(body, task_gid, opts={})
 
+    def has_comment_with_key(self, task_gid: str, idempotency_key: str) -> bool:
+        """
+        Check whether a comment carrying the given idempotency key exists on the task.
+        """
+        stories = self.stories_api.get_stories_for_task(task_gid, opts={'opt_fields': 'html_text'})
+        marker = f"ref={idempotency_key}"
+        return any(marker in (story.get('html_text') or '') for story in stories)
+
+    def get_task(self, task_gid: str) -> Dict:
+        """
+        Get a task's current state (completed, assignee, tags).
+        """
+        return self.tasks_api.get_task(task_gid, opts={'opt_fields': TASK_OPT_FIELDS})
+
     def complete_task(self, task_gid: str):
         """
         Mark a task as completed.
         """
         body = {"data": {"completed": True}}
         self.tasks_api.update_task(body, task_gid, opts={})
+        self._invalidate()
+
+    def _page_opts(self, opts: Dict, page_size: Optional[int], limit: Optional[int]) -> Tuple[Dict, Dict]:
+        """
+        Build query opts and SDK kwargs for a paginated collection request.
+        """
+        kwargs = {}
+        if page_size is not None:
+            if not 1 <= page_size <= MAX_PAGE_SIZE:
+                raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+            opts['limit'] = page_size
+        if limit is not None:
+            kwargs['item_limit'] = limit
+        return opts, kwargs
+
+    def iter_workspaces(self, page_size: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream workspaces. Pages are fetched lazily, so breaking out of the loop stops fetching.
+        """
+        opts, kwargs = self._page_opts({}, page_size, limit)
+        return self.workspaces_api.get_workspaces(opts=opts, **kwargs)
 
     def get_workspaces(self) -> List[Dict]:
-        result = self.workspaces_api.get_workspaces(opts={})
-        return list(result)
+        return self._cached(('workspaces',), lambda: list(self.iter_workspaces()), METADATA_TTL)
 
     def get_workspace_by_gid(self, workspace_gid: str) -> Dict:
-        result = self.workspaces_api.get_workspace(workspace_gid, opts={})
-        return result
+        return self._cached(
+            ('workspace', workspace_gid),
+            lambda: self.workspaces_api.get_workspace(workspace_gid, opts={}),
+            METADATA_TTL,
+        )
+
+    def iter_projects(self, workspace_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream projects in the workspace, one page at a time.
+        """
+        opts, kwargs = self._page_opts({}, page_size, limit)
+        return self.projects_api.get_projects_for_workspace(workspace_gid, opts=opts, **kwargs)
 
     def get_projects(self, workspace_gid: str) -> List[Dict]:
-        result = self.projects_api.get_projects_for_workspace(workspace_gid, opts={})
-        return list(result)
+        return self._cached(('projects', workspace_gid), lambda: list(self.iter_projects(workspace_gid)), METADATA_TTL)
+
+    def iter_tags(self, workspace_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream tags in the workspace, one page at a time.
+        """
+        opts, kwargs = self._page_opts({'opt_fields': 'name,gid'}, page_size, limit)
+        return self.tags_api.get_tags_for_workspace(workspace_gid, opts=opts, **kwargs)
 
     def get_tags(self, workspace_gid: str) -> List[Dict]:
         """
         Get all tags in the workspace.
         """
-        result = self.tags_api.get_tags_for_workspace(workspace_gid, opts={'opt_fields': 'name,gid'})
-        return list(result)
+        return self._cached(('tags', workspace_gid), lambda: list(self.iter_tags(workspace_gid)), METADATA_TTL)
 
     def create_tag(self, workspace_gid: str, name: str, color: Optional[str] = None) -> Dict:
         """
@@ -134,6 +315,7 @@ class AsanaClient:
             
         body = {"data": data}
         result = self.tags_api.create_tag(body, opts={})
+        self._invalidate()
         return result
 
     def add_tag_to_task(self, task_gid: str, tag_gid: str):
@@ -142,18 +324,25 @@ class AsanaClient:
         """
         body = {"data": {"tag": tag_gid}}
         self.tasks_api.add_tag_for_task(body, task_gid)
+        self._invalidate()
 
-    def get_project_tasks(self, project_gid: str) -> List[Dict]:
+    def iter_project_tasks(self, project_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
         """
-        Get all open tasks in a project.
+        Stream open tasks in a project, one page at a time.
         """
         opts = {
             'project': project_gid,
             'completed_since': 'now',  # Only incomplete tasks
-            'opt_fields': 'name,gid,completed'
+            'opt_fields': TASK_OPT_FIELDS
         }
-        result = self.tasks_api.get_tasks(opts=opts)
-        return list(result)
+        opts, kwargs = self._page_opts(opts, page_size, limit)
+        return self.tasks_api.get_tasks(opts=opts, **kwargs)
+
+    def get_project_tasks(self, project_gid: str) -> List[Dict]:
+        """
+        Get all open tasks in a project.
+        """
+        return self._cached(('project_tasks', project_gid), lambda: list(self.iter_project_tasks(project_gid)), SEARCH_TTL)
 
     def assign_task(self, task_gid: str, assignee_gid: str):
         """
@@ -161,13 +350,20 @@ class AsanaClient:
         """
         body = {"data": {"assignee": assignee_gid}}
         self.tasks_api.update_task(body, task_gid, opts={})
+        self._invalidate()
+
+    def iter_custom_fields(self, workspace_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Stream custom fields in the workspace, one page at a time.
+        """
+        opts, kwargs = self._page_opts({'opt_fields': 'name,gid,type,enum_options'}, page_size, limit)
+        return self.custom_fields_api.get_custom_fields_for_workspace(workspace_gid, opts=opts, **kwargs)
 
     def get_custom_fields(self, workspace_gid: str) -> List[Dict]:
         """
         Get all custom fields in the workspace.
         """
-        result = self.custom_fields_api.get_custom_fields_for_workspace(workspace_gid, opts={'opt_fields': 'name,gid,type,enum_options'})
-        return list(result)
+        return self._cached(('custom_fields', workspace_gid), lambda: list(self.iter_custom_fields(workspace_gid)), METADATA_TTL)
 
     def get_task_with_fields(self, task_gid: str) -> Dict:
         """
@@ -183,7 +379,7 @@ class AsanaClient:
         task = self.tasks_api.get_task(task_gid, opts={'opt_fields': 'actual_time_minutes'})
         return task.get('actual_time_minutes')
 
-    def add_time_entry(self, task_gid: str, duration_seconds: int, entered_on: Optional[datetime.date] = None):
+    def add_time_entry(self, task_gid: str, duration_seconds: int, entered_on: Optional[datetime.date] = None) -> Dict:
         """
         Add a time tracking entry to a task.
         """
@@ -199,4 +395,12 @@ class AsanaClient:
             "entered_on": entered_on.isoformat()
         }
         body = {"data": data}
-        self.time_tracking_api.create_time_tracking_entry(body, task_gid, opts={})
+        return self.time_tracking_api.create_time_tracking_entry(body, task_gid, opts={})
+
+    def get_time_entries(self, task_gid: str) -> List[Dict]:
+        """
+        Get the time tracking entries on a task.
+        """
+        opts = {'opt_fields': 'duration_minutes,entered_on,created_by.gid'}
+        result = self.time_tracking_api.get_time_tracking_entries_for_task(task_gid, opts=opts)
+        return list(result)
@@ -0,0 +1,322 @@
+import asyncio
+import datetime
+import os
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from . import metrics
+from .asana_client import (
+    DEFAULT_HOST, MAX_PAGE_SIZE, METADATA_TTL, SEARCH_TTL, TASK_OPT_FIELDS, USER_TTL,
+    cache_scope, comment_html, time_comment_text,
+)
+from .request_cache import RESPONSE_CACHE
+from .sync_engine import entry_minutes
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+MAX_RETRIES = 3
+
+class AsanaAPIError(Exception):
+    """
+    Error response from the Asana API. `status` matches asana.rest.ApiException.
+    """
+    def __init__(self, status: int, message: str, headers: Optional[Dict] = None):
+        super().__init__(f"({status}) {message}")
+        self.status = status
+        self.headers = headers or {}
+
+class AsyncAsanaClient:
+    """
+    asyncio counterpart of AsanaClient for the TUI.
+
+    One instance keeps a pool of keep-alive connections (HTTP/2 when `h2` is
+    installed), so many requests can run concurrently on the event loop.
+    Cancelling the awaiting task aborts the request.
+    """
+    def __init__(self, personal_access_token: str, host: Optional[str] = None, timeout: float = 30.0):
+        host = host or os.environ.get("GITTASK_ASANA_HOST") or DEFAULT_HOST
+        self.http = httpx.AsyncClient(
+            base_url=host.rstrip("/"),
+            headers={
+                "Authorization": f"Bearer {personal_access_token}",
+                "Accept": "application/json",
+            },
+            http2=HTTP2_AVAILABLE,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        self.me = None
+        # Shared with AsanaClient, so results fetched by either are reused
+        self.cache = RESPONSE_CACHE
+        self.cache_scope = cache_scope(personal_access_token, host.rstrip("/"))
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _request(self, method: str, path: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict:
+        """
+        Send a request and return the decoded JSON body.
+        429s are retried after Retry-After (Asana did not process the request),
+        5xx only for reads.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        body = {"data": data} if data is not None else None
+
+        for attempt in range(MAX_RETRIES + 1):
+            start = time.perf_counter()
+            status = None
+            headers = {}
+            try:
+                response = await self.http.request(method, path, params=params, json=body)
+                status = response.status_code
+                headers = response.headers
+            finally:
+                metrics.record(
+                    "asana",
+                    metrics.asana_endpoint(method, path),
+                    (time.perf_counter() - start) * 1000,
+                    status=status,
+                    retries=attempt,
+                    response_bytes=len(response.content) if status is not None else None,
+                    rate_limit=metrics.rate_limit_headers(headers),
+                )
+
+            retryable = status == 429 or (status >= 500 and method == "GET")
+            if retryable and attempt < MAX_RETRIES:
+                retry_after = headers.get("Retry-After")
+                await asyncio.sleep(float(retry_after) if retry_after else 2 ** attempt)
+                continue
+
+            if status >= 400:
+                try:
+                    errors = response.json().get('errors') or []
+                    message = "; ".join(e.get('message', '') for e in errors) or response.reason_phrase
+                except ValueError:
+                    message = response.reason_phrase
+                raise AsanaAPIError(status, message, dict(headers))
+
+            return response.json()
+
+    async def _get(self, path: str, params: Optional[Dict] = None):
+        return (await self._request("GET", path, params=params))['data']
+
+    async def _paginate(
+        self,
+        path: str,
+        params: Optional[Dict] = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield items of a collection, fetching the next page only when needed.
+        """
+        if page_size is not None and not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        params = dict(params or {})
+        params['limit'] = page_size or MAX_PAGE_SIZE
+        count = 0
+
+        while True:
+            if limit is not None:
+                params['limit'] = min(params['limit'], limit - count)
+                if params['limit'] <= 0:
+                    return
+            result = await self._request("GET", path, params=params)
+            for item in result.get('data') or []:
+                yield item
+                count += 1
+            next_page = result.get('next_page')
+            if not next_page:
+                return
+            params['offset'] = next_page['offset']
+
+    async def _collect(self, items: AsyncIterator[Dict]) -> List[Dict]:
+        return [item async for item in items]
+
+    async def _cached(self, key: tuple, loader, ttl: float):
+        """
+        Serve a read from the shared response cache. Concurrent identical
+        reads share one request.
+        """
+        return await self.cache.aget_or_load((self.cache_scope,) + key, loader, ttl)
+
+    async def _iter_cached(self, key: tuple, items: AsyncIterator[Dict], limit: Optional[int], ttl: float) -> AsyncIterator[Dict]:
+        """
+        Stream a collection from the cache if it was fully fetched recently,
+        otherwise from the API, caching it once it has been read to the end.
+        """
+        key = (self.cache_scope,) + key
+        cached = self.cache.get(key)
+        if cached is not None:
+            for item in cached[:limit] if limit is not None else cached:
+                yield item
+            return
+
+        generation = self.cache.generation(key)
+        collected = []
+        async for item in items:
+            collected.append(item)
+            yield item
+        if limit is None:
+            self.cache.set(key, collected, ttl, generation)
+
+    def _invalidate(self):
+        self.cache.invalidate(self.cache_scope)
+
+    async def get_user_gid(self) -> str:
+        if self.me is None:
+            self.me = await self._cached(('me',), lambda: self._get("/users/me"), USER_TTL)
+        return self.me['gid']
+
+    async def search_tasks(self, workspace_gid: str, query: str) -> List[Dict]:
+        """
+        Search for tasks in a workspace using Typeahead.
+        """
+        params = {
+            "resource_type": "task",
+            "query": query,
+            "opt_fields": "name,gid,completed",
+        }
+        return await self._cached(
+            ('search_tasks', workspace_gid, query),
+            lambda: self._get(f"/workspaces/{workspace_gid}/typeahead", params),
+            SEARCH_TTL,
+        )
+
+    async def create_task(
+        self,
+        workspace_gid: str,
+        project_gid: Optional[str],
+        name: str,
+        tag_gids: Optional[List[str]] = None,
+        follower_gids: Optional[List[str]] = None,
+        notes: Optional[str] = None,
+        assignee_gid: Optional[str] = None,
+    ) -> Dict:
+        """
+        Create a task with its tags, followers and description in one request.
+        """
+        data = {
+            "workspace": workspace_gid,
+            "name": name,
+            "assignee": assignee_gid or await self.get_user_gid(),
+        }
+        if project_gid:
+            data["projects"] = [project_gid]
+        if tag_gids:
+            data["tags"] = list(tag_gids)
+        if follower_gids:
+            data["followers"] = list(follower_gids)
+        if notes:
+            data["notes"] = notes
+        task = (await self._request("POST", "/tasks", data=data))['data']
+        self._invalidate()
+        return task
+
+    async def log_time_comment(self, task_gid: str, duration_seconds: float, branch_name: str, idempotency_key: Optional[str] = None):
+        text = time_comment_text(duration_seconds, branch_name)
+        await self.post_comment(task_gid, text, idempotency_key=idempotency_key)
+
+    async def post_comment(self, task_gid: str, text: str, idempotency_key: Optional[str] = None):
+        data = {"html_text": comment_html(text, idempotency_key)}
+        await self._request("POST", f"/tasks/{task_gid}/stories", data=data)
+
+    async def has_comment_with_key(self, task_gid: str, idempotency_key: str) -> bool:
+        marker = f"ref={idempotency_key}"
+        async for story in self._paginate(f"/tasks/{task_gid}/stories", {'opt_fields': 'html_text'}):
+            if marker in (story.get('html_text') or ''):
+                return True
+        return False
+
+    async def complete_task(self, task_gid: str):
+        await self._request("PUT", f"/tasks/{task_gid}", data={"completed": True})
+        self._invalidate()
+
+    def iter_workspaces(self, page_size: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Dict]:
+        return self._paginate("/workspaces", page_size=page_size, limit=limit)
+
+    async def get_workspaces(self) -> List[Dict]:
+        return await self._cached(('workspaces',), lambda: self._collect(self.iter_workspaces()), METADATA_TTL)
+
+    async def get_workspace_by_gid(self, workspace_gid: str) -> Dict:
+        return await self._cached(('workspace', workspace_gid), lambda: self._get(f"/workspaces/{workspace_gid}"), METADATA_TTL)
+
+    def iter_projects(self, workspace_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Dict]:
+        return self._paginate(f"/workspaces/{workspace_gid}/projects", page_size=page_size, limit=limit)
+
+    async def get_projects(self, workspace_gid: str) -> List[Dict]:
+        return await self._cached(('projects', workspace_gid), lambda: self._collect(self.iter_projects(workspace_gid)), METADATA_TTL)
+
+    def iter_tags(self, workspace_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Dict]:
+        items = self._paginate(f"/workspaces/{workspace_gid}/tags", {'opt_fields': 'name,gid'}, page_size, limit)
+        return self._iter_cached(('tags', workspace_gid), items, limit, METADATA_TTL)
+
+    async def get_tags(self, workspace_gid: str) -> List[Dict]:
+        return await self._cached(('tags', workspace_gid), lambda: self._collect(self.iter_tags(workspace_gid)), METADATA_TTL)
+
+    async def create_tag(self, workspace_gid: str, name: str, color: Optional[str] = None) -> Dict:
+        data = {"workspace": workspace_gid, "name": name}
+        if color:
+            data["color"] = color
+        tag = (await self._request("POST", "/tags", data=data))['data']
+        self._invalidate()
+        return tag
+
+    async def add_tag_to_task(self, task_gid: str, tag_gid: str):
+        await self._request("POST", f"/tasks/{task_gid}/addTag", data={"tag": tag_gid})
+        self._invalidate()
+
+    def iter_project_tasks(self, project_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Dict]:
+        params = {
+            'project': project_gid,
+            'completed_since': 'now',  # Only incomplete tasks
+            'opt_fields': TASK_OPT_FIELDS,
+        }
+        return self._paginate("/tasks", params, page_size, limit)
+
+    async def get_project_tasks(self, project_gid: str) -> List[Dict]:
+        return await self._cached(('project_tasks', project_gid), lambda: self._collect(self.iter_project_tasks(project_gid)), SEARCH_TTL)
+
+    async def assign_task(self, task_gid: str, assignee_gid: str):
+        await self._request("PUT", f"/tasks/{task_gid}", data={"assignee": assignee_gid})
+        self._invalidate()
+
+    def iter_custom_fields(self, workspace_gid: str, page_size: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Dict]:
+        params = {'opt_fields': 'name,gid,type,enum_options'}
+        return self._paginate(f"/workspaces/{workspace_gid}/custom_fields", params, page_size, limit)
+
+    async def get_custom_fields(self, workspace_gid: str) -> List[Dict]:
+        return await self._cached(('custom_fields', workspace_gid), lambda: self._collect(self.iter_custom_fields(workspace_gid)), METADATA_TTL)
+
+    async def get_task_with_fields(self, task_gid: str) -> Dict:
+        params = {'opt_fields': 'name,custom_fields.name,custom_fields.gid,custom_fields.type,custom_fields.display_value,custom_fields.number_value,actual_time_minutes'}
+        return await self._get(f"/tasks/{task_gid}", params)
+
+    async def get_actual_time(self, task_gid: str) -> Optional[float]:
+        task = await self._get(f"/tasks/{task_gid}", {'opt_fields': 'actual_time_minutes'})
+        return task.get('actual_time_minutes')
+
+    async def add_time_entry(self, task_gid: str, duration_seconds: int, entered_on: Optional[datetime.date] = None) -> Dict:
+        if entered_on is None:
+            entered_on = datetime.date.today()
+        data = {
+            "duration_minutes": entry_minutes(duration_seconds),
+            "entered_on": entered_on.isoformat(),
+        }
+        return (await self._request("POST", f"/tasks/{task_gid}/time_tracking_entries", data=data))['data']
+
+    async def get_time_entries(self, task_gid: str) -> List[Dict]:
+        params = {'opt_fields': 'duration_minutes,entered_on,created_by.gid'}
+        return await self._collect(self._paginate(f"/tasks/{task_gid}/time_tracking_entries", params))
@@ -1,10 +1,9 @@
 import typer
 from ..config import ConfigManager
 import questionary
-from rich.console import Console
+from ..output import console
 
 app = typer.Typer()
-console = Console()
 
 @app.command()
 def login(
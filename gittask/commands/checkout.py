@@ -4,11 +4,12 @@ from ..database import DBManager
 from ..config import ConfigManager
 from ..asana_client import AsanaClient
 import questionary
-import time
-from rich.console import Console
-from ..utils import select_and_create_tags
-
-console = Console()
+from ..output import console
+from ..utils import select_and_create_tags, resolve_task_project
+from .. import outbox
+from .. import services
+from ..services import ServiceError
+from ..services import checkout as checkout_service
 
 def checkout(
     branch_name: str = typer.Argument(..., help="Branch to checkout"),
@@ -21,26 +22,13 @@ def checkout(
     db = DBManager()
     config = ConfigManager()
     
-    # 1. Stop current session
-    current_branch = git.get_current_branch()
-    repo_path = git.get_repo_root()
-    
-    if current_branch == branch_name:
-        console.print(f"[yellow]Already on branch {branch_name}[/yellow]")
-        # We still want to ensure tracking is active, so we proceed to step 3
-    else:
-        if current_branch != "DETACHED_HEAD":
-            # Just stop any active session to be safe/clean
-            db.stop_any_active_session()
-            console.print(f"[yellow]Stopped tracking time for {current_branch}[/yellow]")
-
-        # 2. Checkout new branch
-        try:
-            git.checkout_branch(branch_name, create_new=new_branch)
-            console.print(f"[green]Switched to branch {branch_name}[/green]")
-        except Exception as e:
-            console.print(f"[red]Error checking out branch: {e}[/red]")
-            raise typer.Exit(code=1)
+    # 1. Stop current session, 2. Checkout new branch
+    progress = services.console_progress(console)
+    try:
+        repo_path = checkout_service.switch_branch(db, git, branch_name, new_branch, progress)
+    except ServiceError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
 
     # 3. Check if linked to Asana
     task_info = db.get_task_for_branch(branch_name, repo_path)
@@ -60,7 +48,6 @@ def checkout(
             # We still allow checkout, just no tracking linked to a task
             return
 
-        client = AsanaClient(token)
         workspace_gid = config.get_default_workspace()
         
         if not workspace_gid:
@@ -69,15 +56,17 @@ def checkout(
 
 
         with AsanaClient(token) as client:
-            project_gid = config.get_default_project()
+            project_gid = resolve_task_project(client, db, config, workspace_gid)
             
             # Fetch project tasks for autocomplete
-            console.print("Fetching project tasks...")
-            try:
-                project_tasks = client.get_project_tasks(project_gid)
-            except Exception as e:
-                console.print(f"[red]Failed to fetch project tasks: {e}[/red]")
-                project_tasks = []
+            project_tasks = []
+            if project_gid:
+                console.print("Fetching project tasks...")
+                try:
+                    project_tasks = client.get_project_tasks(project_gid)
+                    db.cache_tasks(project_tasks)
+                except Exception as e:
+                    console.print(f"[red]Failed to fetch project tasks: {e}[/red]")
             
             task_names = [t['name'] for t in project_tasks]
             from prompt_toolkit.completion import WordCompleter
@@ -106,11 +95,15 @@ def checkout(
                 task_name = existing_task['name']
                 console.print(f"[green]Selected existing task: {task_name}[/green]")
                 
-                # Assign to self
+                # Assign to self (delivered in the background), unless it already is
+                queued = False
                 try:
                     user_gid = client.get_user_gid()
-                    client.assign_task(task_gid, user_gid)
-                    console.print(f"[green]Assigned task to you.[/green]")
+                    if outbox.enqueue_assign(db, task_gid, user_gid):
+                        queued = True
+                        console.print(f"[green]Assigning task to you.[/green]")
+                    else:
+                        console.print("[dim]Task is already assigned to you.[/dim]")
                 except Exception as e:
                     console.print(f"[red]Failed to assign task: {e}[/red]")
                 
@@ -118,12 +111,15 @@ def checkout(
                 if questionary.confirm("Add tags to this task?").ask():
                     tag_gids = select_and_create_tags(client, workspace_gid, db)
                     if tag_gids:
-                        console.print(f"Applying {len(tag_gids)} tags...")
-                        for tag_gid in tag_gids:
-                            try:
-                                client.add_tag_to_task(task_gid, tag_gid)
-                            except Exception as e:
-                                console.print(f"[red]Failed to add tag: {e}[/red]")
+                        applied = outbox.enqueue_tags(db, task_gid, tag_gids)
+                        if applied:
+                            queued = True
+                            console.print(f"Applying {applied} tags...")
+                        if applied < len(tag_gids):
+                            console.print(f"[dim]{len(tag_gids) - applied} tags were already on the task.[/dim]")
+
+                if queued:
+                    outbox.deliver_in_background()
 
             else:
                 # Create new task
@@ -133,31 +129,15 @@ def checkout(
                     # Tag Selection
                     tag_gids = select_and_create_tags(client, workspace_gid, db)
 
-                    # Create Task
+                    # Create Task (tags are set in the same request)
                     try:
-                        new_task = client.create_task(workspace_gid, project_gid, task_name)
+                        new_task = client.create_task(workspace_gid, project_gid, task_name, tag_gids=tag_gids)
+                        db.cache_tasks([new_task])
                         task_gid = new_task['gid']
                         task_name = new_task['name']
                         console.print(f"[green]Created task: {task_name}[/green]")
-                        
-                        # Apply Tags
                         if tag_gids:
-                            console.print(f"Applying {len(tag_gids)} tags...")
-                            for tag_gid in tag_gids:
-                                try:
-                                    # Retry logic for tag addition as task creation might not be propagated yet
-                                    max_retries = 5
-                                    for attempt in range(max_retries):
-                                        try:
-                                            client.add_tag_to_task(task_gid, tag_gid)
-                                            break
-                                        except Exception as e:
-                                            if "404" in str(e) and attempt < max_retries - 1:
-                                                time.sleep(1 * (attempt + 1))  # Exponential backoff: 1s, 2s, 3s, 4s
-                                                continue
-                                            raise e
-                                except Exception as e:
-                                    console.print(f"[red]Failed to add tag: {e}[/red]")
+                            console.print(f"Applied {len(tag_gids)} tags.")
                     except Exception as e:
                          console.print(f"[red]Failed to create task: {e}[/red]")
                          return
@@ -172,28 +152,14 @@ def checkout(
                 repo_path,
                 task_gid, 
                 task_name, 
-                project_gid=config.get_default_project() or "", 
+                project_gid=project_gid or "", 
                 workspace_gid=workspace_gid
             )
             task_info = {'asana_task_gid': task_gid, 'asana_task_name': task_name}
 
     # 4. Start new session
     if task_info:
-        # Check if we are already tracking this task
-        from tinydb import Query
-        Session = Query()
-        open_sessions = db.time_sessions.search(
-            (Session.branch == branch_name) & 
-            (Session.repo_path == repo_path) & 
-            (Session.end_time == None)
-        )
-        
-        if open_sessions:
-             console.print(f"[yellow]Already tracking time for '{branch_name}'[/yellow]")
-        else:
-            db.start_session(branch_name, repo_path, task_info['asana_task_gid'])
-            console.print(f"[bold green]Started tracking time for '{branch_name}' -> '{task_info['asana_task_name']}'[/bold green]")
-            
+        checkout_service.start_tracking(db, branch_name, repo_path, task_info, progress)
     else:
         console.print("[yellow]Time tracking disabled for this branch (not linked).[/yellow]")
 
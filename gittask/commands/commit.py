@@ -1,12 +1,11 @@
 import typer
-from rich.console import Console
+from ..output import console
 from ..config import ConfigManager
 from ..database import DBManager
 from ..git_handler import GitHandler
 from ..asana_client import AsanaClient
 import subprocess
 
-console = Console()
 config = ConfigManager()
 db = DBManager()
 git = GitHandler()
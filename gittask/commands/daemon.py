@@ -0,0 +1,53 @@
+import datetime
+import time
+import typer
+from ..output import console
+from .. import daemon as resident
+
+app = typer.Typer()
+
+@app.command()
+def start(
+    foreground: bool = typer.Option(False, "--foreground", help="Run in this terminal instead of in the background"),
+):
+    """
+    Start the gittask daemon. Commands like status, start, stop and sync are then run by it.
+    """
+    if resident.send({'op': "ping"}) is not None:
+        console.print("[yellow]The gittask daemon is already running.[/yellow]")
+        return
+
+    if foreground:
+        console.print(f"Serving on {resident.socket_path()} (Ctrl+C to stop)")
+        try:
+            resident.serve()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if not resident.spawn():
+        console.print("[red]The gittask daemon did not start. See the daemon.log next to its socket.[/red]")
+        raise typer.Exit(code=1)
+    console.print("[green]gittask daemon started.[/green]")
+
+@app.command()
+def stop():
+    """
+    Stop the gittask daemon.
+    """
+    if resident.send({'op': "shutdown"}) is None:
+        console.print("[yellow]The gittask daemon is not running.[/yellow]")
+        return
+    console.print("[green]gittask daemon stopped.[/green]")
+
+@app.command()
+def status():
+    """
+    Show whether the gittask daemon is running.
+    """
+    info = resident.send({'op': "ping"})
+    if info is None or 'pid' not in info:
+        console.print("[yellow]The gittask daemon is not running. Commands run on their own.[/yellow]")
+        return
+    uptime = datetime.timedelta(seconds=int(time.time() - info['started_at']))
+    console.print(f"[green]Running[/green] (pid {info['pid']}, up {uptime}, {info['served']} requests) on {resident.socket_path()}")
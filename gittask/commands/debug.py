@@ -0,0 +1,118 @@
+import typer
+from ..output import console
+from rich.table import Table
+from typing import List
+from .. import metrics
+
+app = typer.Typer()
+
+@app.command(name="api-stats")
+def api_stats(
+    by: str = typer.Option("endpoint", "--by", help="Group by 'endpoint' or 'command'"),
+    service: str = typer.Option(None, "--service", help="Only show 'asana' or 'github' calls"),
+    clear: bool = typer.Option(False, "--clear", help="Delete recorded metrics"),
+):
+    """
+    Show API latency percentiles recorded by previous commands.
+    """
+    if clear:
+        metrics.clear()
+        console.print("[green]Metrics cleared.[/green]")
+        return
+
+    if by not in ("endpoint", "command"):
+        console.print("[red]--by must be 'endpoint' or 'command'.[/red]")
+        raise typer.Exit(code=1)
+
+    records = metrics.load_records()
+    if service:
+        records = [r for r in records if r['service'] == service]
+
+    if not records:
+        console.print("[yellow]No API calls recorded yet.[/yellow]")
+        return
+
+    table = Table(title=f"API calls by {by} ({len(records)} calls)")
+    table.add_column("Endpoint" if by == "endpoint" else "Command", style="cyan", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("Retries", justify="right", style="yellow")
+    table.add_column("p50 ms", justify="right", style="green")
+    table.add_column("p95 ms", justify="right", style="magenta")
+    table.add_column("p99 ms", justify="right", style="magenta")
+    table.add_column("Total s", justify="right")
+    table.add_column("Rate limit", style="dim")
+
+    for row in metrics.summarize(records, by=by):
+        rate_limit = row['rate_limit'] or {}
+        remaining = rate_limit.get('x-ratelimit-remaining')
+        retry_after = rate_limit.get('retry-after')
+        if retry_after:
+            rate_limit_str = f"retry after {retry_after}s"
+        elif remaining:
+            rate_limit_str = f"{remaining} left"
+        else:
+            rate_limit_str = ""
+
+        table.add_row(
+            row['key'],
+            str(row['calls']),
+            str(row['errors']),
+            str(row['retries']),
+            f"{row['p50']:.0f}",
+            f"{row['p95']:.0f}",
+            f"{row['p99']:.0f}",
+            f"{row['total_ms'] / 1000:.2f}",
+            rate_limit_str,
+        )
+
+    console.print(table)
+
+@app.command(name="startup")
+def startup(
+    commands: List[str] = typer.Argument(None, help="Commands to measure, e.g. 'status' or '--help' (default: all)"),
+    runs: int = typer.Option(5, "--runs", help="Runs per command, the fastest is reported"),
+    top: int = typer.Option(4, "--top", help="Heaviest imported packages to show per command"),
+):
+    """
+    Measure cold-start time and import cost of each command against its budget.
+    """
+    from .. import startup as profiler
+    from ..main import COMMANDS
+
+    names = commands or [profiler.HELP, *COMMANDS]
+    unknown = [n for n in names if n != profiler.HELP and n not in COMMANDS]
+    if unknown:
+        console.print(f"[red]Unknown command(s): {', '.join(unknown)}[/red]")
+        raise typer.Exit(code=1)
+
+    budgets = profiler.budgets()
+    base = profiler.baseline(runs)
+    table = Table(title=f"Start-up time on top of Python ({base * 1000:.0f} ms), fastest of {runs} runs")
+    table.add_column("Command", style="cyan", no_wrap=True)
+    table.add_column("ms", justify="right")
+    table.add_column("Budget", justify="right", style="dim")
+    table.add_column("Heaviest imports (ms)")
+    table.add_column("Heavy libraries")
+
+    problems = []
+    with console.status("Measuring..."):
+        for name in names:
+            result = profiler.measure(name, runs=runs, base=base)
+            issues = profiler.check(result, budgets[name])
+            problems.extend(issues)
+            breakdown = ", ".join(f"{package} {ms:.0f}" for package, ms in profiler.package_breakdown(result['imports'], top))
+            style = "red" if issues else "green"
+            table.add_row(
+                name,
+                f"[{style}]{result['ms']:.0f}[/{style}]",
+                str(budgets[name]),
+                breakdown,
+                ", ".join(result['heavy']),
+            )
+
+    console.print(table)
+    if problems:
+        for problem in problems:
+            console.print(f"[red]{problem}[/red]")
+        raise typer.Exit(code=1)
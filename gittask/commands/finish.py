@@ -1,19 +1,79 @@
 import typer
-from rich.console import Console
+from ..output import console
 from ..config import ConfigManager
 from ..database import DBManager
 from ..git_handler import GitHandler
 from ..asana_client import AsanaClient
 from .pr import get_github_client, get_github_repo
+from .. import outbox
+from .. import scheduler
+from .. import sync_engine
 import questionary
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 app = typer.Typer()
-console = Console()
 config = ConfigManager()
 db = DBManager()
 git = GitHandler()
 
+# How long to wait for a running sync before leaving this branch's time to the next one
+SYNC_LOCK_TIMEOUT = 30
+
+def run_steps(steps: Dict[str, Tuple[Callable[[], Any], List[str]]]) -> Dict[str, Future]:
+    """
+    Start every step at once; a step first waits for the steps it depends on.
+    Returns a future per step name. A step fails if one of its dependencies did.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(steps))
+    futures = {}
+
+    def run(func, deps):
+        for dep in deps:
+            futures[dep].result()
+        return func()
+
+    # Dependencies are submitted first, so a waiting step never waits on an unknown name
+    for name, (func, deps) in steps.items():
+        futures[name] = executor.submit(run, func, deps)
+    executor.shutdown(wait=False)
+    return futures
+
+def sync_branch_time(token: Optional[str], branch: str) -> Optional[int]:
+    """
+    Post the branch's closed sessions to Asana, waiting for a running sync to
+    finish first. Returns how many were synced, or None if that sync is still
+    running; the sessions then stay pending for the next sync.
+    """
+    if not token:
+        return 0
+    with outbox.delivery_lock(db, "sync.lock", timeout=SYNC_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            # The running sync may have planned its sessions before this one
+            # was stopped: make sure another is scheduled once it is due
+            scheduler.trigger(db)
+            return None
+        with AsanaClient(token) as client:
+            paid_plan = config.get_paid_plan_status()
+            # A session an interrupted sync left in flight may be in Asana already
+            sync_engine.reconcile_in_flight(db, client, paid_plan)
+            sessions_to_sync = [s for s in sync_engine.pending_sessions(db) if s['branch'] == branch]
+            for group in sync_engine.group_sessions(sessions_to_sync):
+                sync_engine.deliver_sessions(db, client, group, paid_plan)
+    return len(sessions_to_sync)
+
+def find_open_pr(branch: str):
+    g = get_github_client()
+    repo = get_github_repo(g)
+    pulls = repo.get_pulls(head=f"{repo.owner.login}:{branch}", state='open')
+    # Iterating fetches the first page only; totalCount would cost another request
+    return next(iter(pulls), None)
+
+def fetch_task(token: str, task_gid: str) -> Dict:
+    with AsanaClient(token) as client:
+        return client.get_task(task_gid)
+
 @app.command()
 def finish():
     """
@@ -28,9 +88,19 @@ def finish():
         if not questionary.confirm("Do you want to proceed with cleanup anyway?").ask():
             raise typer.Exit()
 
+    # The network lookups don't depend on each other: fetch the PR and the task
+    # while the timer stops and time syncs, and only prompt once they are in
+    token = config.get_api_token()
+    steps = run_steps({
+        'stop': (lambda: db.stop_current_session(current_branch, repo_path), []),
+        'sync': (lambda: sync_branch_time(token, current_branch), ['stop']),
+        'pr': (lambda: find_open_pr(current_branch), []),
+        'task': (lambda: fetch_task(token, task_info['asana_task_gid']) if task_info and token else None, []),
+    })
+
     # 1. Stop Timer
     console.print("⏱️  Stopping timer...")
-    session = db.stop_current_session(current_branch, repo_path)
+    session = steps['stop'].result()
     if session:
         console.print(f"[green]Stopped session ({int(session['duration_seconds'] // 60)}m).[/green]")
     else:
@@ -38,36 +108,24 @@ def finish():
 
     # 1.5 Sync Time
     console.print("🔄 Syncing time to Asana...")
-    token = config.get_api_token()
     if token:
         try:
-            with AsanaClient(token) as client:
-                unsynced = db.get_unsynced_sessions()
-                # Filter for current branch
-                sessions_to_sync = [s for s in unsynced if s['end_time'] is not None and s['branch'] == current_branch]
-                
-                if sessions_to_sync:
-                    for session in sessions_to_sync:
-                        if config.get_paid_plan_status():
-                            client.add_time_entry(session['task_gid'], session['duration_seconds'])
-                        else:
-                            client.log_time_comment(session['task_gid'], session['duration_seconds'], session['branch'])
-                        db.mark_session_synced(session['id'])
-                    console.print(f"[green]Synced {len(sessions_to_sync)} sessions.[/green]")
-                else:
-                    console.print("No time to sync for this branch.")
+            synced = steps['sync'].result()
+            if synced is None:
+                console.print("[yellow]Another sync is still running. This branch's time will be posted by the next `gt sync` or auto-sync.[/yellow]")
+            elif synced:
+                console.print(f"[green]Synced {synced} sessions.[/green]")
+            else:
+                console.print("No time to sync for this branch.")
         except Exception as e:
              console.print(f"[red]Failed to sync time: {e}[/red]")
 
     # 2. Check & Merge PR
     console.print("🔍 Checking for open Pull Requests...")
     try:
-        g = get_github_client()
-        repo = get_github_repo(g)
-        pulls = repo.get_pulls(head=f"{repo.owner.login}:{current_branch}", state='open')
+        pr = steps['pr'].result()
         
-        if pulls.totalCount > 0:
-            pr = pulls[0]
+        if pr is not None:
             console.print(f"Found PR #{pr.number}: {pr.title}")
             if questionary.confirm(f"Merge Pull Request #{pr.number}?").ask():
                 try:
@@ -82,13 +140,21 @@ def finish():
 
     # 3. Close Asana Task
     if task_info:
-        if questionary.confirm(f"Mark Asana task '{task_info['asana_task_name']}' as completed?").ask():
-            token = config.get_api_token()
+        try:
+            task = steps['task'].result()
+        except Exception:
+            # Not knowing the task's state is no reason not to offer completing it
+            task = None
+        if task:
+            db.cache_tasks([task])
+        if task and task.get('completed') is True:
+            console.print(f"Asana task '{task_info['asana_task_name']}' is already completed.")
+        elif questionary.confirm(f"Mark Asana task '{task_info['asana_task_name']}' as completed?").ask():
             if token:
                 try:
-                    with AsanaClient(token) as client:
-                        client.complete_task(task_info['asana_task_gid'])
-                        console.print(f"[green]Asana task completed![/green]")
+                    outbox.enqueue(db, 'complete_task', task_info['asana_task_gid'])
+                    outbox.deliver_in_background()
+                    console.print(f"[green]Asana task will be marked completed.[/green]")
                 except Exception as e:
                     console.print(f"[red]Failed to complete Asana task: {e}[/red]")
             else:
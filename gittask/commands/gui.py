@@ -0,0 +1,8 @@
+def gui():
+    """
+    Launch the Graphical User Interface (TUI).
+    """
+    from ..tui.app import GitTaskApp
+
+    app = GitTaskApp()
+    app.run()
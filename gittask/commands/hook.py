@@ -0,0 +1,66 @@
+import os
+import stat
+import subprocess
+import sys
+import typer
+from ..output import console
+from ..hook import HOOK_MARKER
+
+app = typer.Typer()
+
+HOOK_NAME = "post-checkout"
+
+def hook_script() -> str:
+    return (
+        "#!/bin/sh\n"
+        f"{HOOK_MARKER}: switch time tracking to the checked out branch\n"
+        f"exec \"{sys.executable}\" -m gittask.hook {HOOK_NAME} \"$@\"\n"
+    )
+
+def hook_path() -> str:
+    """
+    Path of the post-checkout hook, honouring core.hooksPath and worktrees.
+    """
+    try:
+        hooks_dir = subprocess.run(
+            ["git", "rev-parse", "--git-path", "hooks"],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except subprocess.CalledProcessError:
+        console.print("[red]Not in a git repository.[/red]")
+        raise typer.Exit(code=1)
+    return os.path.abspath(os.path.join(hooks_dir, HOOK_NAME))
+
+def _is_ours(path: str) -> bool:
+    with open(path) as f:
+        return HOOK_MARKER in f.read()
+
+@app.command()
+def install(
+    force: bool = typer.Option(False, "--force", help="Replace an existing post-checkout hook"),
+):
+    """
+    Install a post-checkout hook so plain `git checkout`/`git switch` also switch time tracking.
+    """
+    path = hook_path()
+    if os.path.exists(path) and not _is_ours(path) and not force:
+        console.print(f"[red]{path} already exists. Use --force to replace it.[/red]")
+        raise typer.Exit(code=1)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(hook_script())
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    console.print(f"[green]Installed {HOOK_NAME} hook: {path}[/green]")
+
+@app.command()
+def uninstall():
+    """
+    Remove the post-checkout hook installed by gittask.
+    """
+    path = hook_path()
+    if not os.path.exists(path) or not _is_ours(path):
+        console.print("[yellow]No gittask hook installed.[/yellow]")
+        return
+    os.remove(path)
+    console.print(f"[green]Removed {HOOK_NAME} hook.[/green]")
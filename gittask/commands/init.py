@@ -1,13 +1,18 @@
 import typer
 from ..config import ConfigManager
+from ..database import DBManager
 from ..asana_client import AsanaClient
+from ..utils import load_workspaces, select_from_listing, select_project
 import questionary
 
-def init():
+def init(
+    refresh: bool = typer.Option(False, "--refresh", help="Reload workspaces and projects from Asana instead of the local cache"),
+):
     """
     Initialize gittask configuration (Workspace & Project).
     """
     config = ConfigManager()
+    db = DBManager()
     token = config.get_api_token()
     
     if not token:
@@ -20,19 +25,13 @@ def init():
             typer.echo(f"👋 Hello, {user['name']}!")
             
             # Select Workspace
-            workspaces = client.get_workspaces()
-            workspace_choices = [
-                questionary.Choice(ws['name'], value=ws['gid']) for ws in workspaces
-            ]
+            workspaces = load_workspaces(client, db, refresh=refresh)
             
-            if not workspace_choices:
+            if not workspaces:
                 typer.echo("❌ No workspaces found.")
                 raise typer.Exit(code=1)
 
-            workspace_gid = questionary.select(
-                "Select your default Asana Workspace:",
-                choices=workspace_choices
-            ).ask()
+            workspace_gid = select_from_listing("Select your default Asana Workspace:", workspaces)
 
 
             # ask user if paid plan
@@ -45,24 +44,22 @@ def init():
             config.set_default_workspace(workspace_gid)
             
             # Select Project (Optional)
-            projects = client.get_projects(workspace_gid)
-            project_choices = [
-                questionary.Choice(p['name'], value=p['gid']) for p in projects
-            ]
-            
-            # Add a "None" option
-            project_choices.insert(0, questionary.Choice("None (I'll select per task)", value=None))
-            
-            project_gid = questionary.select(
+            project_gid = select_project(
+                client,
+                db,
+                workspace_gid,
                 "Select a default Project (optional):",
-                choices=project_choices
-            ).ask()
+                none_label="None (I'll select per task)",
+                refresh=refresh,
+            )
             
             if project_gid:
                 config.set_default_project(project_gid)
             
             typer.echo("✅ Configuration saved!")
         
+    except typer.Exit:
+        raise
     except Exception as e:
         typer.echo(f"❌ Error: {str(e)}")
         raise typer.Exit(code=1)
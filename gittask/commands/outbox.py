@@ -0,0 +1,67 @@
+import typer
+from ..output import console
+from rich.table import Table
+from ..config import ConfigManager
+from ..database import DBManager
+from ..asana_client import AsanaClient
+from .. import outbox as asana_outbox
+
+app = typer.Typer()
+
+@app.command()
+def status():
+    """
+    Show Asana updates that have not been delivered yet.
+    """
+    db = DBManager()
+    entries = db.get_outbox_entries(['pending', 'in_flight', 'failed'])
+
+    if not entries:
+        console.print("[green]Outbox is empty.[/green]")
+        return
+
+    table = Table(title="Pending Asana Updates")
+    table.add_column("Operation", style="cyan")
+    table.add_column("Task", style="magenta")
+    table.add_column("Status", style="yellow")
+    table.add_column("Attempts")
+    table.add_column("Last Error", style="red")
+
+    for e in entries:
+        table.add_row(e['op'], e['task_gid'], e['status'], str(e['attempts']), e['last_error'] or "")
+
+    console.print(table)
+
+@app.command()
+def flush(
+    quiet: bool = typer.Option(False, "--quiet", help="Suppress output"),
+    retry_failed: bool = typer.Option(False, "--retry-failed", help="Retry entries that ran out of attempts"),
+):
+    """
+    Deliver queued Asana updates now.
+    """
+    db = DBManager()
+    config = ConfigManager()
+    token = config.get_api_token()
+
+    if not token:
+        if not quiet:
+            console.print("[red]Not authenticated.[/red]")
+        raise typer.Exit(code=1)
+
+    if retry_failed:
+        for entry in db.get_outbox_entries(['failed']):
+            db.update_outbox_entry(entry['id'], status='pending', attempts=0)
+
+    if not db.get_outbox_entries(['pending', 'in_flight']):
+        if not quiet:
+            console.print("[green]Nothing to deliver.[/green]")
+        return
+
+    with AsanaClient(token) as client:
+        delivered, failed = asana_outbox.deliver(db, client)
+
+    if not quiet:
+        console.print(f"[green]Delivered {delivered} updates.[/green]")
+        if failed:
+            console.print(f"[red]{failed} updates failed. They will be retried.[/red]")
@@ -1,15 +1,15 @@
 import typer
-from rich.console import Console
+from ..output import console
 from rich.table import Table
 from ..config import ConfigManager
 from ..database import DBManager
 from ..git_handler import GitHandler
-from ..asana_client import AsanaClient
+from .. import outbox
+from .. import metrics
 from github import Github
 import subprocess
 
 app = typer.Typer()
-console = Console()
 config = ConfigManager()
 db = DBManager()
 git = GitHandler()
@@ -19,7 +19,7 @@ def get_github_client():
     if not token:
         console.print("[red]GitHub token not found. Run `gittask auth login --github` first.[/red]")
         raise typer.Exit(code=1)
-    return Github(token)
+    return metrics.instrument_github(Github(token))
 
 def get_github_repo(g, remote_name="origin"):
     remote_url = git.get_remote_url(remote_name)
@@ -107,10 +107,10 @@ def create(
             token = config.get_api_token()
             if token:
                 try:
-                    with AsanaClient(token) as client:
-                        comment_text = f"🔗 <strong>Pull Request Created</strong>\n\n<a href=\"{pr.html_url}\">{pr.title} (#{pr.number})</a>"
-                        client.post_comment(task_info['asana_task_gid'], comment_text)
-                        console.print(f"[green]Posted PR link to Asana task: {task_info['asana_task_name']}[/green]")
+                    comment_text = f"🔗 <strong>Pull Request Created</strong>\n\n<a href=\"{pr.html_url}\">{pr.title} (#{pr.number})</a>"
+                    outbox.enqueue(db, 'post_comment', task_info['asana_task_gid'], text=comment_text)
+                    outbox.deliver_in_background()
+                    console.print(f"[green]Queued PR link for Asana task: {task_info['asana_task_name']}[/green]")
                 except Exception as e:
                     console.print(f"[red]Failed to post PR link to Asana: {e}[/red]")
                     
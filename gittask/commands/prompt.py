@@ -0,0 +1,15 @@
+import typer
+from .. import prompt as prompt_segment
+
+def prompt(
+    format: str = typer.Option(prompt_segment.DEFAULT_FORMAT, "--format", help="Fields: {task}, {branch}, {repo}, {elapsed}, {minutes}"),
+    empty: str = typer.Option("", "--empty", help="Text to show when nothing is being tracked"),
+    max_length: int = typer.Option(prompt_segment.MAX_TASK_LENGTH, "--max-length", help="Shorten task names longer than this (0 to keep them whole)"),
+):
+    """
+    Print the current session for a shell prompt or tmux status line.
+    """
+    # `gt prompt` normally skips this module (see daemon.cli); this serves `gittask.main` directly
+    line = prompt_segment.render(prompt_segment.read_state(), format, empty, max_length)
+    if line:
+        typer.echo(line)
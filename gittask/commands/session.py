@@ -1,10 +1,10 @@
 import typer
-from rich.console import Console
+from ..output import console
 from ..database import DBManager
 from ..git_handler import GitHandler
+from .. import scheduler
 
 app = typer.Typer()
-console = Console()
 db = DBManager()
 
 @app.command()
@@ -23,6 +23,7 @@ def stop():
             if stopped_session:
                 duration_mins = int(stopped_session['duration_seconds'] // 60)
                 console.print(f"[yellow]Stopped tracking time for '{current_branch}' ({duration_mins}m).[/yellow]")
+                scheduler.trigger(db)
                 return
     except Exception:
         # Not in a git repo or other git error, ignore and try stopping global session
@@ -39,6 +40,7 @@ def stop():
             branch_display = branch_display.replace("@global:", "") + " (Global)"
             
         console.print(f"[yellow]Stopped tracking time for '{branch_display}' ({duration_mins}m).[/yellow]")
+        scheduler.trigger(db)
     else:
         console.print(f"[yellow]No active session found.[/yellow]")
 
@@ -78,3 +80,4 @@ def start():
         # This will auto-stop any other session (global or other repo)
         db.start_session(current_branch, repo_path, task_info['asana_task_gid'])
         console.print(f"[green]Started tracking time for '{current_branch}' -> '{task_info['asana_task_name']}'[/green]")
+        scheduler.trigger(db)
@@ -1,12 +1,9 @@
 import typer
 from ..database import DBManager
-from rich.console import Console
-from rich.table import Table
+from ..output import console
 import time
 import datetime
 
-console = Console()
-
 def status():
     """
     Show current time tracking status and recent sessions.
@@ -54,6 +51,8 @@ def status():
     unsynced = db.get_unsynced_sessions()
     
     if unsynced:
+        # Only loaded when there is something to list, status runs on a tight start-up budget
+        from rich.table import Table
         table = Table(title="Unsynced Sessions")
         table.add_column("Branch", style="cyan")
         table.add_column("Duration", style="magenta")
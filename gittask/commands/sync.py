@@ -2,55 +2,113 @@ import typer
 from ..database import DBManager
 from ..config import ConfigManager
 from ..asana_client import AsanaClient
-from rich.console import Console
-from rich.progress import track
+from .. import sync_engine
+from .. import scheduler
+from .. import services
+from ..services import ServiceError
+from ..services import sync as sync_service
+from .. import output
+from ..output import console
+from rich.progress import Progress
+from rich.table import Table
 
-console = Console()
+def _task_label(db, delivery) -> str:
+    session = delivery['sessions'][0]
+    link = db.get_task_for_branch(session['branch'], session.get('repo_path'))
+    if link:
+        return link['asana_task_name']
+    cached = db.get_cached_task(delivery['task_gid'])
+    if cached and cached.get('name'):
+        return cached['name']
+    return ", ".join(b.replace("@global:", "") for b in delivery['branches'])
 
-def sync():
+def show_plan(db, config):
+    """
+    Print what a sync would post and what it would cost, without touching the network.
+    """
+    paid_plan = bool(config.get_paid_plan_status())
+    plan = sync_engine.plan_sync(db, paid_plan)
+    deliveries = plan['deliveries']
+
+    if deliveries:
+        table = Table(title="Sync plan")
+        table.add_column("Task", style="cyan")
+        table.add_column("Date", style="green")
+        table.add_column("Posts")
+        table.add_column("Time", justify="right", style="magenta")
+        table.add_column("Sessions", justify="right")
+        for delivery in deliveries:
+            table.add_row(
+                _task_label(db, delivery),
+                delivery['entered_on'].isoformat(),
+                "time entry" if delivery['kind'] == 'time_entry' else "comment",
+                f"{delivery['minutes'] // 60}h {delivery['minutes'] % 60}m",
+                str(len(delivery['sessions'])),
+            )
+        console.print(table)
+    else:
+        console.print("[green]No closed sessions to sync.[/green]")
+
+    requests = plan['requests']
+    if not requests:
+        return
+    console.print(
+        f"{len(deliveries)} entries in {len(plan['batches'])} batches of up to {sync_engine.BATCH_SIZE} "
+        f"(auto-sync sends one batch per run)."
+    )
+    extra = []
+    if plan['interrupted']:
+        extra.append(f"checks {plan['interrupted']} interrupted deliveries")
+    if plan['queued']:
+        extra.append(f"delivers {plan['queued']} queued Asana updates")
+    console.print(f"{len(requests)} HTTP requests" + (f" (includes {', '.join(extra)})" if extra else "") + ".")
+
+    estimate = sync_engine.estimate_duration(plan)
+    basis = "measured latency" if estimate['measured'] else f"{sync_engine.DEFAULT_LATENCY_MS:.0f} ms per request"
+    console.print(
+        f"Estimated duration: {estimate['seconds']:.1f}s "
+        f"({basis}, limit {estimate['rate_limit_per_minute']} requests/min)."
+    )
+    if estimate['retry_wait']:
+        console.print(f"[yellow]Rate limited by Asana: includes {estimate['retry_wait']:.0f}s of Retry-After.[/yellow]")
+
+def sync(
+    auto: bool = typer.Option(False, "--auto", hidden=True, help="Deliver one batch if the auto-sync schedule says it is due"),
+    plan: bool = typer.Option(False, "--plan", help="Show what would be posted and how many requests it takes, without syncing"),
+):
     """
     Sync local time sessions to Asana.
     """
     db = DBManager()
+    if auto and not scheduler.is_due(db):
+        return
     config = ConfigManager()
-    token = config.get_api_token()
-    
-    if not token:
-        console.print("[red]Not authenticated.[/red]")
-        raise typer.Exit(code=1)
-        
-    with AsanaClient(token) as client:
-        unsynced = db.get_unsynced_sessions()
+    if plan:
+        show_plan(db, config)
+        return
+    if auto:
+        token = config.get_api_token()
+        if not token:
+            raise typer.Exit(code=1)
+        with AsanaClient(token) as client:
+            delivered, failed = scheduler.run(db, client, config.get_paid_plan_status())
+        console.print(f"Auto-sync: {delivered} entries synced, {failed} failed.")
+        return
         
-        if not unsynced:
-            console.print("[green]Nothing to sync.[/green]")
-            return
+    print_progress = services.console_progress(console)
+    with Progress(console=output.current(), transient=True) as bar:
+        step = bar.add_task("Syncing...", visible=False)
 
-        # Filter out open sessions (end_time is None)
-        sessions_to_sync = [s for s in unsynced if s['end_time'] is not None]
-        
-        if not sessions_to_sync:
-            console.print("[yellow]Only active sessions found. Stop them to sync.[/yellow]")
-            return
+        def on_progress(message, level="info", done=None, total=None):
+            if total is not None:
+                bar.update(step, completed=done, total=total, visible=True)
+            print_progress(message, level, done, total)
 
-        console.print(f"Syncing {len(sessions_to_sync)} sessions...")
-        
-        for session in track(sessions_to_sync, description="Syncing..."):
-            try:
-                if config.get_paid_plan_status():
-                    # Only possible to log time on paid plans
-                    client.add_time_entry(
-                        session['task_gid'],
-                        session['duration_seconds']
-                    )
-                else: 
-                    client.log_time_comment(
-                        session['task_gid'],
-                        session['duration_seconds'],
-                        session['branch']
-                    )
-                db.mark_session_synced(session['id'])
-            except Exception as e:
-                console.print(f"[red]Failed to sync session {session['id']}: {e}[/red]")
-            
-    console.print("[bold green]Sync complete![/bold green]")
+        try:
+            result = sync_service.sync_time(db, config, on_progress)
+        except ServiceError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(code=1)
+
+    if result['synced'] or result['failed']:
+        console.print("[bold green]Sync complete![/bold green]")
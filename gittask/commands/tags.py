@@ -1,14 +1,14 @@
 import typer
-from rich.console import Console
+from ..output import console
 from rich.table import Table
 from ..config import ConfigManager
 from ..database import DBManager
 from ..git_handler import GitHandler
 from ..asana_client import AsanaClient
 from ..utils import select_and_create_tags
+from .. import outbox
 
 app = typer.Typer()
-console = Console()
 config = ConfigManager()
 db = DBManager()
 git = GitHandler()
@@ -81,10 +81,8 @@ def add():
         tag_gids = select_and_create_tags(client, workspace_gid, db)
         
         if tag_gids:
-            console.print(f"Applying {len(tag_gids)} tags...")
-            for tag_gid in tag_gids:
-                try:
-                    client.add_tag_to_task(task_info['asana_task_gid'], tag_gid)
-                except Exception as e:
-                    console.print(f"[red]Failed to add tag: {e}[/red]")
+            applied = outbox.enqueue_tags(db, task_info['asana_task_gid'], tag_gids)
+            if applied:
+                console.print(f"Applying {applied} tags...")
+                outbox.deliver_in_background()
             console.print("[green]Tags added successfully![/green]")
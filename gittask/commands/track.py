@@ -1,13 +1,13 @@
 import typer
-from rich.console import Console
+from ..output import console
 from ..database import DBManager
 from ..config import ConfigManager
 from ..asana_client import AsanaClient
 import questionary
-from ..utils import select_and_create_tags
+from ..utils import select_and_create_tags, resolve_task_project
+from .. import scheduler
 
 app = typer.Typer()
-console = Console()
 
 @app.command(name="track")
 def track(
@@ -43,7 +43,7 @@ def track(
             if not tasks:
                  if questionary.confirm(f"Task '{task_name}' not found. Create it?").ask():
                      # Create new task
-                     project_gid = config.get_default_project()
+                     project_gid = resolve_task_project(client, db, config, workspace_gid)
                      new_task = client.create_task(workspace_gid, project_gid, task_name)
                      task_gid = new_task['gid']
                      asana_task_name = new_task['name']
@@ -62,13 +62,14 @@ def track(
                 asana_task_name = selected_task['name']
         else:
             # Interactive selection (similar to checkout)
-            project_gid = config.get_default_project()
-            console.print("Fetching project tasks...")
-            try:
-                project_tasks = client.get_project_tasks(project_gid)
-            except Exception as e:
-                console.print(f"[red]Failed to fetch project tasks: {e}[/red]")
-                project_tasks = []
+            project_gid = resolve_task_project(client, db, config, workspace_gid)
+            project_tasks = []
+            if project_gid:
+                console.print("Fetching project tasks...")
+                try:
+                    project_tasks = client.get_project_tasks(project_gid)
+                except Exception as e:
+                    console.print(f"[red]Failed to fetch project tasks: {e}[/red]")
             
             task_names = [t['name'] for t in project_tasks]
             from prompt_toolkit.completion import WordCompleter
@@ -94,13 +95,9 @@ def track(
                     # Tag Selection
                     tag_gids = select_and_create_tags(client, workspace_gid, db)
                     try:
-                        new_task = client.create_task(workspace_gid, project_gid, asana_task_name)
+                        new_task = client.create_task(workspace_gid, project_gid, asana_task_name, tag_gids=tag_gids)
                         task_gid = new_task['gid']
                         asana_task_name = new_task['name']
-                        
-                        if tag_gids:
-                             for tag_gid in tag_gids:
-                                 client.add_tag_to_task(task_gid, tag_gid)
                     except Exception as e:
                         console.print(f"[red]Failed to create task: {e}[/red]")
                         return
@@ -116,3 +113,4 @@ def track(
             
             db.start_session(branch_name, repo_path, task_gid)
             console.print(f"[bold green]Started tracking time for '{asana_task_name}' (Global)[/bold green]")
+            scheduler.trigger(db)
@@ -1,29 +1,69 @@
 import keyring
+import os
 import typer
 from typing import Optional
 from .database import DBManager
+from .request_cache import ResponseCache
+from . import daemon
 from tinydb import Query
 
 APP_NAME = "gittask"
 KEYRING_SERVICE = "gittask_asana_pat"
 KEYRING_USERNAME = "user" # Simple single user for now
 
+# How long a token read from the keyring is reused, in seconds.
+# Secret Service lookups go over D-Bus and may prompt to unlock the keyring.
+# The daemon keeps them longer: `auth login`/`logout` tell it to forget them.
+# GITTASK_SECRET_TTL overrides both (0 to always ask the keyring).
+SECRET_TTL = 300.0
+DAEMON_SECRET_TTL = 3600.0
+
+# Shared by every ConfigManager in the process (the TUI creates one per worker)
+SECRET_CACHE = ResponseCache(max_entries=8)
+
+def secret_ttl() -> float:
+    if os.environ.get("GITTASK_SECRET_TTL"):
+        return float(os.environ["GITTASK_SECRET_TTL"])
+    return DAEMON_SECRET_TTL if daemon.serving() else SECRET_TTL
+
+def forget_secrets(everywhere: bool = False):
+    """
+    Drop cached tokens, and with `everywhere` also those held by a running daemon.
+    """
+    SECRET_CACHE.invalidate()
+    if everywhere and not daemon.serving():
+        daemon.send({'op': "forget_secrets"}, timeout=daemon.REPLY_TIMEOUT)
+
 class ConfigManager:
     def __init__(self):
         self.db = DBManager()
         self.SERVICE_NAME = KEYRING_SERVICE
 
+    def _get_secret(self, name: str) -> Optional[str]:
+        ttl = secret_ttl()
+        if ttl <= 0:
+            return keyring.get_password(self.SERVICE_NAME, name)
+        return SECRET_CACHE.get_or_load(
+            (self.SERVICE_NAME, name),
+            lambda: keyring.get_password(self.SERVICE_NAME, name),
+            ttl,
+        )
+
+    def _set_secret(self, name: str, value: str):
+        keyring.set_password(self.SERVICE_NAME, name, value)
+        forget_secrets(everywhere=True)
+
     def get_api_token(self) -> Optional[str]:
-        return keyring.get_password(self.SERVICE_NAME, "api_token")
+        return self._get_secret("api_token")
 
     def set_api_token(self, token: str):
-        keyring.set_password(self.SERVICE_NAME, "api_token", token)
+        self._set_secret("api_token", token)
 
     def get_github_token(self) -> Optional[str]:
-        return keyring.get_password(self.SERVICE_NAME, "github_token")
+        return self._get_secret("github_token")
 
     def set_github_token(self, token: str):
-        keyring.set_password(self.SERVICE_NAME, "github_token", token)
+        self._set_secret("github_token", token)
 
     def logout(self):
         try:
@@ -34,6 +74,7 @@ class ConfigManager:
             keyring.delete_password(self.SERVICE_NAME, "github_token")
         except keyring.errors.PasswordDeleteError:
             pass
+        forget_secrets(everywhere=True)
 
     def set_default_workspace(self, workspace_gid: str):
         self.db.config.upsert({'key': 'default_workspace', 'value': workspace_gid}, Query().key == 'default_workspace')
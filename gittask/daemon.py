@@ -0,0 +1,409 @@
+"""
+Resident gittask process that runs commands for the `gt` CLI.
+
+`gittask daemon start` keeps the command modules imported and the database,
+the keyring-backed config and the Asana response cache warm. The `gt`
+entry point (cli) forwards the commands in FORWARDED_COMMANDS to it over a
+Unix socket, and runs them itself when no daemon answers. A forwarded command
+runs in the client's working directory and with its GITTASK_* settings.
+
+Only the standard library is imported at the top, so forwarding a command
+costs a socket round trip instead of importing typer, rich and asana.
+"""
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROTOCOL = 1
+CONNECT_TIMEOUT = 0.2
+# How long a request that doesn't wait for a command (detached runs, control
+# messages) waits for an answer: the daemon may be busy with a long command
+REPLY_TIMEOUT = 1.0
+START_TIMEOUT = 10.0
+# How often an idle daemon checks whether an automatic sync is due, in seconds
+TICK_INTERVAL = 60.0
+
+# Commands that never prompt and don't keep repository state from import time
+FORWARDED_COMMANDS = {
+    ("status",),
+    ("stop",),
+    ("start",),
+    ("sync",),
+    ("outbox", "status"),
+    ("outbox", "flush"),
+    ("debug", "api-stats"),
+}
+
+def socket_path() -> str:
+    return os.environ.get("GITTASK_DAEMON_SOCKET") or str(Path.home() / ".gittask" / "daemon.sock")
+
+def is_forwarded(argv: List[str]) -> bool:
+    if os.environ.get("GITTASK_DAEMON") == "0":
+        return False
+    return any(tuple(argv[:len(command)]) == command for command in FORWARDED_COMMANDS)
+
+def _color_system() -> Optional[str]:
+    """
+    Colors the daemon should render with for this terminal (rich color_system names).
+    """
+    if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+        return None
+    if os.environ.get("COLORTERM") in ("truecolor", "24bit"):
+        return "truecolor"
+    if "256" in os.environ.get("TERM", ""):
+        return "256"
+    return "standard"
+
+def client_env() -> Dict[str, str]:
+    """
+    The gittask settings (GITTASK_* variables) of this process's environment.
+    A forwarded command runs with the client's, not the daemon's.
+    """
+    return {name: value for name, value in os.environ.items() if name.startswith("GITTASK_")}
+
+def _with_env(env: Dict[str, str]) -> Dict[str, str]:
+    """
+    This process's environment with its GITTASK_* variables replaced by `env`.
+    """
+    return {**{name: value for name, value in os.environ.items() if not name.startswith("GITTASK_")}, **env}
+
+def _set_client_env(env: Dict[str, str]):
+    for name in client_env():
+        if name not in env:
+            del os.environ[name]
+    os.environ.update(env)
+
+def _terminal_width() -> int:
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return int(os.environ.get("COLUMNS", 80))
+
+def send(request: Dict, timeout: Optional[float] = None, path: Optional[str] = None) -> Optional[Dict]:
+    """
+    Send one request to the daemon. Returns None if no daemon is listening,
+    or, given a `timeout`, if it did not answer in time or dropped the request.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path or socket_path())
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(json.dumps({'protocol': PROTOCOL, **request}).encode())
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except socket.timeout:
+            return None
+        except (ConnectionResetError, BrokenPipeError):
+            if timeout is not None:
+                # The caller does the work itself instead
+                return None
+            chunks = []
+    if not chunks:
+        # The daemon went away while handling the request
+        return {'exit_code': 1, 'output': "gittask daemon: no response\n"}
+    return json.loads(b"".join(chunks))
+
+def forward(argv: List[str], detach: bool = False) -> Optional[int]:
+    """
+    Run a command in the daemon and print its output. Returns the exit code,
+    or None if no (compatible) daemon ran it. With `detach`, don't wait for it.
+    """
+    response = send({
+        'op': "run",
+        'argv': argv,
+        'cwd': os.getcwd(),
+        'width': _terminal_width(),
+        'color': _color_system(),
+        'detach': detach,
+        'env': client_env(),
+    }, timeout=REPLY_TIMEOUT if detach else None)
+    if response is None or response.get('error') == "protocol":
+        return None
+    sys.stdout.write(response.get('output', ""))
+    sys.stdout.flush()
+    return response.get('exit_code', 1)
+
+def cli():
+    """
+    Entry point of the `gt`/`gittask` scripts.
+    """
+    argv = sys.argv[1:]
+    if argv[:1] == ["prompt"]:
+        # Rendered on every shell prompt: read the state file without loading typer
+        from .prompt import main
+        sys.exit(main(argv[1:]))
+    if is_forwarded(argv):
+        exit_code = forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .main import app
+    app()
+
+# Server side
+
+_serving = False
+_after_request = []
+
+def serving() -> bool:
+    """
+    True inside the daemon process.
+    """
+    return _serving
+
+def after_request(argv: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None):
+    """
+    Run a command once the current request is answered, e.g. an outbox flush.
+    It gets the GITTASK_* settings of the command that queued it.
+    """
+    job = (argv, cwd or os.getcwd(), client_env() if env is None else env)
+    if job not in _after_request:
+        _after_request.append(job)
+
+def run_command(argv: List[str], cwd: str, width: int = 80, color: Optional[str] = None,
+                env: Optional[Dict[str, str]] = None):
+    """
+    Run a CLI command in this process with its output captured, and with the
+    GITTASK_* variables in `env` instead of the daemon's if given.
+    Returns (exit code, output).
+    """
+    import io
+    import traceback
+    import typer
+    from rich.console import Console
+    from . import metrics
+    from .main import app
+    from .output import capture
+
+    output = io.StringIO()
+    console = Console(file=output, width=width, force_terminal=color is not None, color_system=color)
+    command = typer.main.get_command(app)
+    previous_cwd = os.getcwd()
+    previous_env = client_env()
+    try:
+        os.chdir(cwd)
+        if env is not None:
+            _set_client_env(env)
+        with capture(console):
+            try:
+                result = command.main(argv, prog_name="gt", standalone_mode=False)
+                exit_code = result if isinstance(result, int) else 0
+            except typer.Exit as e:
+                exit_code = e.exit_code
+            except typer.Abort:
+                output.write("Aborted!\n")
+                exit_code = 1
+            except typer.TyperException as e:
+                e.show(file=output)
+                exit_code = getattr(e, 'exit_code', 1)
+            except Exception:
+                traceback.print_exc(file=output)
+                exit_code = 1
+    finally:
+        if env is not None:
+            _set_client_env(previous_env)
+        os.chdir(previous_cwd)
+        metrics.flush()
+    return exit_code, output.getvalue()
+
+class Daemon:
+    """
+    Serves requests one at a time: commands share the database and the
+    working directory, so they must not run concurrently. Background work
+    queued with after_request runs in separate processes instead, so a long
+    sync does not hold up the next request.
+    """
+    def __init__(self, path: Optional[str] = None, tick_interval: float = TICK_INTERVAL):
+        self.path = path or socket_path()
+        self.tick_interval = tick_interval
+        self.started_at = time.time()
+        self.served = 0
+        self.running = False
+        self._server = None
+        self._jobs = []
+
+    def warm_up(self):
+        from .main import load_command
+
+        for name in sorted({command[0] for command in FORWARDED_COMMANDS}):
+            load_command(name)
+
+    def bind(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.path):
+            if send({'op': "ping"}, path=self.path) is not None:
+                raise RuntimeError("A gittask daemon is already running.")
+            # Left over from a daemon that did not shut down cleanly
+            os.unlink(self.path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket private to this user rather than chmod'ing it after
+        # bind, which would leave it open to others for a moment
+        previous_umask = os.umask(0o077)
+        try:
+            self._server.bind(self.path)
+        finally:
+            os.umask(previous_umask)
+        self._server.listen()
+        self._server.settimeout(self.tick_interval)
+
+    def serve_forever(self):
+        global _serving
+        if self._server is None:
+            self.bind()
+        self.running = True
+        _serving = True
+        try:
+            while self.running:
+                try:
+                    conn, _ = self._server.accept()
+                except socket.timeout:
+                    self.tick()
+                else:
+                    with conn:
+                        self.handle(conn)
+                self.start_jobs()
+        finally:
+            _serving = False
+            self._server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def start_jobs(self):
+        """
+        Start the commands queued by after_request, each in its own process.
+        They share db.json with the daemon through its file lock.
+        """
+        import subprocess
+
+        # Reap the ones that finished
+        self._jobs = [job for job in self._jobs if job.poll() is None]
+        while _after_request:
+            argv, cwd, env = _after_request.pop(0)
+            try:
+                self._jobs.append(subprocess.Popen(
+                    [sys.executable, "-m", "gittask.main", *argv],
+                    cwd=cwd,
+                    env=_with_env(env),
+                    stdin=subprocess.DEVNULL,
+                    start_new_session=True,
+                ))
+            except OSError as e:
+                # The work stays queued and is picked up by the next run
+                print(f"gittask daemon: could not start '{' '.join(argv)}': {e}", file=sys.stderr)
+
+    def tick(self):
+        """
+        Idle work: start an automatic sync when one is due (see scheduler).
+        """
+        from . import scheduler
+        from .database import DBManager
+
+        try:
+            scheduler.trigger(DBManager())
+        except Exception as e:
+            print(f"gittask daemon: auto-sync check failed: {e}", file=sys.stderr)
+
+    def handle(self, conn):
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        try:
+            request = json.loads(b"".join(chunks))
+        except ValueError:
+            return
+        self.served += 1
+
+        def reply(response):
+            try:
+                conn.sendall(json.dumps(response).encode())
+            except OSError:
+                # The client gave up waiting
+                pass
+
+        if request.get('protocol') != PROTOCOL:
+            reply({'error': "protocol"})
+            return
+        op = request.get('op')
+        if op == "ping":
+            reply({'pid': os.getpid(), 'started_at': self.started_at, 'served': self.served})
+        elif op == "forget_secrets":
+            # Credentials changed in another process (auth login/logout)
+            if "gittask.config" in sys.modules:
+                sys.modules["gittask.config"].forget_secrets()
+            reply({'ok': True})
+        elif op == "shutdown":
+            self.running = False
+            reply({'ok': True})
+        elif op == "run":
+            if request.get('detach'):
+                # Runs after the connection is closed, so the client does not wait
+                after_request(request['argv'], request['cwd'], request.get('env'))
+                reply({'exit_code': 0, 'output': ""})
+            else:
+                exit_code, output = run_command(
+                    request['argv'], request['cwd'], request.get('width', 80), request.get('color'),
+                    request.get('env'),
+                )
+                reply({'exit_code': exit_code, 'output': output})
+        else:
+            reply({'error': f"unknown op '{op}'"})
+
+def serve(path: Optional[str] = None):
+    """
+    Run the daemon in this process until it is told to shut down.
+    """
+    import signal
+
+    daemon = Daemon(path)
+    daemon.bind()
+    # Let `kill` clean up the socket too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    daemon.warm_up()
+    daemon.serve_forever()
+
+def spawn() -> bool:
+    """
+    Start a detached daemon and wait until it answers.
+    """
+    import subprocess
+
+    log_path = Path(socket_path()).with_suffix(".log")
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "gittask.daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if send({'op': "ping"}) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+if __name__ == "__main__":
+    # Serve from the gittask.daemon module, not __main__, so serving() is seen by other modules
+    from gittask import daemon
+    daemon.serve()
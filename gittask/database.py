@@ -1,10 +1,86 @@
 from tinydb import TinyDB, Query
+from tinydb.storages import JSONStorage
+from tinydb.table import Table
+from contextlib import contextmanager
 import os
+import threading
 from typing import Optional, Dict, List
 import time
 import uuid
 from pathlib import Path
-from .utils import get_git_root
+from . import prompt
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+class LockingJSONStorage(JSONStorage):
+    """
+    JSONStorage shared safely between processes (the CLI, background syncs
+    and deliveries, the daemon): reads hold a shared lock on db.json.lock,
+    writes an exclusive one.
+    """
+    def __init__(self, path: str, **kwargs):
+        super().__init__(path, **kwargs)
+        self._lock_file = open(f"{path}.lock", "a") if fcntl else None
+        self._mutex = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def lock(self, exclusive: bool = True):
+        """
+        Hold the database lock. Nested calls reuse the outer lock.
+        """
+        with self._mutex:
+            acquire = self._lock_file is not None and self._depth == 0
+            if acquire:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if acquire:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def read(self):
+        with self.lock(exclusive=False):
+            return super().read()
+
+    def write(self, data):
+        with self.lock():
+            super().write(data)
+
+    def close(self):
+        super().close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+class LockedTable(Table):
+    """
+    TinyDB rewrites the whole file on every write: hold the storage lock for
+    the read-modify-write, so another process's write is never lost. Query
+    results and the next document id are not cached, another process may
+    have written since.
+    """
+    def __init__(self, storage, name: str, cache_size: int = 0, persist_empty: bool = False):
+        super().__init__(storage, name, cache_size=cache_size, persist_empty=persist_empty)
+
+    def insert(self, document) -> int:
+        # The id is picked before the update, so pick it under the lock too
+        with self._storage.lock():
+            self._next_id = None
+            return super().insert(document)
+
+    def _update_table(self, updater):
+        with self._storage.lock():
+            self._next_id = None
+            super()._update_table(updater)
+
+class LockedTinyDB(TinyDB):
+    table_class = LockedTable
+    default_storage_class = LockingJSONStorage
 
 class DBManager:
     def __init__(self, db_path: str = None):
@@ -15,11 +91,21 @@ class DBManager:
             config_dir.mkdir(parents=True, exist_ok=True)
             db_path = str(config_dir / "db.json")
             
-        self.db = TinyDB(db_path)
+        self.db_path = db_path
+        self.db = LockedTinyDB(db_path)
         self.branch_map = self.db.table('branch_map')
         self.time_sessions = self.db.table('time_sessions')
         self.config = self.db.table('config')
         self.tags = self.db.table('tags')
+        self.outbox = self.db.table('outbox')
+        self.workspaces = self.db.table('workspaces')
+        self.projects = self.db.table('projects')
+        self.listings = self.db.table('listings')
+        self.tasks = self.db.table('tasks')
+        self.state_path = os.path.join(os.path.dirname(os.path.abspath(db_path)), prompt.STATE_FILE)
+        if not os.path.exists(self.state_path):
+            # Databases from before the state file existed
+            self._write_state()
 
     # Tag Operations
     def cache_tags(self, tags: List[Dict]):
@@ -34,6 +120,108 @@ class DBManager:
     def get_cached_tags(self) -> List[Dict]:
         return self.tags.all()
 
+    # Workspace / Project Cache
+    def _merge_listing(self, table, items: List[Dict], cond) -> Dict[str, int]:
+        """
+        Bring the cached rows matching `cond` in line with `items`, only writing what changed.
+        """
+        Item = Query()
+        existing = {doc['gid']: doc for doc in table.search(cond)}
+        incoming = {item['gid']: item for item in items}
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+
+        new_docs = [item for gid, item in incoming.items() if gid not in existing]
+        if new_docs:
+            table.insert_multiple(new_docs)
+            counts['added'] = len(new_docs)
+        for gid, item in incoming.items():
+            if gid in existing and any(existing[gid].get(k) != v for k, v in item.items()):
+                table.update(item, cond & (Item.gid == gid))
+                counts['updated'] += 1
+        removed = [existing[gid].doc_id for gid in existing if gid not in incoming]
+        if removed:
+            table.remove(doc_ids=removed)
+            counts['removed'] = len(removed)
+        return counts
+
+    def _mark_listing_refreshed(self, kind: str, workspace_gid: Optional[str] = None):
+        Listing = Query()
+        self.listings.upsert(
+            {'kind': kind, 'workspace_gid': workspace_gid, 'refreshed_at': time.time()},
+            (Listing.kind == kind) & (Listing.workspace_gid == workspace_gid)
+        )
+
+    def get_listing_refreshed_at(self, kind: str, workspace_gid: Optional[str] = None) -> Optional[float]:
+        Listing = Query()
+        result = self.listings.search((Listing.kind == kind) & (Listing.workspace_gid == workspace_gid))
+        return result[0]['refreshed_at'] if result else None
+
+    def cache_workspaces(self, workspaces: List[Dict]) -> Dict[str, int]:
+        """
+        Cache workspaces. Each workspace should have 'gid' and 'name'.
+        Returns how many were added, updated and removed.
+        """
+        items = [{'gid': w['gid'], 'name': w['name']} for w in workspaces]
+        counts = self._merge_listing(self.workspaces, items, Query().gid.exists())
+        self._mark_listing_refreshed('workspaces')
+        return counts
+
+    def get_cached_workspaces(self) -> List[Dict]:
+        return self.workspaces.all()
+
+    def cache_projects(self, workspace_gid: str, projects: List[Dict]) -> Dict[str, int]:
+        """
+        Cache the projects of a workspace. Each project should have 'gid' and 'name'.
+        Returns how many were added, updated and removed.
+        """
+        Project = Query()
+        items = [{'gid': p['gid'], 'name': p['name'], 'workspace_gid': workspace_gid} for p in projects]
+        counts = self._merge_listing(self.projects, items, Project.workspace_gid == workspace_gid)
+        self._mark_listing_refreshed('projects', workspace_gid)
+        return counts
+
+    def get_cached_projects(self, workspace_gid: str) -> List[Dict]:
+        Project = Query()
+        return self.projects.search(Project.workspace_gid == workspace_gid)
+
+    # Task Cache
+    def cache_tasks(self, tasks: List[Dict]):
+        """
+        Store task metadata (assignee, completed, tags, permalink) as returned by Asana.
+        """
+        now = time.time()
+        rows = {
+            task['gid']: {
+                'gid': task['gid'],
+                'name': task.get('name'),
+                'completed': task.get('completed', False),
+                'assignee_gid': (task.get('assignee') or {}).get('gid'),
+                'tag_gids': [t['gid'] for t in task.get('tags') or []],
+                'permalink_url': task.get('permalink_url'),
+                'cached_at': now,
+            }
+            for task in tasks
+        }
+        if not rows:
+            return
+        # Every write rewrites the whole file: replace the rows in two writes, not one per task
+        Task = Query()
+        with self.db.storage.lock():
+            self.tasks.remove(Task.gid.one_of(list(rows)))
+            self.tasks.insert_multiple(rows.values())
+
+    def get_cached_task(self, task_gid: str) -> Optional[Dict]:
+        Task = Query()
+        result = self.tasks.search(Task.gid == task_gid)
+        return result[0] if result else None
+
+    def update_cached_task(self, task_gid: str, **fields):
+        """
+        Record a write we made, so the cache matches Asana once it is delivered.
+        """
+        Task = Query()
+        self.tasks.update(fields, Task.gid == task_gid)
+
     # Branch Map Operations
     def get_task_for_branch(self, branch_name: str, repo_path: str) -> Optional[Dict]:
         Branch = Query()
@@ -73,8 +261,10 @@ class DBManager:
             'start_time': time.time(),
             'end_time': None,
             'duration_seconds': 0,
-            'synced_to_asana': False
+            'synced_to_asana': False,
+            'delivery_state': 'pending'
         })
+        self._write_state()
         return session_id
 
     def stop_current_session(self, branch_name: str, repo_path: str):
@@ -119,8 +309,40 @@ class DBManager:
         # Return the updated session data
         session['end_time'] = end_time
         session['duration_seconds'] = duration
+        self._write_state()
         return session
 
+    def _write_state(self):
+        """
+        Write the active session to the state file read by `gittask prompt`.
+        """
+        # Read and replace under the database lock, so the last state written
+        # is the latest one even when processes change sessions concurrently
+        with self.db.storage.lock():
+            session = self.get_active_session()
+            if session is None:
+                state = {'active': False}
+            else:
+                branch = session['branch']
+                link = self.get_task_for_branch(branch, session.get('repo_path'))
+                if link:
+                    task = link['asana_task_name']
+                else:
+                    task = branch.replace("@global:", "")
+                state = {
+                    'active': True,
+                    'branch': branch,
+                    'repo_path': session.get('repo_path'),
+                    'task': task,
+                    'task_gid': session.get('task_gid'),
+                    'start_time': session['start_time'],
+                }
+            try:
+                prompt.write_state(self.state_path, state)
+            except OSError:
+                # The prompt is a convenience; never fail a session change over it
+                pass
+
     def get_active_session(self) -> Optional[Dict]:
         Session = Query()
         open_sessions = self.time_sessions.search(Session.end_time == None)
@@ -132,4 +354,84 @@ class DBManager:
 
     def mark_session_synced(self, session_id: str):
         Session = Query()
-        self.time_sessions.update({'synced_to_asana': True}, Session.id == session_id)
+        self.time_sessions.update({'synced_to_asana': True, 'delivery_state': 'delivered'}, Session.id == session_id)
+
+    # Delivery states: pending -> in_flight -> delivered.
+    # A session stays in_flight if sync dies mid-request, and is reconciled against Asana on the next sync.
+    def set_sessions_in_flight(self, session_ids: List[str], delivery_key: str, delivery_date: str):
+        Session = Query()
+        self.time_sessions.update(
+            {'delivery_state': 'in_flight', 'delivery_key': delivery_key, 'delivery_date': delivery_date},
+            Session.id.one_of(list(session_ids))
+        )
+
+    def set_sessions_pending(self, session_ids: List[str]):
+        Session = Query()
+        self.time_sessions.update({'delivery_state': 'pending'}, Session.id.one_of(list(session_ids)))
+
+    def set_session_entry_gid(self, session_id: str, entry_gid: str):
+        Session = Query()
+        self.time_sessions.update({'asana_entry_gid': entry_gid}, Session.id == session_id)
+
+    def get_in_flight_sessions(self) -> List[Dict]:
+        Session = Query()
+        return self.time_sessions.search(
+            (Session.delivery_state == 'in_flight') & (Session.synced_to_asana == False)
+        )
+
+    def get_claimed_entry_gids(self, task_gid: str) -> List[str]:
+        """
+        Asana time entry gids already matched to delivered sessions for a task.
+        """
+        Session = Query()
+        sessions = self.time_sessions.search(
+            (Session.task_gid == task_gid) & (Session.asana_entry_gid.exists())
+        )
+        return [s['asana_entry_gid'] for s in sessions]
+
+    # Auto-sync schedule: a single document in the config table
+    def get_sync_schedule(self) -> Dict:
+        Config = Query()
+        result = self.config.search(Config.key == 'sync_schedule')
+        return result[0]['value'] if result else {}
+
+    def update_sync_schedule(self, **fields) -> Dict:
+        Config = Query()
+        schedule = {**self.get_sync_schedule(), **fields}
+        self.config.upsert({'key': 'sync_schedule', 'value': schedule}, Config.key == 'sync_schedule')
+        return schedule
+
+    # Outbox Operations
+    def enqueue_outbox(self, op: str, task_gid: str, args: Dict) -> str:
+        """
+        Queue an Asana write for later delivery. Returns the entry id.
+        """
+        entry_id = str(uuid.uuid4())
+        self.outbox.insert({
+            'id': entry_id,
+            'op': op,
+            'task_gid': task_gid,
+            'args': args,
+            'status': 'pending',
+            'attempts': 0,
+            'last_error': None,
+            'created_at': time.time()
+        })
+        return entry_id
+
+    def get_outbox_entries(self, statuses: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Get outbox entries in insertion order, optionally filtered by status.
+        """
+        entries = self.outbox.all()
+        if statuses is not None:
+            entries = [e for e in entries if e['status'] in statuses]
+        return sorted(entries, key=lambda e: e.doc_id)
+
+    def update_outbox_entry(self, entry_id: str, **fields):
+        Entry = Query()
+        self.outbox.update(fields, Entry.id == entry_id)
+
+    def purge_delivered_outbox(self):
+        Entry = Query()
+        self.outbox.remove(Entry.status == 'delivered')
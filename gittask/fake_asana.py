@@ -0,0 +1,469 @@
+"""
+A local stand-in for the Asana REST API.
+
+Serves the endpoints AsanaClient uses from in-memory state, so integration
+tests and benchmarks can run without network access. Latency, errors,
+429 responses and page sizes are configurable.
+
+In-process:
+
+    with FakeAsana(latency=0.05) as fake:
+        client = AsanaClient("token", host=fake.url)
+
+As a subprocess (point gittask at it with GITTASK_ASANA_HOST):
+
+    python -m gittask.fake_asana --port 8765 --tasks 500
+"""
+import argparse
+import datetime
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api/1.0"
+MAX_PAGE_SIZE = 100
+
+class FakeAsana:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        token: Optional[str] = None,
+        max_page_size: int = MAX_PAGE_SIZE,
+    ):
+        self.latency = latency
+        self.token = token
+        self.max_page_size = max_page_size
+        self.requests = []
+        self._errors = []
+        self._lock = threading.RLock()
+        self._gids = itertools.count(1000)
+
+        self.workspaces = {}
+        self.projects = {}
+        self.tags = {}
+        self.tasks = {}
+        self.stories = {}
+        self.time_entries = {}
+        self.custom_fields = {}
+
+        self.me = {'gid': self._gid(), 'name': "Test User", 'email': "test@example.com", 'resource_type': "user"}
+        self.workspace = self.add_workspace("Test Workspace")
+        self.project = self.add_project(self.workspace['gid'], "Test Project")
+
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "FakeAsana":
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # -- Seeding --
+
+    def _gid(self) -> str:
+        return str(next(self._gids))
+
+    def add_workspace(self, name: str) -> Dict:
+        workspace = {'gid': self._gid(), 'name': name, 'resource_type': "workspace"}
+        self.workspaces[workspace['gid']] = workspace
+        return workspace
+
+    def add_project(self, workspace_gid: str, name: str) -> Dict:
+        project = {'gid': self._gid(), 'name': name, 'resource_type': "project", 'workspace': {'gid': workspace_gid}}
+        self.projects[project['gid']] = project
+        return project
+
+    def add_tag(self, workspace_gid: str, name: str, color: Optional[str] = None) -> Dict:
+        tag = {'gid': self._gid(), 'name': name, 'color': color, 'resource_type': "tag", 'workspace': {'gid': workspace_gid}}
+        self.tags[tag['gid']] = tag
+        return tag
+
+    def add_task(
+        self,
+        name: str,
+        workspace_gid: Optional[str] = None,
+        project_gid: Optional[str] = None,
+        assignee_gid: Optional[str] = None,
+        completed: bool = False,
+    ) -> Dict:
+        gid = self._gid()
+        task = {
+            'gid': gid,
+            'name': name,
+            'resource_type': "task",
+            'completed': completed,
+            'assignee': {'gid': assignee_gid} if assignee_gid else None,
+            'workspace': {'gid': workspace_gid or self.workspace['gid']},
+            'projects': [{'gid': project_gid}] if project_gid else [],
+            'tags': [],
+            'followers': [],
+            'notes': "",
+            'custom_fields': [],
+            'actual_time_minutes': 0,
+            'permalink_url': f"https://app.asana.com/0/0/{gid}",
+        }
+        self.tasks[gid] = task
+        self.stories[gid] = []
+        self.time_entries[gid] = []
+        return task
+
+    def add_custom_field(self, workspace_gid: str, name: str, type: str = "text") -> Dict:
+        field = {'gid': self._gid(), 'name': name, 'type': type, 'enum_options': [], 'workspace': {'gid': workspace_gid}}
+        self.custom_fields[field['gid']] = field
+        return field
+
+    # -- Fault injection --
+
+    def inject_error(
+        self,
+        status: int = 500,
+        method: Optional[str] = None,
+        path: Optional[str] = None,
+        times: int = 1,
+        retry_after: Optional[int] = None,
+    ):
+        """
+        Fail the next `times` requests matching `method` and the `path` regex
+        (relative to /api/1.0) with `status`.
+        """
+        with self._lock:
+            self._errors.append({
+                'status': status,
+                'method': method.upper() if method else None,
+                'path': re.compile(path) if path else None,
+                'remaining': times,
+                'retry_after': retry_after,
+            })
+
+    def inject_rate_limit(self, times: int = 1, retry_after: int = 0, method: Optional[str] = None, path: Optional[str] = None):
+        """
+        Answer the next `times` matching requests with 429 Too Many Requests.
+        """
+        self.inject_error(429, method=method, path=path, times=times, retry_after=retry_after)
+
+    def _take_error(self, method: str, path: str) -> Optional[Dict]:
+        with self._lock:
+            for error in self._errors:
+                if error['method'] and error['method'] != method:
+                    continue
+                if error['path'] and not error['path'].search(path):
+                    continue
+                error['remaining'] -= 1
+                if error['remaining'] <= 0:
+                    self._errors.remove(error)
+                return error
+        return None
+
+    def request_count(self, method: Optional[str] = None, path: Optional[str] = None) -> int:
+        """
+        Number of requests received, optionally filtered by method and path regex.
+        """
+        pattern = re.compile(path) if path else None
+        return sum(
+            1 for r in self.requests
+            if (method is None or r['method'] == method.upper())
+            and (pattern is None or pattern.search(r['path']))
+        )
+
+    # -- Request handling --
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Optional[Dict]):
+        """
+        Route a request and return (status, payload, headers).
+        """
+        for route_method, pattern, handler in self._routes():
+            if route_method != method:
+                continue
+            match = re.fullmatch(pattern, path)
+            if match:
+                with self._lock:
+                    return handler(query, (body or {}).get('data') or {}, *match.groups())
+        return _not_found(f"No route for {method} {path}")
+
+    def _routes(self):
+        return (
+            ("GET", r"/users/me", self._get_me),
+            ("GET", r"/workspaces", self._get_workspaces),
+            ("GET", r"/workspaces/(\d+)", self._get_workspace),
+            ("GET", r"/workspaces/(\d+)/projects", self._get_projects),
+            ("GET", r"/workspaces/(\d+)/tags", self._get_tags),
+            ("GET", r"/workspaces/(\d+)/custom_fields", self._get_custom_fields),
+            ("GET", r"/workspaces/(\d+)/typeahead", self._typeahead),
+            ("POST", r"/tags", self._create_tag),
+            ("GET", r"/tasks", self._get_tasks),
+            ("POST", r"/tasks", self._create_task),
+            ("GET", r"/tasks/(\d+)", self._get_task),
+            ("PUT", r"/tasks/(\d+)", self._update_task),
+            ("POST", r"/tasks/(\d+)/addTag", self._add_tag),
+            ("GET", r"/tasks/(\d+)/stories", self._get_stories),
+            ("POST", r"/tasks/(\d+)/stories", self._create_story),
+            ("GET", r"/tasks/(\d+)/time_tracking_entries", self._get_time_entries),
+            ("POST", r"/tasks/(\d+)/time_tracking_entries", self._create_time_entry),
+        )
+
+    def _page(self, items: List[Dict], query: Dict[str, str], path: str):
+        """
+        Return one page of a collection with an Asana-style next_page cursor.
+        """
+        limit = int(query.get('limit') or self.max_page_size)
+        if not 1 <= limit <= self.max_page_size:
+            return _error(400, f"limit must be between 1 and {self.max_page_size}")
+        start = int(query.get('offset') or 0)
+        page = items[start:start + limit]
+        next_page = None
+        if start + limit < len(items):
+            offset = str(start + limit)
+            next_page = {'offset': offset, 'path': f"{path}?limit={limit}&offset={offset}", 'uri': f"{self.url}{path}?limit={limit}&offset={offset}"}
+        return 200, {'data': page, 'next_page': next_page}, {}
+
+    def _get_me(self, query, data):
+        return 200, {'data': self.me}, {}
+
+    def _get_workspaces(self, query, data):
+        return self._page(list(self.workspaces.values()), query, "/workspaces")
+
+    def _get_workspace(self, query, data, workspace_gid):
+        if workspace_gid not in self.workspaces:
+            return _not_found("workspace")
+        return 200, {'data': self.workspaces[workspace_gid]}, {}
+
+    def _get_projects(self, query, data, workspace_gid):
+        projects = [p for p in self.projects.values() if p['workspace']['gid'] == workspace_gid]
+        return self._page(projects, query, f"/workspaces/{workspace_gid}/projects")
+
+    def _get_tags(self, query, data, workspace_gid):
+        tags = [t for t in self.tags.values() if t['workspace']['gid'] == workspace_gid]
+        return self._page(tags, query, f"/workspaces/{workspace_gid}/tags")
+
+    def _get_custom_fields(self, query, data, workspace_gid):
+        fields = [f for f in self.custom_fields.values() if f['workspace']['gid'] == workspace_gid]
+        return self._page(fields, query, f"/workspaces/{workspace_gid}/custom_fields")
+
+    def _typeahead(self, query, data, workspace_gid):
+        needle = (query.get('query') or "").lower()
+        count = int(query.get('count') or 20)
+        tasks = [
+            t for t in self.tasks.values()
+            if t['workspace']['gid'] == workspace_gid and needle in t['name'].lower()
+        ]
+        return 200, {'data': tasks[:count]}, {}
+
+    def _create_tag(self, query, data):
+        if not data.get('name') or data.get('workspace') not in self.workspaces:
+            return _error(400, "name and a valid workspace are required")
+        return 201, {'data': self.add_tag(data['workspace'], data['name'], data.get('color'))}, {}
+
+    def _get_tasks(self, query, data):
+        project_gid = query.get('project')
+        if not project_gid:
+            return _error(400, "project is required")
+        tasks = [t for t in self.tasks.values() if {'gid': project_gid} in t['projects']]
+        if query.get('completed_since') == "now":
+            tasks = [t for t in tasks if not t['completed']]
+        return self._page(tasks, query, "/tasks")
+
+    def _create_task(self, query, data):
+        if not data.get('name') or data.get('workspace') not in self.workspaces:
+            return _error(400, "name and a valid workspace are required")
+        for tag_gid in data.get('tags') or []:
+            if tag_gid not in self.tags:
+                return _error(400, f"Unknown tag: {tag_gid}")
+        projects = data.get('projects') or []
+        task = self.add_task(
+            data['name'],
+            workspace_gid=data['workspace'],
+            project_gid=projects[0] if projects else None,
+            assignee_gid=data.get('assignee'),
+        )
+        for tag_gid in data.get('tags') or []:
+            task['tags'].append({'gid': tag_gid, 'name': self.tags[tag_gid]['name']})
+        task['followers'] = [{'gid': gid} for gid in data.get('followers') or []]
+        task['notes'] = data.get('notes') or ""
+        return 201, {'data': task}, {}
+
+    def _get_task(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        return 200, {'data': self.tasks[task_gid]}, {}
+
+    def _update_task(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        task = self.tasks[task_gid]
+        for field in ('name', 'notes', 'completed'):
+            if field in data:
+                task[field] = data[field]
+        if 'assignee' in data:
+            task['assignee'] = {'gid': data['assignee']} if data['assignee'] else None
+        return 200, {'data': task}, {}
+
+    def _add_tag(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        tag_gid = data.get('tag')
+        if tag_gid not in self.tags:
+            return _error(400, f"Unknown tag: {tag_gid}")
+        task = self.tasks[task_gid]
+        if not any(t['gid'] == tag_gid for t in task['tags']):
+            task['tags'].append({'gid': tag_gid, 'name': self.tags[tag_gid]['name']})
+        return 200, {'data': {}}, {}
+
+    def _get_stories(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        return self._page(self.stories[task_gid], query, f"/tasks/{task_gid}/stories")
+
+    def _create_story(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        html_text = data.get('html_text') or ""
+        story = {
+            'gid': self._gid(),
+            'resource_type': "story",
+            'type': "comment",
+            'html_text': html_text,
+            'text': re.sub(r"<[^>]+>", "", html_text) or data.get('text', ""),
+            'created_by': {'gid': self.me['gid']},
+        }
+        self.stories[task_gid].append(story)
+        return 201, {'data': story}, {}
+
+    def _get_time_entries(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        return self._page(self.time_entries[task_gid], query, f"/tasks/{task_gid}/time_tracking_entries")
+
+    def _create_time_entry(self, query, data, task_gid):
+        if task_gid not in self.tasks:
+            return _not_found("task")
+        minutes = data.get('duration_minutes')
+        if not isinstance(minutes, int) or minutes < 1:
+            return _error(400, "duration_minutes must be a positive integer")
+        entry = {
+            'gid': self._gid(),
+            'resource_type': "time_tracking_entry",
+            'duration_minutes': minutes,
+            'entered_on': data.get('entered_on') or datetime.date.today().isoformat(),
+            'created_by': {'gid': self.me['gid']},
+        }
+        self.time_entries[task_gid].append(entry)
+        self.tasks[task_gid]['actual_time_minutes'] += minutes
+        return 201, {'data': entry}, {}
+
+def _error(status: int, message: str):
+    return status, {'errors': [{'message': message}]}, {}
+
+def _not_found(what: str):
+    return _error(404, f"Not found: {what}")
+
+def _make_handler(fake: FakeAsana):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self):
+            parsed = urlparse(self.path)
+            path = parsed.path
+            if path.startswith(API_PREFIX):
+                path = path[len(API_PREFIX):]
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b""
+            fake.requests.append({'method': self.command, 'path': path, 'query': query})
+
+            if fake.latency:
+                time.sleep(fake.latency)
+
+            if fake.token and self.headers.get('Authorization') != f"Bearer {fake.token}":
+                return self._send(*_error(401, "Not Authorized"))
+
+            error = fake._take_error(self.command, path)
+            if error:
+                headers = {}
+                if error['retry_after'] is not None:
+                    headers['Retry-After'] = str(error['retry_after'])
+                return self._send(error['status'], {'errors': [{'message': f"Injected {error['status']}"}]}, headers)
+
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                return self._send(*_error(400, "Invalid JSON body"))
+            try:
+                response = fake.handle(self.command, path, query, body)
+            except Exception as e:
+                response = _error(500, str(e))
+            self._send(*response)
+
+        def _send(self, status: int, payload: Dict, headers: Dict[str, str]):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', "application/json")
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Asana API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering each request")
+    parser.add_argument("--tasks", type=int, default=0, help="Number of open tasks to seed in the test project")
+    parser.add_argument("--tags", type=int, default=0, help="Number of tags to seed in the test workspace")
+    args = parser.parse_args(argv)
+
+    fake = FakeAsana(host=args.host, port=args.port, latency=args.latency)
+    for i in range(args.tasks):
+        fake.add_task(f"Task {i + 1}", project_gid=fake.project['gid'], assignee_gid=fake.me['gid'])
+    for i in range(args.tags):
+        fake.add_tag(fake.workspace['gid'], f"tag-{i + 1}")
+
+    print(f"Fake Asana API on {fake.url}", flush=True)
+    print(f"Workspace {fake.workspace['gid']}, project {fake.project['gid']}", flush=True)
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,234 @@
-import git
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
+import subprocess
+import threading
+
+class RepoProbe:
+    """
+    The enclosing repository, found by reading .git directly.
+
+    Resolving the current branch and the repository root this way avoids
+    importing GitPython, which costs far more than reading a couple of files.
+    Handles linked worktrees and submodules, whose `.git` is a gitdir file.
+    """
+    def __init__(self, working_dir: str, git_dir: str):
+        self.working_dir = working_dir
+        self.git_dir = git_dir
+
+    @staticmethod
+    def _is_git_dir(path: str) -> bool:
+        return (
+            os.path.isfile(os.path.join(path, "HEAD"))
+            and (os.path.isdir(os.path.join(path, "objects")) or os.path.isfile(os.path.join(path, "commondir")))
+        )
+
+    @staticmethod
+    def _read_gitfile(path: str) -> Optional[str]:
+        """
+        Target of a `gitdir: <path>` file, relative paths resolved against its directory.
+        """
+        try:
+            with open(path) as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if not content.startswith("gitdir:"):
+            return None
+        target = content[len("gitdir:"):].strip()
+        return os.path.normpath(os.path.join(os.path.dirname(path), target))
+
+    @classmethod
+    def find(cls, path: str = ".") -> Optional["RepoProbe"]:
+        """
+        Walk up from `path` to the first directory containing `.git`, like
+        git.Repo(path, search_parent_directories=True). Returns None outside a repository.
+        """
+        if os.environ.get("GIT_DIR"):
+            git_dir = os.path.abspath(os.environ["GIT_DIR"])
+            working_dir = os.environ.get("GIT_WORK_TREE") or os.getcwd()
+            return cls(os.path.abspath(working_dir), git_dir)
+
+        current = os.path.normpath(os.path.abspath(os.path.expanduser(path)))
+        while True:
+            dotgit = os.path.join(current, ".git")
+            if os.path.isdir(dotgit):
+                if cls._is_git_dir(dotgit):
+                    return cls(current, dotgit)
+            elif os.path.exists(dotgit):
+                # Like git, don't look further up past an invalid gitfile
+                git_dir = cls._read_gitfile(dotgit)
+                if git_dir and cls._is_git_dir(git_dir):
+                    return cls(current, git_dir)
+                return None
+            elif cls._is_git_dir(current):
+                # Bare repository
+                return cls(current, current)
+
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+    def head(self) -> str:
+        with open(os.path.join(self.git_dir, "HEAD")) as f:
+            return f.read().strip()
+
+    def current_branch(self) -> Optional[str]:
+        """
+        Name of the checked out branch (which may not have commits yet), or None when HEAD is detached.
+        """
+        head = self.head()
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        return None
+
+class CatFile:
+    """
+    One long-lived `git cat-file --batch` process to read objects from.
+
+    Resolving a ref or reading a commit is a write and a read on its pipes
+    instead of a new git process each time. Safe to share between threads.
+    """
+    def __init__(self, working_dir: str):
+        self.working_dir = working_dir
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.working_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def read(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        (sha, type, content) of the object `rev` names, or None if there is none.
+        """
+        if not rev or "\n" in rev:
+            return None
+        with self._lock:
+            process = self._start()
+            try:
+                process.stdin.write(rev.encode() + b"\n")
+                process.stdin.flush()
+                header = process.stdout.readline().decode().split()
+                if len(header) != 3:
+                    # "<rev> missing" or "<rev> ambiguous"
+                    return None
+                sha, obj_type, size = header
+                content = process.stdout.read(int(size) + 1)[:-1]
+            except (OSError, ValueError):
+                self._process = None
+                raise
+            return sha, obj_type, content
+
+    def close(self):
+        with self._lock:
+            if self._process is not None:
+                self._process.stdin.close()
+                self._process.wait()
+                self._process = None
+
+def parse_commit(sha: str, content: bytes) -> Dict:
+    """
+    Fields of a raw commit object.
+    """
+    header, _, message = content.decode("utf-8", errors="replace").partition("\n\n")
+    commit = {'sha': sha, 'parents': [], 'author': "", 'committed_at': 0}
+    for line in header.split("\n"):
+        key, _, value = line.partition(" ")
+        if key == "parent":
+            commit['parents'].append(value)
+        elif key == "author":
+            commit['author'] = value.rsplit(" ", 2)[0]
+        elif key == "committer":
+            commit['committed_at'] = int(value.rsplit(" ", 2)[1])
+    commit['message'] = message
+    commit['summary'] = message.split("\n", 1)[0]
+    return commit
+
+# Fields after rev-list's "commit <sha>" line. Ends each record with a NUL,
+# which cannot occur in a commit message (rev-list ignores -z with --format)
+LOG_FORMAT = "%P%n%an <%ae>%n%ct%n%B%x00"
+
+def parse_log_record(record: str) -> Dict:
+    """
+    One commit of `git rev-list --format=LOG_FORMAT`, with the fields of parse_commit.
+    """
+    header, parents, author, committed_at, message = record.split("\n", 4)
+    return {
+        'sha': header.split(" ", 1)[1],
+        'parents': parents.split(),
+        'author': author,
+        'committed_at': int(committed_at),
+        'message': message,
+        'summary': message.split("\n", 1)[0],
+    }
 
 class GitHandler:
     def __init__(self, repo_path: str = "."):
-        try:
-            self.repo = git.Repo(repo_path, search_parent_directories=True)
-        except git.InvalidGitRepositoryError:
+        self.probe = RepoProbe.find(repo_path)
+        if self.probe is None:
             raise Exception("Not a git repository")
+        self._repo = None
+        self.cat_file = CatFile(self.probe.working_dir)
+
+    @property
+    def repo(self):
+        # GitPython is only loaded for the operations that need it
+        if self._repo is None:
+            import git
+            try:
+                self._repo = git.Repo(self.probe.working_dir)
+            except git.InvalidGitRepositoryError:
+                raise Exception("Not a git repository")
+        return self._repo
 
     def get_current_branch(self) -> str:
-        try:
-            return self.repo.active_branch.name
-        except TypeError:
-            # Detached HEAD
+        branch = self.probe.current_branch()
+        if branch is None:
             return "DETACHED_HEAD"
+        return branch
+
+    def resolve_ref(self, rev: str) -> Optional[str]:
+        """
+        Commit sha `rev` points to, or None if it does not name a commit.
+        """
+        obj = self.cat_file.read(f"{rev}^{{commit}}")
+        return obj[0] if obj else None
+
+    def read_commit(self, rev: str) -> Optional[Dict]:
+        obj = self.cat_file.read(f"{rev}^{{commit}}")
+        return parse_commit(obj[0], obj[2]) if obj else None
+
+    def log_range(self, base: str, head: str = "HEAD", limit: Optional[int] = None) -> List[Dict]:
+        """
+        Commits reachable from `head` but not from `base`, newest first, like `git log base..head`.
+        Raises ValueError if either does not name a commit.
+        """
+        shas = []
+        for rev in (base, head):
+            sha = self.resolve_ref(rev)
+            if sha is None:
+                raise ValueError(f"Unknown revision '{rev}'")
+            shas.append(sha)
+
+        # git's own revision walk: one process for the whole range
+        cmd = ["git", "rev-list", f"--format={LOG_FORMAT}"]
+        if limit is not None:
+            cmd.append(f"--max-count={limit}")
+        cmd.append(f"{shas[0]}..{shas[1]}")
+        output = subprocess.run(cmd, cwd=self.probe.working_dir, capture_output=True, check=True).stdout
+        records = (record.lstrip("\n") for record in output.decode("utf-8", errors="replace").split("\0"))
+        return [parse_log_record(record) for record in records if record]
+
+    def close(self):
+        self.cat_file.close()
 
     def list_branches(self) -> List[str]:
         return [head.name for head in self.repo.heads]
@@ -26,7 +240,7 @@ class GitHandler:
             self.repo.git.checkout(branch_name)
 
     def get_repo_root(self) -> str:
-        return self.repo.working_dir
+        return self.probe.working_dir
 
     def get_remote_url(self, remote_name: str = "origin") -> Optional[str]:
         try:
@@ -35,6 +249,7 @@ class GitHandler:
             return None
 
     def push_branch(self, branch_name: str, remote_name: str = "origin"):
+        import git
         try:
             remote = self.repo.remote(remote_name)
             # Push and set upstream
@@ -0,0 +1,71 @@
+"""
+Entry point for the git hooks installed by `gt hook install`.
+
+Git runs the post-checkout hook on every checkout, so this module only
+imports the database and the repo probe: no typer, rich, asana or GitPython.
+
+    python -m gittask.hook post-checkout <previous HEAD> <new HEAD> <branch flag>
+"""
+import sys
+from typing import Optional
+from .git_handler import RepoProbe
+
+HOOK_MARKER = "# gittask hook"
+
+def post_checkout(prev_head: str, new_head: str, branch_flag: str, db=None, path: str = ".") -> Optional[str]:
+    """
+    Move time tracking to the branch that was just checked out.
+    Returns a message for the user, or None if nothing changed.
+    """
+    # "0" means files were checked out, the branch stayed the same
+    if branch_flag != "1":
+        return None
+    probe = RepoProbe.find(path)
+    if probe is None:
+        return None
+    branch = probe.current_branch()
+    if branch is None:
+        # Detached HEAD, e.g. during a rebase: leave tracking alone
+        return None
+
+    if db is None:
+        from .database import DBManager
+        db = DBManager()
+    repo_path = probe.working_dir
+
+    active = db.get_active_session()
+    if active and active['branch'] == branch and active['repo_path'] == repo_path:
+        return None
+
+    task_info = db.get_task_for_branch(branch, repo_path)
+    if task_info:
+        # Stops whatever else was running
+        db.start_session(branch, repo_path, task_info['asana_task_gid'])
+        return f"gittask: tracking time for '{branch}' -> '{task_info['asana_task_name']}'"
+
+    if active and active['repo_path'] == repo_path:
+        db.stop_current_session(active['branch'], repo_path)
+        return f"gittask: stopped tracking time for '{active['branch']}' ('{branch}' is not linked to a task)"
+    return None
+
+HOOKS = {
+    'post-checkout': post_checkout,
+}
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in HOOKS:
+        print(f"usage: python -m gittask.hook {{{','.join(HOOKS)}}} ARGS...", file=sys.stderr)
+        return 2
+    try:
+        message = HOOKS[argv[0]](*argv[1:])
+    except Exception as e:
+        # Never fail the git command the hook runs for
+        print(f"gittask: hook failed: {e}", file=sys.stderr)
+        return 0
+    if message:
+        print(message)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
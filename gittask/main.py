@@ -1,53 +1,95 @@
+import importlib
 import typer
-from .commands import auth, init, checkout, status, sync, commit, push, pr, finish, tags, session, track
+from typer.core import TyperCommand, TyperGroup
+from . import metrics
+
+# Subcommands are only imported when they run: several command modules open
+# the database, the keyring or the git repository at import time, and some
+# pull in heavy libraries (PyGithub, asana, textual).
+# name -> ("module:attribute", help). Typer apps become command groups.
+COMMANDS = {
+    "auth": ("gittask.commands.auth:app", "Authentication commands"),
+    "init": ("gittask.commands.init:init", "Configuration commands"),
+    "checkout": ("gittask.commands.checkout:checkout", "Checkout branch and track time"),
+    "status": ("gittask.commands.status:status", "Show status"),
+    "sync": ("gittask.commands.sync:sync", "Sync time to Asana"),
+    "commit": ("gittask.commands.commit:commit", "Commit changes and post the message to the linked Asana task."),
+    "push": ("gittask.commands.push:push", "Push changes to remote and post a summary of commits to the linked Asana task."),
+    "pr": ("gittask.commands.pr:app", "Pull Request commands"),
+    "finish": ("gittask.commands.finish:finish", "Complete the current task: Stop timer, Merge PR, Close Asana Task, Cleanup."),
+    "tags": ("gittask.commands.tags:app", "Tag commands"),
+    "stop": ("gittask.commands.session:stop", "Stop time tracking"),
+    "start": ("gittask.commands.session:start", "Start time tracking"),
+    "track": ("gittask.commands.track:track", "Track time on a global task"),
+    "outbox": ("gittask.commands.outbox:app", "Pending Asana updates"),
+    "debug": ("gittask.commands.debug:app", "Diagnostics"),
+    "hook": ("gittask.commands.hook:app", "Git hooks"),
+    "prompt": ("gittask.commands.prompt:prompt", "Current session for shell prompts and status lines"),
+    "daemon": ("gittask.commands.daemon:app", "Resident process that runs commands faster"),
+    "gui": ("gittask.commands.gui:gui", "Launch the Graphical User Interface (TUI)"),
+}
+
+def load_command(name: str):
+    """
+    Import a subcommand's module and build its click command.
+    """
+    target, help = COMMANDS[name]
+    module_name, attribute = target.split(":")
+    obj = getattr(importlib.import_module(module_name), attribute)
+    if isinstance(obj, typer.Typer):
+        command = typer.main.get_group(obj)
+        command.help = help
+    else:
+        single = typer.Typer(add_completion=False)
+        single.command(name=name, help=help)(obj)
+        command = typer.main.get_command(single)
+    command.name = name
+    return command
+
+class LazyGroup(TyperGroup):
+    """
+    Command group that loads subcommands from COMMANDS on first use.
+    The command list in --help is built from the help texts alone.
+    """
+    _listing = False
+
+    def list_commands(self, ctx):
+        return list(self.commands) + [name for name in COMMANDS if name not in self.commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.commands or cmd_name not in COMMANDS:
+            return super().get_command(ctx, cmd_name)
+        if self._listing:
+            return TyperCommand(cmd_name, help=COMMANDS[cmd_name][1])
+        try:
+            command = load_command(cmd_name)
+        except Exception as e:
+            # e.g. git commands run outside a repository
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(code=1)
+        self.commands[cmd_name] = command
+        return command
+
+    def format_help(self, ctx, formatter):
+        self._listing = True
+        try:
+            return super().format_help(ctx, formatter)
+        finally:
+            self._listing = False
 
 app = typer.Typer(
     name="gittask",
     help="Git-Asana CLI & Time Tracker",
     add_completion=False,
+    cls=LazyGroup,
 )
 
-app.add_typer(auth.app, name="auth", help="Authentication commands")
-app.command(name="init", help="Configuration commands")(init.init)
-app.command(name="checkout", help="Checkout branch and track time")(checkout.checkout)
-app.command(name="status", help="Show status")(status.status)
-app.command(name="sync", help="Sync time to Asana")(sync.sync)
-app.command(name="commit")(commit.commit)
-app.command(name="push")(push.push)
-app.add_typer(pr.app, name="pr", help="Pull Request commands")
-app.command(name="finish")(finish.finish)
-app.add_typer(tags.app, name="tags", help="Tag commands")
-app.command(name="stop", help="Stop time tracking")(session.stop)
-app.command(name="start", help="Start time tracking")(session.start)
-app.command(name="track", help="Track time on a global task")(track.track)
-
-@app.command(name="gui", help="Launch the Graphical User Interface (TUI)")
-def gui():
-    from .tui.app import GitTaskApp
-    from .config import ConfigManager
-    from .asana_client import AsanaClient
-    
-    # Warm up AsanaClient to initialize multiprocessing pool before Textual starts
-    # This prevents "bad value(s) in fds_to_keep" error on macOS
-    try:
-        config = ConfigManager()
-        token = config.get_api_token()
-        if token:
-            client = AsanaClient(token)
-            client.close()
-    except Exception:
-        # Ignore errors here, let the app handle them or fail later
-        pass
-
-    app = GitTaskApp()
-    app.run()
-
 @app.callback()
 def main(ctx: typer.Context):
     """
     Git-Asana CLI & Time Tracker
     """
-    pass
+    metrics.set_command(ctx.invoked_subcommand)
 
 if __name__ == "__main__":
     app()
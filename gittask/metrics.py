@@ -0,0 +1,259 @@
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Keep the metrics file bounded: once it grows past MAX_BYTES it is trimmed
+# to the most recent MAX_RECORDS calls.
+MAX_RECORDS = 5000
+MAX_BYTES = 2 * 1024 * 1024
+FLUSH_EVERY = 50
+
+RATE_LIMIT_HEADERS = ('retry-after', 'x-ratelimit-limit', 'x-ratelimit-remaining', 'x-ratelimit-reset')
+
+_records = []
+_lock = threading.Lock()
+_command = None
+
+def metrics_path() -> Path:
+    override = os.environ.get("GITTASK_METRICS_FILE")
+    if override:
+        return Path(override)
+    return Path.home() / ".gittask" / "metrics.jsonl"
+
+def enabled() -> bool:
+    return os.environ.get("GITTASK_METRICS", "1") != "0"
+
+def set_command(name: Optional[str]):
+    """
+    Set the gittask command that subsequent API calls are attributed to.
+    """
+    global _command
+    _command = name
+
+def record(
+    service: str,
+    endpoint: str,
+    duration_ms: float,
+    status: Optional[int] = None,
+    retries: int = 0,
+    request_bytes: Optional[int] = None,
+    response_bytes: Optional[int] = None,
+    rate_limit: Optional[Dict[str, str]] = None,
+):
+    """
+    Record one API call. Records are buffered and appended to the metrics file.
+    """
+    if not enabled():
+        return
+    entry = {
+        'ts': time.time(),
+        'command': _command,
+        'service': service,
+        'endpoint': endpoint,
+        'duration_ms': round(duration_ms, 2),
+        'status': status,
+        'retries': retries,
+        'request_bytes': request_bytes,
+        'response_bytes': response_bytes,
+        'rate_limit': rate_limit or None,
+    }
+    with _lock:
+        _records.append(entry)
+        should_flush = len(_records) >= FLUSH_EVERY
+    if should_flush:
+        flush()
+
+def flush():
+    """
+    Append buffered records to the metrics file, trimming it if it grew too large.
+    """
+    with _lock:
+        if not _records:
+            return
+        pending = list(_records)
+        _records.clear()
+
+    try:
+        path = metrics_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            for entry in pending:
+                f.write(json.dumps(entry) + "\n")
+        if path.stat().st_size > MAX_BYTES:
+            lines = path.read_text().splitlines()[-MAX_RECORDS:]
+            path.write_text("\n".join(lines) + "\n")
+    except OSError:
+        # Metrics must never break a command
+        pass
+
+atexit.register(flush)
+
+def load_records() -> List[Dict]:
+    flush()
+    path = metrics_path()
+    if not path.exists():
+        return []
+    records = []
+    for line in path.read_text().splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+def clear():
+    with _lock:
+        _records.clear()
+    path = metrics_path()
+    if path.exists():
+        path.unlink()
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+def summarize(records: List[Dict], by: str = "endpoint") -> List[Dict]:
+    """
+    Aggregate records per endpoint or per command, slowest total time first.
+    """
+    groups = {}
+    for r in records:
+        if by == "command":
+            key = r.get('command') or "(unknown)"
+        else:
+            key = f"{r['service']} {r['endpoint']}"
+        groups.setdefault(key, []).append(r)
+
+    rows = []
+    for key, items in groups.items():
+        durations = [r['duration_ms'] for r in items]
+        errors = sum(1 for r in items if r.get('status') and r['status'] >= 400)
+        last_rate_limit = next((r['rate_limit'] for r in reversed(items) if r.get('rate_limit')), None)
+        rows.append({
+            'key': key,
+            'calls': len(items),
+            'errors': errors,
+            'retries': sum(r.get('retries') or 0 for r in items),
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'p99': percentile(durations, 99),
+            'total_ms': sum(durations),
+            'response_bytes': sum(r.get('response_bytes') or 0 for r in items),
+            'rate_limit': last_rate_limit,
+        })
+    return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+def _normalize_path(path: str) -> str:
+    # Collapse ids so calls to the same endpoint aggregate together
+    path = path.split("?", 1)[0]
+    path = re.sub(r"^/repos/[^/]+/[^/]+", "/repos/{owner}/{repo}", path)
+    return re.sub(r"/\d+(?=/|$)", "/{gid}", path)
+
+def asana_endpoint(method: str, url: str) -> str:
+    path = url.split("/api/1.0", 1)[-1] if "/api/1.0" in url else url
+    return f"{method.upper()} {_normalize_path(path)}"
+
+def rate_limit_headers(headers) -> Dict[str, str]:
+    if not headers:
+        return {}
+    found = {}
+    for name, value in dict(headers).items():
+        if name.lower() in RATE_LIMIT_HEADERS:
+            found[name.lower()] = value
+    return found
+
+def instrument_asana(api_client):
+    """
+    Record every HTTP request the Asana SDK makes through this ApiClient.
+    """
+    rest_client = api_client.rest_client
+    request = rest_client.request
+
+    def instrumented_request(method, url, *args, **kwargs):
+        body = kwargs.get('body')
+        request_bytes = len(json.dumps(body, default=str)) if body is not None else None
+        start = time.perf_counter()
+        status = None
+        headers = None
+        retries = 0
+        response_bytes = None
+        try:
+            response = request(method, url, *args, **kwargs)
+            status = getattr(response, 'status', None)
+            raw = getattr(response, 'urllib3_response', None)
+            headers = raw.headers if raw is not None else None
+            history = getattr(getattr(raw, 'retries', None), 'history', None)
+            retries = len(history) if history else 0
+            data = getattr(response, 'data', None)
+            response_bytes = len(data) if isinstance(data, (bytes, str)) else None
+            return response
+        except Exception as e:
+            status = getattr(e, 'status', None)
+            headers = getattr(e, 'headers', None)
+            raise
+        finally:
+            record(
+                "asana",
+                asana_endpoint(method, url),
+                (time.perf_counter() - start) * 1000,
+                status=status,
+                retries=retries,
+                request_bytes=request_bytes,
+                response_bytes=response_bytes,
+                rate_limit=rate_limit_headers(headers),
+            )
+
+    rest_client.request = instrumented_request
+    return api_client
+
+def instrument_github(github_client):
+    """
+    Record every REST call PyGithub makes through this client's requester.
+    """
+    requester = github_client.requester
+    request = requester.requestJsonAndCheck
+
+    def instrumented_request(verb, url, *args, **kwargs):
+        body = kwargs.get('input')
+        request_bytes = len(json.dumps(body, default=str)) if body is not None else None
+        start = time.perf_counter()
+        status = 200
+        headers = None
+        response_bytes = None
+        try:
+            headers, data = request(verb, url, *args, **kwargs)
+            response_bytes = len(json.dumps(data, default=str)) if data is not None else None
+            return headers, data
+        except Exception as e:
+            status = getattr(e, 'status', None)
+            headers = getattr(e, 'headers', None)
+            raise
+        finally:
+            # Pagination follows absolute URLs, the first page uses a path
+            path = url
+            if "://" in path:
+                path = "/" + path.split("://", 1)[1].partition("/")[2]
+            record(
+                "github",
+                f"{verb.upper()} {_normalize_path(path)}",
+                (time.perf_counter() - start) * 1000,
+                status=status,
+                request_bytes=request_bytes,
+                response_bytes=response_bytes,
+                rate_limit=rate_limit_headers(headers),
+            )
+
+    requester.requestJsonAndCheck = instrumented_request
+    return github_client
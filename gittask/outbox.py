@@ -0,0 +1,173 @@
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Asana writes that can be delivered after the command has returned.
+# Assigning, tagging and completing are idempotent, and comments carry the
+# entry id as an idempotency key, so every operation is safe to retry.
+OPERATIONS = ('post_comment', 'assign_task', 'add_tag_to_task', 'complete_task')
+MAX_ATTEMPTS = 5
+
+def enqueue(db, op: str, task_gid: str, **args) -> str:
+    """
+    Queue an Asana write. `args` are passed to the AsanaClient method on delivery.
+    """
+    if op not in OPERATIONS:
+        raise ValueError(f"Unsupported outbox operation: {op}")
+    return db.enqueue_outbox(op, task_gid, args)
+
+def enqueue_assign(db, task_gid: str, assignee_gid: str) -> bool:
+    """
+    Queue an assignment unless the cached task metadata says it is already
+    assigned to `assignee_gid`. Returns True if a write was queued.
+    """
+    cached = db.get_cached_task(task_gid)
+    if cached and cached.get('assignee_gid') == assignee_gid:
+        return False
+    enqueue(db, 'assign_task', task_gid, assignee_gid=assignee_gid)
+    if cached:
+        db.update_cached_task(task_gid, assignee_gid=assignee_gid)
+    return True
+
+def enqueue_tags(db, task_gid: str, tag_gids: List[str]) -> int:
+    """
+    Queue the tags the cached task metadata does not list yet.
+    Returns the number of writes queued.
+    """
+    cached = db.get_cached_task(task_gid)
+    existing = set(cached.get('tag_gids') or []) if cached else set()
+    new_tags = [tag_gid for tag_gid in dict.fromkeys(tag_gids) if tag_gid not in existing]
+    for tag_gid in new_tags:
+        enqueue(db, 'add_tag_to_task', task_gid, tag_gid=tag_gid)
+    if cached and new_tags:
+        db.update_cached_task(task_gid, tag_gids=list(existing) + new_tags)
+    return len(new_tags)
+
+@contextmanager
+def delivery_lock(db, name: str = "outbox.lock", timeout: float = 0):
+    """
+    Make sure only one process delivers at a time. Yields False if another
+    process still holds the lock after waiting up to `timeout` seconds.
+    """
+    if fcntl is None:
+        yield True
+        return
+
+    lock_path = Path(db.db_path).with_name(name)
+    deadline = time.monotonic() + timeout
+    with open(lock_path, "w") as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.1)
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _deliver_entry(db, client, entry):
+    args = dict(entry['args'])
+    if entry['op'] == 'post_comment':
+        # A previous attempt may have reached Asana before failing or crashing
+        if entry['attempts'] > 0 or entry['status'] == 'in_flight':
+            if client.has_comment_with_key(entry['task_gid'], entry['id']):
+                return
+        args['idempotency_key'] = entry['id']
+
+    db.update_outbox_entry(entry['id'], status='in_flight')
+    getattr(client, entry['op'])(entry['task_gid'], **args)
+
+def deliver(db, client) -> Tuple[int, int]:
+    """
+    Deliver pending outbox entries in the order they were queued.
+    A failing or failed entry holds back the later entries for the same task,
+    so writes to a task are always applied in order. Returns (delivered, failed).
+    """
+    delivered = 0
+    failed = 0
+    attempted = set()
+    blocked_tasks = set()
+
+    def waiting():
+        # Entries queued since the last pass, e.g. while the lock was held
+        entries = db.get_outbox_entries(['pending', 'in_flight', 'failed'])
+        return [e for e in entries if e['id'] not in attempted and e['status'] != 'failed']
+
+    while waiting():
+        with delivery_lock(db) as acquired:
+            if not acquired:
+                # The process holding the lock checks for new entries before it lets go
+                return delivered, failed
+
+            while True:
+                entries = db.get_outbox_entries(['pending', 'in_flight', 'failed'])
+                new_entries = [e for e in entries if e['id'] not in attempted]
+                if not any(e['status'] != 'failed' for e in new_entries):
+                    break
+                for entry in new_entries:
+                    attempted.add(entry['id'])
+                    if entry['status'] == 'failed':
+                        # Only `gt outbox flush --retry-failed` lets later writes through
+                        blocked_tasks.add(entry['task_gid'])
+                        continue
+                    if entry['task_gid'] in blocked_tasks:
+                        continue
+                    try:
+                        _deliver_entry(db, client, entry)
+                        db.update_outbox_entry(entry['id'], status='delivered', last_error=None)
+                        delivered += 1
+                    except Exception as e:
+                        attempts = entry['attempts'] + 1
+                        status = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+                        db.update_outbox_entry(entry['id'], status=status, attempts=attempts, last_error=str(e))
+                        blocked_tasks.add(entry['task_gid'])
+                        failed += 1
+
+            db.purge_delivered_outbox()
+        # Anything queued between the last check and releasing the lock
+        # found the lock held, so it is ours to deliver
+    return delivered, failed
+
+def deliver_in_background():
+    """
+    Spawn a detached `gittask outbox flush` so the calling command returns immediately.
+    A running gittask daemon delivers instead, without starting a new process.
+    """
+    run_in_background(["outbox", "flush", "--quiet"])
+
+def run_in_background(argv: List[str]):
+    """
+    Run a gittask command after the calling command, without waiting for it:
+    in the daemon if one is running, else in a detached process.
+    """
+    from . import daemon
+    if daemon.serving():
+        daemon.after_request(argv)
+        return
+    if daemon.forward(argv, detach=True) is not None:
+        return
+
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "gittask.main", *argv],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        # The work stays queued and is picked up by the next run
+        pass
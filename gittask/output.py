@@ -0,0 +1,77 @@
+"""
+Where command output goes.
+
+Commands print through `console`, which stands in for the rich Console of
+the current context: the terminal normally, a buffer while the daemon runs a
+command for a client (see daemon.run_command). sys.stdout and sys.stderr are
+routed the same way while capturing. The target is a ContextVar, so a capture
+only applies to the thread or task that started it.
+"""
+import contextvars
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Optional, TextIO
+from rich.console import Console
+
+_terminal = Console()
+_console = contextvars.ContextVar("gittask_console", default=None)
+_stream = contextvars.ContextVar("gittask_stream", default=None)
+_install_lock = threading.Lock()
+
+def current() -> Console:
+    """
+    The rich Console output goes to in this context.
+    """
+    return _console.get() or _terminal
+
+class ConsoleProxy:
+    """
+    Module-level `console` of the commands: forwards to current().
+    """
+    def __getattr__(self, name):
+        return getattr(current(), name)
+
+console = ConsoleProxy()
+
+class ContextStream:
+    """
+    sys.stdout/sys.stderr stand-in: writes to the current capture, if any,
+    else to the stream it replaced.
+    """
+    def __init__(self, fallback: TextIO):
+        self.fallback = fallback
+
+    def _target(self) -> TextIO:
+        return _stream.get() or self.fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+def _route_std_streams():
+    with _install_lock:
+        for name in ("stdout", "stderr"):
+            stream = getattr(sys, name)
+            if not isinstance(stream, ContextStream):
+                setattr(sys, name, ContextStream(stream))
+
+@contextmanager
+def capture(target: Console, stream: Optional[TextIO] = None):
+    """
+    Send this context's console output to `target`, and its stdout and
+    stderr to `stream` (the console's file by default).
+    """
+    _route_std_streams()
+    console_token = _console.set(target)
+    stream_token = _stream.set(stream or target.file)
+    try:
+        yield target
+    finally:
+        _stream.reset(stream_token)
+        _console.reset(console_token)
@@ -0,0 +1,97 @@
+"""
+Shell prompt / tmux status-line segment for the current session.
+
+DBManager writes the active session to a small state file (state.json next
+to the database) whenever a session starts or stops. Rendering only reads
+that file: no database, git, keyring or network, and only the standard
+library is imported.
+
+    gt prompt --format '{task} {elapsed}'
+    python -m gittask.prompt
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+STATE_FILE = "state.json"
+DEFAULT_FORMAT = "{task} {elapsed}"
+MAX_TASK_LENGTH = 30
+
+USAGE = "usage: gittask prompt [--format FORMAT] [--empty TEXT] [--max-length N]\n"
+
+def state_path() -> str:
+    return os.environ.get("GITTASK_STATE_FILE") or str(Path.home() / ".gittask" / STATE_FILE)
+
+def write_state(path: str, state: Dict):
+    """
+    Replace the state file atomically, so a prompt never reads half of it.
+    """
+    # Rendering never writes: keep threading off the prompt's import path
+    import threading
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def read_state(path: Optional[str] = None) -> Dict:
+    try:
+        with open(path or state_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'active': False}
+
+def format_elapsed(seconds: float) -> str:
+    minutes = int(max(seconds, 0) // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+def render(state: Dict, fmt: str = DEFAULT_FORMAT, empty: str = "",
+           max_length: int = MAX_TASK_LENGTH, now: Optional[float] = None) -> str:
+    if not state.get('active'):
+        return empty
+    task = state.get('task') or state.get('branch') or ""
+    if max_length and len(task) > max_length:
+        task = task[:max_length - 1] + "…"
+    repo_path = state.get('repo_path') or ""
+    elapsed = (now or time.time()) - state.get('start_time', 0)
+    return fmt.format(
+        task=task,
+        branch=state.get('branch', ""),
+        repo="" if repo_path == "GLOBAL" else os.path.basename(repo_path),
+        elapsed=format_elapsed(elapsed),
+        minutes=int(max(elapsed, 0) // 60),
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Parsed by hand: argparse alone would cost more than the rest of this module
+    options = {'--format': DEFAULT_FORMAT, '--empty': "", '--max-length': str(MAX_TASK_LENGTH)}
+    args = list(sys.argv[1:] if argv is None else argv)
+    while args:
+        name, sep, value = args.pop(0).partition("=")
+        if name in ("-h", "--help"):
+            sys.stdout.write(USAGE)
+            return 0
+        if name not in options:
+            sys.stderr.write(USAGE)
+            return 2
+        if not sep:
+            if not args:
+                sys.stderr.write(USAGE)
+                return 2
+            value = args.pop(0)
+        options[name] = value
+    try:
+        line = render(read_state(), options['--format'], options['--empty'], int(options['--max-length']))
+    except (KeyError, ValueError, IndexError) as e:
+        sys.stderr.write(f"gittask prompt: bad format or option: {e}\n")
+        return 2
+    sys.stdout.write(line + "\n" if line else "")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+# Default lifetime of cached read results, in seconds
+DEFAULT_TTL = 30.0
+MAX_ENTRIES = 256
+
+class ResponseCache:
+    """
+    LRU of recent read results with a per-entry TTL.
+
+    Loads are single-flight: concurrent callers asking for the same key while
+    it is being fetched wait for that one fetch instead of starting their own.
+    Works for threads (get_or_load) and for asyncio (aget_or_load).
+    Keys are tuples whose first element is a scope (e.g. one per API token),
+    so a write can drop everything cached for that scope. A load that was
+    running when its scope was dropped is not cached.
+
+    Values are copied in and out, so callers may modify what they get.
+    """
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._ainflight = {}
+        self._lock = threading.Lock()
+        # Bumped by invalidate(): per scope, and for everything
+        self._cleared = 0
+        self._generations = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def generation(self, key: Hashable) -> tuple:
+        """
+        Token to pass to set() for a value loaded from now on: the value is
+        dropped if the key's scope is invalidated in the meantime.
+        """
+        with self._lock:
+            return self._cleared, self._generations.get(key[0], 0)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[tuple] = None):
+        value = copy.deepcopy(value)
+        with self._lock:
+            if generation is not None and generation != (self._cleared, self._generations.get(key[0], 0)):
+                # Loaded before a write that may have changed it
+                return
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for `key`, or call `loader` once for all
+        concurrent callers and cache its result.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return copy.deepcopy(future.result())
+
+        generation = self.generation(key)
+        try:
+            value = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.set(key, value, ttl, generation)
+            future.set_result(copy.deepcopy(value))
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """
+        asyncio version of get_or_load. If the caller that started the fetch is
+        cancelled, the waiting callers are cancelled too and the next call retries.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        future = self._ainflight.get(key)
+        if future is not None:
+            return copy.deepcopy(await asyncio.shield(future))
+
+        future = asyncio.get_running_loop().create_future()
+        self._ainflight[key] = future
+        generation = self.generation(key)
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it, don't warn about an unretrieved exception
+            future.exception()
+            raise
+        else:
+            self.set(key, value, ttl, generation)
+            future.set_result(copy.deepcopy(value))
+            return value
+        finally:
+            self._ainflight.pop(key, None)
+
+    def invalidate(self, scope: Optional[Hashable] = None):
+        """
+        Drop cached results for one scope, or everything.
+        """
+        with self._lock:
+            if scope is None:
+                self._cleared += 1
+                self._entries.clear()
+                return
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            for key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[key]
+
+# Shared by every client in the process, so short-lived clients benefit too
+RESPONSE_CACHE = ResponseCache()
@@ -0,0 +1,135 @@
+"""
+Automatic background sync of closed time sessions.
+
+Commands that start or stop a session call trigger(), and the daemon calls
+it while idle. Once enough entries are waiting, or the oldest one has waited
+long enough, it runs `gittask sync --auto` in the background, which delivers
+one batch. Failed runs back off exponentially, and a 429's Retry-After is
+respected, so a struggling Asana is not hammered. A delivery Asana rejects
+outright (e.g. a 404 for a deleted task) is parked instead: auto-sync skips
+it from then on, while `gt sync` keeps retrying it.
+
+Set GITTASK_AUTOSYNC=0 to only sync with `gt sync`.
+"""
+import os
+import time
+from typing import Dict, Optional, Tuple
+from . import outbox
+from . import sync_engine
+
+# Sync once this many time entries are waiting...
+BATCH_SIZE = 5
+# ...or the oldest closed session has waited this long, in seconds
+MAX_AGE = 30 * 60
+# Don't start more than one background sync per interval
+TRIGGER_INTERVAL = 60
+BACKOFF_BASE = 60
+BACKOFF_MAX = 60 * 60
+
+def enabled() -> bool:
+    return os.environ.get("GITTASK_AUTOSYNC") != "0"
+
+def _key(delivery_sessions) -> str:
+    return sync_engine.delivery_key([s['id'] for s in delivery_sessions])
+
+def is_permanent(error: Exception) -> bool:
+    """
+    True if retrying won't help: Asana rejected the request with a 4xx other than 429.
+    """
+    return sync_engine._is_rejected(error) and getattr(error, 'status', None) != 429
+
+def is_due(db, now: Optional[float] = None) -> bool:
+    now = time.time() if now is None else now
+    schedule = db.get_sync_schedule()
+    if now < schedule.get('next_attempt_at', 0):
+        return False
+    parked = set(schedule.get('parked', []))
+    sessions = [
+        s for group in sync_engine.group_sessions(sync_engine.pending_sessions(db))
+        if _key(group) not in parked for s in group
+    ]
+    if not sessions:
+        return False
+    if len(sync_engine.group_sessions(sessions)) >= BATCH_SIZE:
+        return True
+    return now - min(s['end_time'] for s in sessions) >= MAX_AGE
+
+def trigger(db, now: Optional[float] = None) -> bool:
+    """
+    Start a background sync if one is due. Returns True if one was started.
+    """
+    now = time.time() if now is None else now
+    if not enabled():
+        return False
+    if now - db.get_sync_schedule().get('triggered_at', 0) < TRIGGER_INTERVAL:
+        return False
+    if not is_due(db, now):
+        return False
+    db.update_sync_schedule(triggered_at=now)
+    outbox.run_in_background(["sync", "--auto"])
+    return True
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Seconds a rate-limited (429) response asked us to wait, if it said.
+    """
+    if getattr(error, 'status', None) != 429:
+        return None
+    headers = getattr(error, 'headers', None) or {}
+    for name, value in dict(headers).items():
+        if name.lower() == 'retry-after':
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+def record_failure(db, error: Exception, now: Optional[float] = None) -> Dict:
+    now = time.time() if now is None else now
+    failures = db.get_sync_schedule().get('failures', 0) + 1
+    delay = min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+    delay = max(delay, retry_after(error) or 0)
+    return db.update_sync_schedule(failures=failures, next_attempt_at=now + delay, last_error=str(error))
+
+def record_success(db, now: Optional[float] = None) -> Dict:
+    now = time.time() if now is None else now
+    return db.update_sync_schedule(failures=0, next_attempt_at=0, last_error=None, last_synced_at=now)
+
+def run(db, client, paid_plan: bool, now: Optional[float] = None) -> Tuple[int, int]:
+    """
+    Deliver one batch of pending time entries, stopping at the first failure
+    that may be temporary. Returns (entries delivered, entries failed).
+    """
+    with outbox.delivery_lock(db, "sync.lock") as acquired:
+        if not acquired:
+            # A manual or another automatic sync is running
+            return 0, 0
+
+        delivered = failed = 0
+        parked = set(db.get_sync_schedule().get('parked', []))
+        rejection = None
+        try:
+            sync_engine.reconcile_in_flight(db, client, paid_plan)
+            deliveries = sync_engine.plan_sync(db, paid_plan)['deliveries']
+            # Forget parked deliveries that are no longer pending
+            parked &= {_key(d['sessions']) for d in deliveries}
+            # One batch per run, the rest go out with the next one
+            waiting = [d for d in deliveries if _key(d['sessions']) not in parked]
+            for delivery in waiting[:sync_engine.BATCH_SIZE]:
+                try:
+                    sync_engine.execute_delivery(db, client, delivery, paid_plan)
+                    delivered += 1
+                except Exception as e:
+                    if not is_permanent(e):
+                        raise
+                    # Don't let it hold back the entries queued after it
+                    parked.add(_key(delivery['sessions']))
+                    rejection = e
+                    failed += 1
+        except Exception as e:
+            db.update_sync_schedule(parked=sorted(parked))
+            record_failure(db, e, now)
+            return delivered, failed + 1
+        record_success(db, now)
+        db.update_sync_schedule(parked=sorted(parked), last_error=str(rejection) if rejection else None)
+    return delivered, failed
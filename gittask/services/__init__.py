@@ -0,0 +1,39 @@
+"""
+Command logic shared by the CLI commands and the TUI.
+
+Service functions don't print or prompt. They report what they do through
+an optional progress callback,
+
+    progress(message, level="info", done=None, total=None)
+
+where level is "info", "success", "warning", "error" or "detail", and `done`
+and `total` are set on step counts (e.g. entries synced so far). Failures
+that end the action raise ServiceError with a message meant for the user.
+"""
+from typing import Callable, Optional
+
+Progress = Callable[..., None]
+
+class ServiceError(Exception):
+    """
+    The action failed; the message says why and is shown as is.
+    """
+
+def report(progress: Optional[Progress], message: str, level: str = "info",
+           done: Optional[int] = None, total: Optional[int] = None):
+    if progress is not None:
+        progress(message, level=level, done=done, total=total)
+
+# Rich styles for the CLI
+STYLES = {'success': "green", 'warning': "yellow", 'error': "red", 'detail': "dim"}
+
+def console_progress(console) -> Progress:
+    """
+    A progress callback that prints messages to a rich console. Step counts are left out.
+    """
+    def progress(message, level="info", done=None, total=None):
+        if total is not None:
+            return
+        style = STYLES.get(level)
+        console.print(f"[{style}]{message}[/{style}]" if style else message)
+    return progress
@@ -0,0 +1,61 @@
+from typing import Dict, Optional
+from .. import scheduler
+from . import Progress, ServiceError, report
+
+def switch_branch(db, git, branch_name: str, create_new: bool = False, progress: Optional[Progress] = None) -> str:
+    """
+    Stop the current session and check out `branch_name`. Returns the repository root.
+    """
+    current_branch = git.get_current_branch()
+    repo_path = git.get_repo_root()
+    
+    if current_branch == branch_name:
+        # Tracking may still need to be started
+        report(progress, f"Already on branch {branch_name}", "info")
+        return repo_path
+
+    if current_branch != "DETACHED_HEAD":
+        # Just stop any active session to be safe/clean
+        db.stop_any_active_session()
+        report(progress, f"Stopped tracking time for {current_branch}", "info")
+
+    try:
+        git.checkout_branch(branch_name, create_new=create_new)
+    except Exception as e:
+        raise ServiceError(f"Error checking out branch: {e}")
+    report(progress, f"Switched to branch {branch_name}", "success")
+    return repo_path
+
+def start_tracking(db, branch_name: str, repo_path: str, task_info: Dict, progress: Optional[Progress] = None) -> bool:
+    """
+    Start a session for a linked branch unless one is running. Returns True if one was started.
+    """
+    from tinydb import Query
+    Session = Query()
+    open_sessions = db.time_sessions.search(
+        (Session.branch == branch_name) & 
+        (Session.repo_path == repo_path) & 
+        (Session.end_time == None)
+    )
+    
+    if open_sessions:
+        report(progress, f"Already tracking time for '{branch_name}'", "info")
+        return False
+
+    db.start_session(branch_name, repo_path, task_info['asana_task_gid'])
+    report(progress, f"Started tracking time for '{branch_name}' -> '{task_info['asana_task_name']}'", "success")
+    scheduler.trigger(db)
+    return True
+
+def checkout_branch(db, git, branch_name: str, create_new: bool = False, progress: Optional[Progress] = None) -> Optional[Dict]:
+    """
+    Check out a branch and track time on its linked task, without prompting:
+    an unlinked branch is checked out untracked. Returns the linked task, if any.
+    """
+    repo_path = switch_branch(db, git, branch_name, create_new, progress)
+    task_info = db.get_task_for_branch(branch_name, repo_path)
+    if task_info:
+        start_tracking(db, branch_name, repo_path, task_info, progress)
+    else:
+        report(progress, "Time tracking disabled for this branch (not linked).", "warning")
+    return task_info
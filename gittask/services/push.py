@@ -0,0 +1,108 @@
+import subprocess
+from typing import Dict, Optional
+from .. import outbox
+from . import Progress, ServiceError, report
+
+def push_branch(db, git, config, remote: str = "origin", branch: Optional[str] = None,
+                progress: Optional[Progress] = None, capture_output: bool = False) -> Dict:
+    """
+    Push a branch and queue a summary of the pushed commits for the linked Asana task.
+    With `capture_output`, git's output is reported as progress instead of
+    going to the terminal. Returns the branch, the commits and whether a summary was queued.
+    """
+    current_branch = git.get_current_branch()
+    target_branch = branch or current_branch
+    
+    # 1. Identify commits to be pushed
+    # We need to find the upstream branch to compare against
+    upstream = f"{remote}/{target_branch}"
+    
+    # Check if upstream exists
+    has_upstream = git.resolve_ref(upstream) is not None
+        
+    commits = []
+    
+    # Determine range to log
+    if has_upstream:
+        base = upstream
+    else:
+        # If no upstream, compare against origin/main (assuming main is the base)
+        # If we are on a feature branch, we likely branched off main, so we want
+        # commits that are reachable from HEAD but not from origin/main.
+        base = "origin/main"
+
+    try:
+        for commit in git.log_range(base, "HEAD"):
+            commits.append({"hash": commit['sha'][:7], "message": commit['summary']})
+    except ValueError:
+        # The range is invalid (e.g. origin/main doesn't exist): skip the summary
+        report(progress, "Could not determine new commits. Skipping summary.", "warning")
+
+    # 2. Push
+    report(progress, f"Pushing to {remote}/{target_branch}...")
+    # If it's a new branch, it needs --set-upstream
+    cmd = ["git", "push"]
+    if not has_upstream:
+        cmd.extend(["--set-upstream", remote, target_branch])
+    else:
+        cmd.extend([remote, target_branch])
+
+    if capture_output:
+        pushed = subprocess.run(cmd, capture_output=True, text=True)
+        output = (pushed.stdout + pushed.stderr).strip()
+        if output:
+            report(progress, output, "detail")
+        if pushed.returncode != 0:
+            raise ServiceError(f"git push failed:\n{output}")
+    else:
+        try:
+            subprocess.run(cmd, check=True)
+        except subprocess.CalledProcessError:
+            raise ServiceError("git push failed.")
+    report(progress, "Push successful.", "success")
+
+    result = {'branch': target_branch, 'commits': commits, 'queued': False}
+
+    # 3. Post to Asana
+    if not commits:
+        return result
+    repo_path = git.get_repo_root()
+    task_info = db.get_task_for_branch(current_branch, repo_path)
+    if not task_info:
+        report(progress, "Branch not linked to Asana task. Skipping comment.", "warning")
+        return result
+    if not config.get_api_token():
+        report(progress, "Not authenticated with Asana. Skipping comment.", "warning")
+        return result
+
+    try:
+        # Get repo URL for links
+        remote_url = git.get_remote_url(remote)
+        if not remote_url:
+            raise ServiceError(f"Could not find remote '{remote}'.")
+
+        # Convert SSH to HTTPS if needed
+        repo_url = remote_url
+        if remote_url.startswith("git@"):
+            repo_url = remote_url.replace(":", "/").replace("git@", "https://")
+        
+        # Remove .git suffix
+        if repo_url.endswith(".git"):
+            repo_url = repo_url[:-4]
+        
+        branch_url = f"{repo_url}/tree/{target_branch}"
+        lines = [f"<body><strong>🚀 Pushed to <a href=\"{branch_url}\">{target_branch}</a></strong><ul>"]
+        for c in commits:
+            url = f"{repo_url}/commit/{c['hash']}"
+            lines.append(f"<li><a href=\"{url}\">{c['hash']}</a> - {c['message']}</li>")
+        lines.append("</ul></body>")
+        
+        comment_text = "".join(lines)
+        # Delivered in the background so the push returns immediately
+        outbox.enqueue(db, 'post_comment', task_info['asana_task_gid'], text=comment_text)
+        outbox.deliver_in_background()
+        result['queued'] = True
+        report(progress, f"Queued push summary for Asana task: {task_info['asana_task_name']}", "success")
+    except Exception as e:
+        report(progress, f"Failed to post comment to Asana: {e}", "error")
+    return result
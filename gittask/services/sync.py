@@ -0,0 +1,71 @@
+from typing import Dict, Optional
+from ..asana_client import AsanaClient
+from .. import outbox
+from .. import scheduler
+from .. import sync_engine
+from . import Progress, ServiceError, report
+
+def sync_time(db, config, progress: Optional[Progress] = None) -> Dict:
+    """
+    Deliver queued Asana updates and post all closed sessions' time.
+    Returns counts: updates delivered, sessions recovered, synced and failed.
+    """
+    token = config.get_api_token()
+    if not token:
+        raise ServiceError("Not authenticated.")
+
+    result = {'updates': 0, 'recovered': 0, 'synced': 0, 'failed': 0}
+    with AsanaClient(token) as client:
+        # Deliver any queued Asana updates while we have a client
+        result['updates'], _ = outbox.deliver(db, client)
+        if result['updates']:
+            report(progress, f"Delivered {result['updates']} queued Asana updates.")
+
+        with outbox.delivery_lock(db, "sync.lock") as acquired:
+            if not acquired:
+                report(progress, "A background sync is running. Try again in a moment.", "warning")
+                return result
+
+            # Resolve sessions a previous, interrupted sync may already have posted
+            paid_plan = config.get_paid_plan_status()
+            try:
+                result['recovered'] = sync_engine.reconcile_in_flight(db, client, paid_plan)
+                if result['recovered']:
+                    report(progress, f"Recovered {result['recovered']} sessions already posted by an interrupted sync.")
+            except Exception as e:
+                report(progress, f"Failed to check interrupted syncs: {e}", "error")
+
+            if not db.get_unsynced_sessions():
+                report(progress, "Nothing to sync.", "success")
+                return result
+
+            # Open sessions and unresolved in-flight deliveries are left out of the plan
+            plan = sync_engine.plan_sync(db, paid_plan)
+            sessions_to_sync = [s for d in plan['deliveries'] for s in d['sessions']]
+            if not sessions_to_sync:
+                report(progress, "Only active sessions found. Stop them to sync.", "warning")
+                return result
+
+            report(progress, f"Syncing {len(sessions_to_sync)} sessions...")
+            # One entry per task per day
+            total = len(plan['deliveries'])
+            if total < len(sessions_to_sync):
+                report(progress, f"Combined into {total} entries (one per task per day).", "detail")
+
+            for done, delivery in enumerate(plan['deliveries'], 1):
+                group = delivery['sessions']
+                try:
+                    # Time entries are only possible on paid plans, free plans get a comment
+                    sync_engine.execute_delivery(db, client, delivery, paid_plan)
+                    result['synced'] += len(group)
+                except Exception as e:
+                    result['failed'] += len(group)
+                    ids = ", ".join(str(s['id']) for s in group)
+                    label = "session" if len(group) == 1 else "sessions"
+                    report(progress, f"Failed to sync {label} {ids}: {e}", "error")
+                report(progress, f"Synced {done} of {total} entries", done=done, total=total)
+
+            if not result['failed']:
+                # Asana is reachable again: lift any auto-sync backoff
+                scheduler.record_success(db)
+    return result
@@ -0,0 +1,167 @@
+"""
+Cold-start measurements for gittask commands.
+
+Each command's entry path runs in a fresh interpreter: the installed `gt`
+entry point (daemon.cli) with the daemon disabled, as `gt <command> --help`,
+so the command's module is loaded (see main.LazyGroup) but nothing is run.
+Times are the fastest of several runs, on top of a bare `python -c pass`, so
+they don't depend on how long Python itself takes to start on the machine.
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Extra start-up time allowed per command, in milliseconds.
+# Override with e.g. GITTASK_STARTUP_BUDGETS="status=80,checkout=400".
+DEFAULT_BUDGET_MS = 200
+BUDGETS_MS = {
+    # Checked all the time, and only reads the local database
+    'status': 80,
+    'sync': 400,
+    'commit': 400,
+    'push': 400,
+    'outbox': 500,
+    'auth': 500,
+    'checkout': 600,
+    'init': 600,
+    'pr': 600,
+    'tags': 600,
+    'track': 600,
+    'finish': 900,
+}
+
+# Libraries that are slow to import. A command may only load the ones it uses.
+HEAVY_MODULES = ('asana', 'github', 'textual', 'git', 'questionary', 'httpx')
+ALLOWED_HEAVY = {
+    'sync': {'asana'},
+    'commit': {'asana'},
+    'outbox': {'asana'},
+    'auth': {'questionary'},
+    'checkout': {'asana', 'questionary'},
+    'init': {'asana', 'questionary'},
+    'tags': {'asana', 'questionary'},
+    'track': {'asana', 'questionary'},
+    'pr': {'github'},
+    'finish': {'asana', 'github', 'questionary'},
+}
+
+# Shown as the command name for `gt --help`, which only imports gittask.main
+HELP = "--help"
+
+def budgets() -> Dict[str, int]:
+    """
+    Budget per command: the defaults, with GITTASK_STARTUP_BUDGETS applied.
+    """
+    from .main import COMMANDS
+
+    result = {name: BUDGETS_MS.get(name, DEFAULT_BUDGET_MS) for name in [HELP, *COMMANDS]}
+    for item in os.environ.get("GITTASK_STARTUP_BUDGETS", "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            result[name.strip()] = int(value)
+    return result
+
+def entry_code(command: str) -> str:
+    """
+    Python code that walks the entry path of `command` and prints the heavy modules it loaded.
+    """
+    argv = ["gt", HELP] if command == HELP else ["gt", command, HELP]
+    lines = [
+        "import os, sys",
+        # Measure the local path, not a round trip to a running daemon
+        "os.environ['GITTASK_DAEMON'] = '0'",
+        # --help without typer's rich formatting, which `gt <command>` never loads
+        "os.environ['TYPER_USE_RICH'] = '0'",
+        f"sys.argv = {argv!r}",
+        "sys.stdout = open(os.devnull, 'w')",
+        "from gittask import daemon",
+        "try:",
+        "    daemon.cli()",
+        "except SystemExit as e:",
+        "    code = e.code",
+        "sys.stdout = sys.__stdout__",
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+        "sys.exit(code or 0)",
+    ]
+    return "\n".join(lines)
+
+def _run(args: List[str], env=None) -> Tuple[float, subprocess.CompletedProcess]:
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env)
+    return time.perf_counter() - start, result
+
+def baseline(runs: int = 5, env=None) -> float:
+    """
+    Fastest wall time of a bare interpreter, in seconds (noise only adds time).
+    """
+    return min(_run(["-c", "pass"], env)[0] for _ in range(runs))
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Rows of `python -X importtime` output: module, self and cumulative microseconds.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # Header line
+            continue
+        rows.append({
+            'module': parts[2].strip(),
+            'self_us': int(parts[0]),
+            'cumulative_us': int(parts[1]),
+        })
+    return rows
+
+def package_breakdown(rows: List[Dict], top: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    Import time per top-level package in milliseconds, heaviest first.
+    """
+    totals = {}
+    for row in rows:
+        package = row['module'].split(".")[0]
+        totals[package] = totals.get(package, 0) + row['self_us']
+    ranked = sorted(((package, us / 1000) for package, us in totals.items()), key=lambda p: -p[1])
+    return ranked[:top] if top else ranked
+
+def measure(command: str, runs: int = 5, base: Optional[float] = None, env=None) -> Dict:
+    """
+    Start-up cost of one command: fastest extra wall time over a bare
+    interpreter, the heavy modules it loaded and its -X importtime rows.
+    """
+    if base is None:
+        base = baseline(runs, env)
+    code = entry_code(command)
+    times = []
+    for _ in range(runs):
+        elapsed, result = _run(["-c", code], env)
+        if result.returncode != 0:
+            raise RuntimeError(f"'{command}' failed to load: {result.stderr.strip().splitlines()[-1]}")
+        times.append(elapsed)
+    heavy = [m for m in result.stdout.strip().split(",") if m]
+    _, profiled = _run(["-X", "importtime", "-c", code], env)
+    return {
+        'command': command,
+        'ms': max(min(times) - base, 0) * 1000,
+        'heavy': heavy,
+        'imports': parse_importtime(profiled.stderr),
+    }
+
+def check(result: Dict, budget_ms: Optional[int] = None) -> List[str]:
+    """
+    Budget and heavy-import violations of a measure() result.
+    """
+    command = result['command']
+    if budget_ms is None:
+        budget_ms = budgets().get(command, DEFAULT_BUDGET_MS)
+    problems = []
+    if result['ms'] > budget_ms:
+        problems.append(f"{command}: takes {result['ms']:.0f} ms, budget is {budget_ms} ms")
+    unexpected = set(result['heavy']) - ALLOWED_HEAVY.get(command, set())
+    if unexpected:
+        problems.append(f"{command}: imports {', '.join(sorted(unexpected))}")
+    return problems
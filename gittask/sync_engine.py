@@ -0,0 +1,239 @@
+import datetime
+import hashlib
+import time
+from typing import Dict, List, Optional
+from . import metrics
+
+# Time entries posted per batch. Auto-sync sends one batch per run.
+BATCH_SIZE = 20
+# Asana's requests per minute on paid and free plans, for estimating how long a sync takes
+RATE_LIMITS_PER_MINUTE = {True: 1500, False: 150}
+# Assumed latency of an Asana request when there are no metrics to go by
+DEFAULT_LATENCY_MS = 400.0
+
+# The request each kind of write makes (as named in the API metrics)
+ENDPOINTS = {
+    'time_entry': "POST /tasks/{gid}/time_tracking_entries",
+    'comment': "POST /tasks/{gid}/stories",
+    'post_comment': "POST /tasks/{gid}/stories",
+    'assign_task': "PUT /tasks/{gid}",
+    'add_tag_to_task': "POST /tasks/{gid}/addTag",
+    'complete_task': "PUT /tasks/{gid}",
+}
+
+def delivery_key(session_ids: List[str]) -> str:
+    """
+    Deterministic idempotency key for a delivery, derived from the sessions it covers.
+    """
+    joined = "|".join(sorted(str(session_id) for session_id in session_ids))
+    return "gt-" + hashlib.sha1(joined.encode()).hexdigest()[:16]
+
+def entry_minutes(duration_seconds: float) -> int:
+    """
+    Minutes Asana records for a duration (matches AsanaClient.add_time_entry rounding).
+    """
+    return max(int(duration_seconds // 60), 1)
+
+def session_date(session: Dict) -> datetime.date:
+    """
+    Local calendar day a session belongs to (the day it started).
+    """
+    timestamp = session.get('start_time') or session['end_time']
+    return datetime.date.fromtimestamp(timestamp)
+
+def group_sessions(sessions: List[Dict]) -> List[List[Dict]]:
+    """
+    Group closed sessions by task and calendar day, so each group is posted as
+    one time entry. Groups keep the order of their first session.
+    """
+    groups = {}
+    for session in sessions:
+        key = (session['task_gid'], session_date(session))
+        groups.setdefault(key, []).append(session)
+    return list(groups.values())
+
+def pending_sessions(db) -> List[Dict]:
+    """
+    Closed sessions waiting to be synced (in-flight ones are reconciled, not resent).
+    """
+    return [
+        s for s in db.get_unsynced_sessions()
+        if s['end_time'] is not None and s.get('delivery_state') != 'in_flight'
+    ]
+
+def plan_sync(db, paid_plan: bool, batch_size: int = BATCH_SIZE) -> Dict:
+    """
+    Work a sync would do, read from the local database only.
+
+    `deliveries` has one time entry (paid plans) or comment (free plans) per
+    task per day, split into `batches`; a sync executes them with
+    execute_delivery. `requests` lists the endpoint of every HTTP request the
+    sync makes, including reconciling interrupted syncs and queued outbox writes.
+    """
+    kind = 'time_entry' if paid_plan else 'comment'
+    deliveries = []
+    for group in group_sessions(pending_sessions(db)):
+        deliveries.append({
+            'task_gid': group[0]['task_gid'],
+            'entered_on': session_date(group[0]),
+            'minutes': entry_minutes(sum(s['duration_seconds'] for s in group)),
+            'kind': kind,
+            'branches': list(dict.fromkeys(s['branch'] for s in group)),
+            'sessions': group,
+        })
+
+    requests = []
+    queued = db.get_outbox_entries(['pending', 'in_flight'])
+    for entry in queued:
+        if entry['op'] == 'post_comment' and (entry['attempts'] > 0 or entry['status'] == 'in_flight'):
+            requests.append("GET /tasks/{gid}/stories")
+        requests.append(ENDPOINTS[entry['op']])
+
+    interrupted = {s.get('delivery_key') for s in db.get_in_flight_sessions()}
+    if interrupted and paid_plan:
+        requests.append("GET /users/me")
+    for _ in interrupted:
+        requests.append("GET /tasks/{gid}/time_tracking_entries" if paid_plan else "GET /tasks/{gid}/stories")
+
+    requests += [ENDPOINTS[kind]] * len(deliveries)
+    return {
+        'paid_plan': paid_plan,
+        'deliveries': deliveries,
+        'batches': [deliveries[i:i + batch_size] for i in range(0, len(deliveries), batch_size)],
+        'interrupted': len(interrupted),
+        'queued': len(queued),
+        'requests': requests,
+    }
+
+def execute_delivery(db, client, delivery: Dict, paid_plan: bool):
+    """
+    Post one delivery of a plan_sync() plan.
+    """
+    deliver_sessions(db, client, delivery['sessions'], paid_plan, delivery['entered_on'])
+
+def estimate_duration(plan: Dict, records: Optional[List[Dict]] = None, now: Optional[float] = None) -> Dict:
+    """
+    Expected wall time of a plan in seconds: the requests one after another at
+    their measured median latency, held back by the plan's rate limit and any
+    Retry-After Asana sent recently.
+    """
+    now = time.time() if now is None else now
+    if records is None:
+        records = [r for r in metrics.load_records() if r['service'] == "asana"]
+    measured = {row['key']: row['p50'] for row in metrics.summarize(records)}
+
+    latency_ms = sum(measured.get(f"asana {endpoint}", DEFAULT_LATENCY_MS) for endpoint in plan['requests'])
+    limit = RATE_LIMITS_PER_MINUTE[bool(plan['paid_plan'])]
+    # Each request past the per-minute quota waits for the next minute
+    throttled = (max(len(plan['requests']) - 1, 0) // limit) * 60
+
+    retry_wait = 0.0
+    for r in records:
+        retry_after = (r.get('rate_limit') or {}).get('retry-after')
+        if r.get('status') == 429 and retry_after:
+            try:
+                retry_wait = max(retry_wait, r['ts'] + float(retry_after) - now)
+            except ValueError:
+                continue
+
+    return {
+        'seconds': max(latency_ms / 1000, throttled) + retry_wait,
+        'measured': sum(1 for endpoint in set(plan['requests']) if f"asana {endpoint}" in measured),
+        'rate_limit_per_minute': limit,
+        'retry_wait': retry_wait,
+    }
+
+def _is_rejected(error: Exception) -> bool:
+    """
+    True if Asana definitely rejected the request (4xx), so nothing was written.
+    """
+    status = getattr(error, 'status', None)
+    return isinstance(status, int) and 400 <= status < 500
+
+def deliver_sessions(db, client, sessions: List[Dict], paid_plan: bool, entered_on: Optional[datetime.date] = None):
+    """
+    Post the time of a group of sessions (same task) to Asana as one delivery.
+
+    The sessions are marked in_flight before the request and delivered after it.
+    If the request fails in a way that may still have reached Asana, they stay
+    in_flight and reconcile_in_flight resolves them on the next sync.
+    """
+    session_ids = [s['id'] for s in sessions]
+    key = delivery_key(session_ids)
+    task_gid = sessions[0]['task_gid']
+    # Round once for the whole group instead of once per session
+    duration = sum(s['duration_seconds'] for s in sessions)
+    if entered_on is None:
+        entered_on = session_date(sessions[0])
+
+    db.set_sessions_in_flight(session_ids, key, entered_on.isoformat())
+    try:
+        if paid_plan:
+            entry = client.add_time_entry(task_gid, duration, entered_on=entered_on)
+            if isinstance(entry, dict) and entry.get('gid'):
+                for session_id in session_ids:
+                    db.set_session_entry_gid(session_id, entry['gid'])
+        else:
+            branches = list(dict.fromkeys(s['branch'] for s in sessions))
+            client.log_time_comment(task_gid, duration, ", ".join(branches), idempotency_key=key)
+    except Exception as e:
+        if _is_rejected(e):
+            db.set_sessions_pending(session_ids)
+        raise
+
+    for session_id in session_ids:
+        db.mark_session_synced(session_id)
+
+def _find_time_entry(db, client, sessions: List[Dict]) -> Optional[str]:
+    """
+    Find an unclaimed time entry on the task that matches an in-flight delivery.
+    """
+    task_gid = sessions[0]['task_gid']
+    minutes = entry_minutes(sum(s['duration_seconds'] for s in sessions))
+    entered_on = sessions[0].get('delivery_date')
+    claimed = set(db.get_claimed_entry_gids(task_gid))
+    user_gid = client.get_user_gid()
+
+    for entry in client.get_time_entries(task_gid):
+        if entry['gid'] in claimed:
+            continue
+        created_by = (entry.get('created_by') or {}).get('gid')
+        if created_by != user_gid or entry.get('duration_minutes') != minutes:
+            continue
+        if entered_on and entry.get('entered_on') != entered_on:
+            continue
+        return entry['gid']
+    return None
+
+def reconcile_in_flight(db, client, paid_plan: bool) -> int:
+    """
+    Resolve sessions left in_flight by an interrupted sync.
+    Deliveries found in Asana are marked delivered, the rest go back to pending.
+    Returns the number of sessions that turned out to be delivered already.
+    """
+    groups = {}
+    for session in db.get_in_flight_sessions():
+        groups.setdefault(session.get('delivery_key'), []).append(session)
+
+    recovered = 0
+    for key, sessions in groups.items():
+        session_ids = [s['id'] for s in sessions]
+        task_gid = sessions[0]['task_gid']
+
+        if paid_plan:
+            entry_gid = _find_time_entry(db, client, sessions)
+            if entry_gid:
+                for session_id in session_ids:
+                    db.set_session_entry_gid(session_id, entry_gid)
+            delivered = entry_gid is not None
+        else:
+            delivered = client.has_comment_with_key(task_gid, key)
+
+        if delivered:
+            for session_id in session_ids:
+                db.mark_session_synced(session_id)
+            recovered += len(session_ids)
+        else:
+            db.set_sessions_pending(session_ids)
+
+    return recovered
@@ -1,5 +1,8 @@
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer
+from typing import Optional
+from ..config import ConfigManager
+from ..async_asana_client import AsyncAsanaClient
 from .screens.dashboard import Dashboard
 from .screens.task_search import TaskSearch
 from .screens.progress import ProgressScreen
@@ -23,6 +26,25 @@ class GitTaskApp(App):
         "status": StatusScreen,
     }
 
+    asana: Optional[AsyncAsanaClient] = None
+
+    def get_asana_client(self) -> Optional[AsyncAsanaClient]:
+        """
+        Async Asana client shared by all screens, created on first use.
+        Returns None when not authenticated.
+        """
+        if self.asana is None:
+            token = ConfigManager().get_api_token()
+            if not token:
+                return None
+            self.asana = AsyncAsanaClient(token)
+        return self.asana
+
+    async def on_unmount(self) -> None:
+        if self.asana is not None:
+            await self.asana.aclose()
+            self.asana = None
+
     def compose(self) -> ComposeResult:
         yield Header()
         yield Footer()
@@ -1,16 +1,24 @@
+from textual import work
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Button, Label, Static
 from textual.containers import Container, Horizontal, VerticalScroll
+from ...config import ConfigManager
 from ...database import DBManager
+from ...git_handler import GitHandler
+from ...services import checkout as checkout_service
+from ...services import push as push_service
+from ...services import sync as sync_service
 from ..widgets.task_card import TaskCard
-from .log_view import LogScreen
+from .log_view import LogScreen, ServiceProgress
 import time
 
 class Dashboard(Screen):
     def __init__(self, **kwargs):
         super().__init__(id="dashboard", **kwargs)
         self.last_active_session_id = None
+        # Mounted cards by branch, so a refresh only touches the ones that changed
+        self.cards = {}
 
     def compose(self) -> ComposeResult:
         yield Container(
@@ -51,8 +59,6 @@ class Dashboard(Screen):
 
     def refresh_tasks(self) -> None:
         grid = self.query_one("#task-grid")
-        grid.remove_children()
-        
         db = DBManager()
         branch_map = db.branch_map.all()
         active = db.get_active_session()
@@ -92,24 +98,51 @@ class Dashboard(Screen):
                 
         # Get current branch
         try:
-            from ...git_handler import GitHandler
             git = GitHandler()
             current_branch = git.get_current_branch()
         except Exception:
             current_branch = None
 
-        # Create cards
-        for task_data in tasks_to_show:
-            grid.mount(TaskCard(task_data, current_branch=current_branch))
+        self.update_cards(grid, tasks_to_show, current_branch, active)
+
+    def update_cards(self, grid, tasks_to_show: list, current_branch: str, active) -> None:
+        """
+        Bring the grid in line with `tasks_to_show`, keyed by branch: cards of
+        removed links go, new links get a card, and existing cards are updated
+        in place and moved only if their position changed.
+        """
+        wanted = {task_data['branch'] for task_data in tasks_to_show}
+        for branch in [branch for branch in self.cards if branch not in wanted]:
+            self.cards.pop(branch).remove()
+
+        # Cards in their current order, kept in step with the moves below
+        mounted = set(self.cards.values())
+        order = [card for card in grid.children if card in mounted]
+        for index, task_data in enumerate(tasks_to_show):
+            card = self.cards.get(task_data['branch'])
+            if card is None:
+                card = TaskCard(task_data, current_branch=current_branch, active_session=active)
+                self.cards[task_data['branch']] = card
+                if index < len(order):
+                    grid.mount(card, before=order[index])
+                else:
+                    grid.mount(card)
+                order.insert(index, card)
+                continue
+
+            card.update_state(task_data, current_branch, active)
+            if order[index] is not card:
+                grid.move_child(card, before=order[index])
+                order.remove(card)
+                order.insert(index, card)
             
     def on_task_card_status_changed(self, message: TaskCard.StatusChanged) -> None:
-        # Refresh all cards to update active state (only one can be active)
-        # Or just re-mount everything to be safe and simple
+        # Only one session can be active: updates the previously active card too
         self.refresh_tasks()
         
     def on_task_card_checkout_requested(self, message: TaskCard.CheckoutRequested) -> None:
         self.notify(f"Checking out {message.branch}...")
-        self.run_worker(self.perform_checkout(message.branch))
+        self.perform_checkout(message.branch)
 
     def on_task_card_task_removal_requested(self, message: TaskCard.TaskRemovalRequested) -> None:
         db = DBManager()
@@ -119,7 +152,6 @@ class Dashboard(Screen):
         if not repo_path:
              # Try to get from git handler if not in data (fallback)
              try:
-                 from ...git_handler import GitHandler
                  repo_path = GitHandler().get_repo_root()
              except:
                  pass
@@ -133,104 +165,58 @@ class Dashboard(Screen):
 
     def on_task_card_push_requested(self, message: TaskCard.PushRequested) -> None:
         self.notify(f"Pushing {message.branch}...")
-        self.run_worker(self.perform_push(message.branch))
+        self.perform_push(message.branch)
 
-    async def perform_checkout(self, branch: str) -> None:
-        import sys
-        import subprocess
-        from .log_view import LogScreen
-        
-        # Run checkout command
-        cmd = [sys.executable, "-m", "gittask.main", "checkout", branch]
-        
+    # The actions run the same services as the CLI commands, in-process on a worker thread
+
+    @work(exclusive=True, thread=True, group="checkout")
+    def perform_checkout(self, branch: str) -> None:
+        progress = ServiceProgress(self)
         try:
-            # Run in a thread to avoid blocking the event loop, although subprocess.run blocks the thread.
-            # Textual workers run in threads by default if not async, but here we are async def.
-            # We should use asyncio.create_subprocess_exec or run in executor.
-            # But for simplicity in this context, let's use subprocess.run in a thread via run_worker default behavior 
-            # if we made this non-async, OR use asyncio subprocess.
-            
-            # Let's use asyncio subprocess
-            import asyncio
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            output = stdout.decode() + stderr.decode()
-            
-            if process.returncode == 0:
-                self.notify(f"Checked out {branch}")
-                self.refresh_tasks()
-            else:
-                self.app.push_screen(LogScreen("Checkout Failed", output))
-                
+            checkout_service.checkout_branch(DBManager(), GitHandler(), branch, progress=progress)
         except Exception as e:
-            self.notify(f"Checkout failed: {e}", severity="error")
+            self.app.call_from_thread(self.app.push_screen, LogScreen("Checkout Failed", progress.output(e)))
+            return
+        self.app.call_from_thread(self.notify, f"Checked out {branch}")
+        self.app.call_from_thread(self.refresh_tasks)
 
-    async def perform_push(self, branch: str) -> None:
-        import sys
-        import asyncio
-        from .log_view import LogScreen
-        
-        # Run gt push command
-        cmd = [sys.executable, "-m", "gittask.main", "push"]
-        
+    @work(exclusive=True, thread=True, group="push")
+    def perform_push(self, branch: str) -> None:
+        progress = ServiceProgress(self)
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            output = stdout.decode() + stderr.decode()
-            
-            if process.returncode == 0:
-                self.notify(f"Successfully pushed {branch}")
-            else:
-                self.app.push_screen(LogScreen("Push Failed", output))
-                
+            push_service.push_branch(DBManager(), GitHandler(), ConfigManager(), progress=progress, capture_output=True)
         except Exception as e:
-            self.notify(f"Push failed: {e}", severity="error")
-        
-    async def perform_sync(self) -> None:
-        import sys
-        import subprocess
-        from .log_view import LogScreen
-        import asyncio
-        
-        self.notify("Syncing with Asana...")
-        
-        # Run sync command
-        cmd = [sys.executable, "-m", "gittask.main", "sync"]
-        
+            self.app.call_from_thread(self.app.push_screen, LogScreen("Push Failed", progress.output(e)))
+            return
+        self.app.call_from_thread(self.notify, f"Successfully pushed {branch}")
+
+    @work(exclusive=True, thread=True, group="sync")
+    def perform_sync(self, button: Button) -> None:
+        def show_step(done: int, total: int) -> None:
+            button.label = f"Syncing {done}/{total}"
+
+        self.app.call_from_thread(self.notify, "Syncing with Asana...")
+        progress = ServiceProgress(self, on_step=show_step)
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            output = stdout.decode() + stderr.decode()
-            
-            if process.returncode == 0:
-                self.notify("Sync completed successfully")
-                self.refresh_tasks()
-            else:
-                self.app.push_screen(LogScreen("Sync Failed", output))
-                
+            result = sync_service.sync_time(DBManager(), ConfigManager(), progress=progress)
         except Exception as e:
-            self.notify(f"Sync failed: {e}", severity="error")
+            self.app.call_from_thread(self.app.push_screen, LogScreen("Sync Failed", progress.output(e)))
+            return
+        finally:
+            self.app.call_from_thread(setattr, button, "label", "Sync")
+
+        if result['failed']:
+            self.app.call_from_thread(self.app.push_screen, LogScreen("Sync Failed", progress.output()))
+        else:
+            self.app.call_from_thread(self.notify, "Sync completed successfully")
+        self.app.call_from_thread(self.refresh_tasks)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "new-task-btn":
             self.app.action_navigate("search")
         elif event.button.id == "sync-btn":
-            self.run_worker(self.perform_sync())
+            # Widgets are looked up here, not on the worker thread
+            self.perform_sync(event.button)
         elif event.button.id == "status-btn":
             self.app.action_navigate("status")
         elif event.button.id == "progress-btn":
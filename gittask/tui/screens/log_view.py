@@ -24,3 +24,29 @@ class LogScreen(ModalScreen):
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "close-btn":
             self.dismiss()
+
+class ServiceProgress:
+    """
+    Progress callback for a gittask.services call running on a worker thread.
+    Warnings and errors show up as notifications right away, step counts go
+    to `on_step`, and every message is kept for a LogScreen if the action fails.
+    """
+    SEVERITIES = {'warning': "warning", 'error': "error"}
+
+    def __init__(self, screen, on_step=None):
+        self.screen = screen
+        self.on_step = on_step
+        self.lines = []
+
+    def __call__(self, message, level="info", done=None, total=None):
+        if total is not None:
+            if self.on_step:
+                self.screen.app.call_from_thread(self.on_step, done, total)
+            return
+        self.lines.append(message)
+        if level in self.SEVERITIES:
+            self.screen.app.call_from_thread(self.screen.notify, message, severity=self.SEVERITIES[level])
+
+    def output(self, error: Exception = None) -> str:
+        lines = self.lines + ([str(error)] if error else [])
+        return "\n".join(lines)
@@ -3,8 +3,8 @@ from textual.screen import ModalScreen
 from textual.widgets import Label, Button, Input, ListView, ListItem, Checkbox
 from textual.containers import Container, Vertical, Horizontal
 from textual import work
-from ...config import ConfigManager
-from ...asana_client import AsanaClient
+
+TAG_PAGE_SIZE = 50
 
 class TagSelectionModal(ModalScreen):
     def __init__(self, workspace_gid: str, **kwargs):
@@ -29,23 +29,34 @@ class TagSelectionModal(ModalScreen):
     def on_mount(self) -> None:
         self._fetch_tags()
 
-    @work(exclusive=True, thread=True)
-    def _fetch_tags(self) -> None:
+    @work(exclusive=True, group="fetch-tags")
+    async def _fetch_tags(self) -> None:
         try:
-            config = ConfigManager()
-            token = config.get_api_token()
+            client = self.app.get_asana_client()
+            if client is None:
+                self.notify("Not authenticated", severity="error")
+                return
             
-            with AsanaClient(token) as client:
-                tags = client.get_tags(self.workspace_gid)
-                
-            self.app.call_from_thread(self._update_tag_list, tags)
+            # Render each page as soon as it arrives instead of waiting for the full list
+            page = []
+            first_page = True
+            async for tag in client.iter_tags(self.workspace_gid, page_size=TAG_PAGE_SIZE):
+                page.append(tag)
+                if len(page) == TAG_PAGE_SIZE:
+                    self._update_tag_list(page, first_page)
+                    page = []
+                    first_page = False
+            if page or first_page:
+                self._update_tag_list(page, first_page)
         except Exception as e:
-            self.app.call_from_thread(self.notify, f"Failed to fetch tags: {e}", severity="error")
+            self.notify(f"Failed to fetch tags: {e}", severity="error")
 
-    def _update_tag_list(self, tags: list) -> None:
-        self.all_tags = tags
+    def _update_tag_list(self, tags: list, replace: bool = True) -> None:
         list_view = self.query_one("#tag-list", ListView)
-        list_view.clear()
+        if replace:
+            self.all_tags = []
+            list_view.clear()
+        self.all_tags.extend(tags)
         
         for tag in tags:
             # We use a custom ListItem that tracks selection state visually
@@ -73,18 +84,16 @@ class TagSelectionModal(ModalScreen):
             self._create_tag(tag_name)
             event.input.value = ""
 
-    @work(exclusive=True, thread=True)
-    def _create_tag(self, tag_name: str) -> None:
+    @work(group="create-tag")
+    async def _create_tag(self, tag_name: str) -> None:
         try:
-            config = ConfigManager()
-            token = config.get_api_token()
-            
-            with AsanaClient(token) as client:
-                new_tag = client.create_tag(self.workspace_gid, tag_name)
-                
-            self.app.call_from_thread(self._on_tag_created, new_tag)
+            client = self.app.get_asana_client()
+            new_tag = await client.create_tag(self.workspace_gid, tag_name)
         except Exception as e:
-            self.app.call_from_thread(self.notify, f"Failed to create tag: {e}", severity="error")
+            self.notify(f"Failed to create tag: {e}", severity="error")
+            return
+            
+        self._on_tag_created(new_tag)
 
     def _on_tag_created(self, tag: dict) -> None:
         self.all_tags.append(tag)
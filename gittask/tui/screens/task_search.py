@@ -4,11 +4,15 @@ from textual.screen import Screen
 from textual.widgets import Input, ListView, ListItem, Label, Button, LoadingIndicator
 from textual.containers import Container
 from ...config import ConfigManager
-from ...asana_client import AsanaClient
 from ...database import DBManager
 from ...git_handler import GitHandler
-import subprocess
-import sys
+from ...services import checkout as checkout_service
+from .log_view import LogScreen, ServiceProgress
+import asyncio
+
+# Search as you type once the query is this long, after a short pause in typing
+MIN_QUERY_LENGTH = 2
+SEARCH_DEBOUNCE = 0.3
 
 class TaskSearch(Screen):
     def __init__(self, **kwargs):
@@ -23,35 +27,40 @@ class TaskSearch(Screen):
             Button("Back to Dashboard", variant="default", id="back-btn")
         )
 
+    def on_input_changed(self, event: Input.Changed) -> None:
+        query = event.value.strip()
+        if len(query) >= MIN_QUERY_LENGTH:
+            self.search_tasks(query, delay=SEARCH_DEBOUNCE)
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
-        query = event.value
+        query = event.value.strip()
         if query:
             self.search_tasks(query)
 
-    def search_tasks(self, query: str) -> None:
+    def search_tasks(self, query: str, delay: float = 0.0) -> None:
         config = ConfigManager()
-        token = config.get_api_token()
         workspace_gid = config.get_default_workspace()
+        client = self.app.get_asana_client()
         
-        if not token or not workspace_gid:
+        if not client or not workspace_gid:
             self.notify("Not authenticated or no workspace set", severity="error")
             return
 
-        try:
-            self.query_one("#loading").display = True
-            self.query_one("#results-list").display = False
-            self._search_worker(query, token, workspace_gid)
-        except Exception as e:
-            self.notify(f"Search failed: {e}", severity="error")
+        self.query_one("#loading").display = True
+        self.query_one("#results-list").display = False
+        self._search_worker(client, workspace_gid, query, delay)
 
-    @work(exclusive=True, thread=True)
-    def _search_worker(self, query: str, token: str, workspace_gid: str) -> None:
+    @work(exclusive=True, group="search")
+    async def _search_worker(self, client, workspace_gid: str, query: str, delay: float) -> None:
+        # A newer search cancels this worker, aborting the request in flight
+        if delay:
+            await asyncio.sleep(delay)
         try:
-            with AsanaClient(token) as client:
-                tasks = client.search_tasks(workspace_gid, query)
-            self.app.call_from_thread(self._update_results, tasks, query)
+            tasks = await client.search_tasks(workspace_gid, query)
         except Exception as e:
-            self.app.call_from_thread(self._handle_search_error, e)
+            self._handle_search_error(e)
+            return
+        self._update_results(tasks, query)
 
     def _update_results(self, tasks: list, query: str) -> None:
         self.query_one("#loading").display = False
@@ -95,79 +104,43 @@ class TaskSearch(Screen):
         self.app.push_screen(TaskOptionsModal(task_name, task_gid), self.handle_options)
 
     def create_task(self, task_name: str) -> None:
+        # Pick tags first so the task can be created with them in a single request
+        config = ConfigManager()
+        workspace_gid = config.get_default_workspace()
+        
+        from .tag_selection import TagSelectionModal
+        self.app.push_screen(
+            TagSelectionModal(workspace_gid),
+            lambda tag_gids: self.handle_tags(task_name, tag_gids)
+        )
+
+    def handle_tags(self, task_name: str, tag_gids: list) -> None:
         self.query_one("#loading").display = True
         self.query_one("#results-list").display = False
-        self._create_task_worker(task_name)
+        self._create_task_worker(task_name, tag_gids or [])
 
-    @work(exclusive=True, thread=True)
-    def _create_task_worker(self, task_name: str) -> None:
+    @work(exclusive=True, group="create-task")
+    async def _create_task_worker(self, task_name: str, tag_gids: list) -> None:
         try:
             config = ConfigManager()
-            token = config.get_api_token()
             workspace_gid = config.get_default_workspace()
             project_gid = config.get_default_project()
             
-            with AsanaClient(token) as client:
-                new_task = client.create_task(workspace_gid, project_gid, task_name)
-                
-            self.app.call_from_thread(self._on_task_created, new_task)
-            
+            client = self.app.get_asana_client()
+            new_task = await client.create_task(workspace_gid, project_gid, task_name, tag_gids=tag_gids)
         except Exception as e:
-            self.app.call_from_thread(self._handle_search_error, e)
+            self._handle_search_error(e)
+            return
+            
+        self._on_task_created(new_task)
 
     def _on_task_created(self, task: dict) -> None:
         self.query_one("#loading").display = False
         self.query_one("#results-list").display = True
         
-        # Store task info for later use in handle_tags
-        self.created_task = task
-        
-        # Open Tag Selection
-        config = ConfigManager()
-        workspace_gid = config.get_default_workspace()
-        
-        from .tag_selection import TagSelectionModal
-        self.app.push_screen(TagSelectionModal(workspace_gid), self.handle_tags)
-
-    def handle_tags(self, tag_gids: list) -> None:
-        if tag_gids:
-            self.notify(f"Applying {len(tag_gids)} tags...")
-            self._add_tags_worker(self.created_task['gid'], tag_gids)
-        
         # Proceed to options
-        task_gid = self.created_task['gid']
-        task_name = self.created_task['name']
-        
         from .task_options import TaskOptionsModal
-        self.app.push_screen(TaskOptionsModal(task_name, task_gid), self.handle_options)
-
-    @work(exclusive=False, thread=True)
-    def _add_tags_worker(self, task_gid: str, tag_gids: list) -> None:
-        try:
-            config = ConfigManager()
-            token = config.get_api_token()
-            
-            with AsanaClient(token) as client:
-                for tag_gid in tag_gids:
-                    # Retry logic similar to CLI
-                    max_retries = 5
-                    for attempt in range(max_retries):
-                        try:
-                            client.add_tag_to_task(task_gid, tag_gid)
-                            break
-                        except Exception as e:
-                            if "404" in str(e) and attempt < max_retries - 1:
-                                import time
-                                time.sleep(1 * (attempt + 1))
-                                continue
-                            # If failed after retries or other error, log/notify
-                            self.app.call_from_thread(self.notify, f"Failed to add tag: {e}", severity="error")
-                            break
-                            
-            self.app.call_from_thread(self.notify, "Tags applied successfully")
-            
-        except Exception as e:
-            self.app.call_from_thread(self.notify, f"Error applying tags: {e}", severity="error")
+        self.app.push_screen(TaskOptionsModal(task['name'], task['gid']), self.handle_options)
 
     def handle_options(self, result: dict) -> None:
         if not result:
@@ -208,10 +181,8 @@ class TaskSearch(Screen):
         self.notify(f"Checking out {branch_name}...")
         self._checkout_worker(branch_name, create_new, task_name, task_gid)
 
-    @work(exclusive=True, thread=True)
+    @work(exclusive=True, thread=True, group="checkout")
     def _checkout_worker(self, branch_name: str, create_new: bool, task_name: str = None, task_gid: str = None) -> None:
-        from .log_view import LogScreen
-        
         # Pre-link if we have task info
         if task_name and task_gid:
             try:
@@ -232,23 +203,15 @@ class TaskSearch(Screen):
             except Exception as e:
                 self.app.call_from_thread(self.notify, f"Failed to pre-link task: {e}", severity="warning")
 
-        cmd = [sys.executable, "-m", "gittask.main", "checkout", branch_name]
-        if create_new:
-            cmd.append("-b")
-            
+        progress = ServiceProgress(self)
         try:
-            # Use subprocess.run for sync execution in thread
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            output = result.stdout + result.stderr
-            
-            if result.returncode == 0:
-                self.app.call_from_thread(self.notify, f"Checked out {branch_name}")
-                self.app.call_later(self.app.action_navigate, "dashboard")
-            else:
-                self.app.call_from_thread(self.app.push_screen, LogScreen("Checkout Failed", output))
-                
+            checkout_service.checkout_branch(DBManager(), GitHandler(), branch_name, create_new, progress=progress)
         except Exception as e:
-            self.app.call_from_thread(self.notify, f"Checkout failed: {e}", severity="error")
+            self.app.call_from_thread(self.app.push_screen, LogScreen("Checkout Failed", progress.output(e)))
+            return
+
+        self.app.call_from_thread(self.notify, f"Checked out {branch_name}")
+        self.app.call_from_thread(self.app.action_navigate, "dashboard")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "back-btn":
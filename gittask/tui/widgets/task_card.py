@@ -1,7 +1,6 @@
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal
 from textual.widgets import Static, Button, Label
-from textual.reactive import reactive
 from textual.message import Message
 from ...database import DBManager
 import time
@@ -9,26 +8,17 @@ import time
 class TaskCard(Static):
     """A card widget representing a task."""
     
-    is_active = reactive(False)
-    duration = reactive(0.0)
-
-    def __init__(self, task_data: dict, current_branch: str = None, **kwargs):
+    def __init__(self, task_data: dict, current_branch: str = None, active_session: dict = None, **kwargs):
         super().__init__(**kwargs)
         self.task_data = task_data
         self.branch_name = task_data.get('branch')
         self.task_name = task_data.get('asana_task_name', 'Unknown Task')
         self.task_gid = task_data.get('asana_task_gid')
         self.current_branch = current_branch
-        
-        # Check if active
-        db = DBManager()
-        active_session = db.get_active_session()
-        if active_session and active_session['branch'] == self.branch_name:
-            self.is_active = True
-            self.start_time = active_session['start_time']
-        else:
-            self.is_active = False
-            self.start_time = None
+        self.start_time = None
+        self.is_active = False
+        self.duration = 0.0
+        self.update_state(task_data, current_branch, active_session)
 
     def compose(self) -> ComposeResult:
         yield Button("🗑️", id="trash-btn", classes="trash-btn")
@@ -36,23 +26,55 @@ class TaskCard(Static):
         yield Label(self.branch_name, classes="branch-name")
         yield Label("00:00:00", classes="timer", id=f"timer-{self.id}")
         
+        # Both buttons of each pair are composed, update_state only toggles which one shows
         with Horizontal(classes="card-actions"):
-            if self.is_active:
-                yield Button("Stop", variant="error", id="stop-btn")
-            else:
-                yield Button("Start", variant="success", id="start-btn")
+            yield Button("Stop", variant="error", id="stop-btn")
+            yield Button("Start", variant="success", id="start-btn")
             
             if self.branch_name and not self.branch_name.startswith("@global:"):
                 # Only show checkout if not already on this branch
-                if self.branch_name != self.current_branch:
-                    yield Button("Checkout", variant="primary", id="checkout-btn")
-                else:
-                    yield Button("Push", variant="default", id="push-btn")
+                yield Button("Checkout", variant="primary", id="checkout-btn")
+                yield Button("Push", variant="default", id="push-btn")
 
     def on_mount(self) -> None:
         self.set_interval(1, self.update_timer)
-        if self.is_active:
-            self.add_class("active")
+        self._show_state()
+
+    def update_state(self, task_data: dict, current_branch: str = None, active_session: dict = None) -> bool:
+        """
+        Apply a dashboard refresh to this card. Widgets are only touched if
+        something changed; returns True if anything did.
+        """
+        is_active = bool(active_session) and active_session['branch'] == self.branch_name
+        start_time = active_session['start_time'] if is_active else None
+        task_name = task_data.get('asana_task_name', 'Unknown Task')
+        changed = (is_active, start_time, current_branch, task_name) != (
+            self.is_active, self.start_time, self.current_branch, self.task_name)
+
+        self.task_data = task_data
+        self.task_gid = task_data.get('asana_task_gid')
+        if not changed:
+            return False
+        self.is_active = is_active
+        self.start_time = start_time
+        self.current_branch = current_branch
+        self.task_name = task_name
+        if self.is_mounted:
+            self._show_state()
+        return True
+
+    def _show_state(self) -> None:
+        self.set_class(self.is_active, "active")
+        self.query_one(".task-name", Label).update(self.task_name)
+        self.query_one("#stop-btn").display = self.is_active
+        self.query_one("#start-btn").display = not self.is_active
+        on_branch = self.branch_name == self.current_branch
+        for button in self.query("#checkout-btn"):
+            button.display = not on_branch
+        for button in self.query("#push-btn"):
+            button.display = on_branch
+        if not self.is_active:
+            self.query_one(f"#timer-{self.id}", Label).update("00:00:00")
 
     def update_timer(self) -> None:
         if self.is_active and self.start_time:
@@ -91,34 +113,21 @@ class TaskCard(Static):
                         repo_path = os.getcwd()
 
             db.start_session(self.branch_name, repo_path, self.task_gid)
-            self.is_active = True
-            self.start_time = time.time()
-            self.add_class("active")
-            
-            # Re-compose to show Stop button? Or just update button
-            # Textual doesn't easily support replacing widgets in-place without removing/adding
-            # But we can swap the button display if we had both and hid one, or just remove and mount new one.
-            # Simpler: Post a message to Dashboard to refresh everything
+            self.update_state(self.task_data, self.current_branch, db.get_active_session())
+            # The dashboard updates the card that was active before
             self.post_message(self.StatusChanged())
             
         elif button_id == "stop-btn":
             db.stop_any_active_session()
-            self.is_active = False
-            self.remove_class("active")
+            self.update_state(self.task_data, self.current_branch, None)
             self.post_message(self.StatusChanged())
             
         elif button_id == "checkout-btn":
-            # Trigger checkout
-            # This requires git command execution. 
-            # For TUI, maybe we just notify for now or use gitpython if available in DB/helpers
-            # The user asked for "checkout button if it is a branch linked task"
-            # We can use os.system or subprocess, or better, the Checkout command logic.
-            # But importing commands might be circular or heavy.
-            # Let's post a message to App/Dashboard to handle checkout
+            # The dashboard runs the checkout service on a worker thread
             self.post_message(self.CheckoutRequested(self.branch_name))
 
         elif button_id == "push-btn":
-            # Use gt push CLI command to include Asana commenting
+            # Pushed by the push service, which also comments on the Asana task
             self.post_message(self.PushRequested(self.branch_name))
 
         elif button_id == "trash-btn":
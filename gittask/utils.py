@@ -1,21 +1,26 @@
 import questionary
-from rich.console import Console
-from typing import List, Dict
+import time
+from .output import console
+from typing import List, Dict, Optional
+from prompt_toolkit.completion import Completer, Completion
 
-console = Console()
+# Cached workspace/project listings are refreshed from Asana once they are this old
+LISTING_MAX_AGE = 24 * 3600
+# Short lists are shown as a menu, longer ones get a fuzzy search prompt
+SELECT_MENU_LIMIT = 15
+FUZZY_MATCH_THRESHOLD = 80
 
 def get_git_root() -> str:
     """
     Find the root directory of the git repository.
     Returns the absolute path to the git root.
     """
-    import git
-    try:
-        repo = git.Repo(search_parent_directories=True)
-        return repo.working_tree_dir
-    except git.InvalidGitRepositoryError:
+    from .git_handler import RepoProbe
+    probe = RepoProbe.find()
+    if probe is None:
         # Fallback to current directory if not in a git repo (though this app relies on git)
         return "."
+    return probe.working_dir
 
 def select_and_create_tags(client, workspace_gid: str, db) -> List[str]:
     """
@@ -97,3 +102,132 @@ def select_and_create_tags(client, workspace_gid: str, db) -> List[str]:
                 console.print(f"[red]Failed to create tag '{tag_input}': {e}[/red]")
         
     return selected_tag_gids
+
+def _load_listing(db, kind: str, workspace_gid: Optional[str], fetch, refresh: bool) -> List[Dict]:
+    """
+    Serve a workspace/project listing from the local cache, refreshing it from
+    Asana when it is missing, older than LISTING_MAX_AGE or `refresh` is set.
+    """
+    if kind == 'workspaces':
+        cached = db.get_cached_workspaces()
+    else:
+        cached = db.get_cached_projects(workspace_gid)
+    refreshed_at = db.get_listing_refreshed_at(kind, workspace_gid)
+
+    if cached and not refresh and refreshed_at and time.time() - refreshed_at < LISTING_MAX_AGE:
+        return cached
+
+    console.print(f"Refreshing {kind} from Asana...")
+    try:
+        items = fetch()
+    except Exception as e:
+        if not cached:
+            raise
+        console.print(f"[red]Failed to refresh {kind}: {e}. Using cached list.[/red]")
+        return cached
+
+    if kind == 'workspaces':
+        db.cache_workspaces(items)
+        return db.get_cached_workspaces()
+    db.cache_projects(workspace_gid, items)
+    return db.get_cached_projects(workspace_gid)
+
+def load_workspaces(client, db, refresh: bool = False) -> List[Dict]:
+    """
+    Workspaces from the local cache, refreshed from Asana when stale.
+    """
+    return _load_listing(db, 'workspaces', None, client.get_workspaces, refresh)
+
+def load_projects(client, db, workspace_gid: str, refresh: bool = False) -> List[Dict]:
+    """
+    Projects of a workspace from the local cache, refreshed from Asana when stale.
+    """
+    return _load_listing(db, 'projects', workspace_gid, lambda: client.get_projects(workspace_gid), refresh)
+
+class FuzzyCompleter(Completer):
+    """
+    Complete names by fuzzy match, best matches first.
+    """
+    def __init__(self, names: List[str], limit: int = 20):
+        self.names = names
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        from thefuzz import process
+
+        text = document.text_before_cursor
+        if not text:
+            matches = self.names[:self.limit]
+        else:
+            matches = [name for name, _ in process.extract(text, self.names, limit=self.limit)]
+        for name in matches:
+            yield Completion(name, start_position=-len(text))
+
+def fuzzy_pick(items: List[Dict], text: str) -> Optional[Dict]:
+    """
+    Resolve typed text to an item: exact name first, then the best fuzzy match.
+    """
+    if not text:
+        return None
+    exact = next((i for i in items if i['name'].lower() == text.lower()), None)
+    if exact:
+        return exact
+
+    from thefuzz import process
+    match = process.extractOne(text, [i['name'] for i in items], score_cutoff=FUZZY_MATCH_THRESHOLD)
+    if not match:
+        return None
+    return next(i for i in items if i['name'] == match[0])
+
+def select_from_listing(message: str, items: List[Dict], none_label: Optional[str] = None) -> Optional[str]:
+    """
+    Let the user pick an item and return its gid. Short lists use a menu,
+    long ones a fuzzy search prompt. With `none_label`, picking nothing is allowed.
+    """
+    if len(items) <= SELECT_MENU_LIMIT:
+        choices = [questionary.Choice(i['name'], value=i['gid']) for i in items]
+        if none_label:
+            # questionary uses the title as value when value is None
+            choices.insert(0, questionary.Choice(none_label, value=""))
+        return questionary.select(message, choices=choices).ask() or None
+
+    names = [i['name'] for i in items]
+    hint = f" (type to search, leave empty for {none_label})" if none_label else " (type to search)"
+    while True:
+        text = questionary.autocomplete(
+            message + hint,
+            choices=names,
+            completer=FuzzyCompleter(names),
+        ).ask()
+        if text is None:
+            return None
+        if not text.strip():
+            if none_label:
+                return None
+            continue
+        item = fuzzy_pick(items, text.strip())
+        if item:
+            return item['gid']
+        console.print(f"[yellow]No match for '{text}'.[/yellow]")
+
+def select_project(client, db, workspace_gid: str, message: str, none_label: Optional[str] = None, refresh: bool = False) -> Optional[str]:
+    """
+    Pick a project of the workspace from the cached project list.
+    """
+    projects = sorted(load_projects(client, db, workspace_gid, refresh=refresh), key=lambda p: p['name'].lower())
+    if not projects:
+        return None
+    return select_from_listing(message, projects, none_label=none_label)
+
+def resolve_task_project(client, db, config, workspace_gid: str) -> Optional[str]:
+    """
+    The default project, or, if none is set, a project the user picks for this task.
+    """
+    project_gid = config.get_default_project()
+    if project_gid:
+        return project_gid
+    try:
+        return select_project(client, db, workspace_gid, "Select a project for this task:", none_label="No project")
+    except Exception as e:
+        console.print(f"[red]Failed to load projects: {e}[/red]")
+        return None
@@ -4,7 +4,64 @@ import os
 import tempfile
 from pathlib import Path
 from gittask.database import DBManager
-from gittask.config import ConfigManager
+from gittask.config import ConfigManager, SECRET_CACHE
+from gittask import metrics
+from gittask.fake_asana import FakeAsana
+from gittask.request_cache import RESPONSE_CACHE
+
+@pytest.fixture(autouse=True)
+def mock_background_delivery(mocker):
+    """
+    Never spawn a detached outbox flush from tests.
+    """
+    # Patch outbox's reference only, tests may run real subprocesses (e.g. git)
+    return mocker.patch("gittask.outbox.subprocess").Popen
+
+@pytest.fixture(autouse=True)
+def daemon_socket(tmp_path, monkeypatch):
+    """
+    Never talk to a gittask daemon the developer may have running.
+    """
+    path = tmp_path / "daemon.sock"
+    monkeypatch.setenv("GITTASK_DAEMON_SOCKET", str(path))
+    return path
+
+@pytest.fixture(autouse=True)
+def metrics_file(tmp_path, monkeypatch):
+    """
+    Keep API metrics recorded during tests out of ~/.gittask.
+    """
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setenv("GITTASK_METRICS_FILE", str(path))
+    # Drop calls buffered by earlier tests
+    metrics.clear()
+    return path
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """
+    Don't let cached Asana reads leak between tests.
+    """
+    RESPONSE_CACHE.invalidate()
+    yield
+    RESPONSE_CACHE.invalidate()
+
+@pytest.fixture(autouse=True)
+def clear_secret_cache():
+    """
+    Tests patch keyring with different tokens: never reuse one read by an earlier test.
+    """
+    SECRET_CACHE.invalidate()
+    yield
+    SECRET_CACHE.invalidate()
+
+@pytest.fixture
+def fake():
+    """
+    Fixture for a local fake Asana API server.
+    """
+    with FakeAsana() as server:
+        yield server
 
 @pytest.fixture
 def mock_db(tmp_path):
@@ -1,11 +1,13 @@
 import pytest
 from unittest.mock import MagicMock, call
 import datetime
-from gittask.asana_client import AsanaClient
+from gittask.asana_client import AsanaClient, LazyPoolApiClient
 
 @pytest.fixture
 def mock_asana_lib(mocker):
-    return mocker.patch("gittask.asana_client.asana")
+    mock_lib = mocker.patch("gittask.asana_client.asana")
+    mocker.patch("gittask.asana_client.LazyPoolApiClient", mock_lib.ApiClient)
+    return mock_lib
 
 @pytest.fixture
 def client(mock_asana_lib):
@@ -33,17 +35,15 @@ def test_context_manager(mock_asana_lib):
     mock_asana_lib.UsersApi.return_value = mock_users_api
     mock_users_api.get_user.return_value = {'gid': 'user123'}
     
-    # Mock pool on api_client
     mock_api_client = MagicMock()
     mock_asana_lib.ApiClient.return_value = mock_api_client
-    mock_pool = MagicMock()
-    mock_api_client.pool = mock_pool
     
     with AsanaClient("token") as client:
         assert client.me['gid'] == 'user123'
         
-    mock_pool.close.assert_called_once()
-    mock_pool.join.assert_called_once()
+    mock_api_client.rest_client.pool_manager.clear.assert_called_once()
+    # No worker pool to wait for on exit
+    mock_api_client.pool.join.assert_not_called()
 
 def test_get_user_gid(client):
     assert client.get_user_gid() == 'user123'
@@ -95,6 +95,31 @@ def test_create_task(client, mock_asana_lib):
     }
     mock_tasks.create_task.assert_called_with(expected_body_no_proj, opts={})
 
+def test_create_task_with_tags_followers_and_notes(client, mock_asana_lib):
+    mock_tasks = MagicMock()
+    client.tasks_api = mock_tasks
+    
+    client.create_task(
+        'ws1', 'p1', 'Tagged Task',
+        tag_gids=['tag1', 'tag2'],
+        follower_gids=['user456'],
+        notes='Initial description'
+    )
+    
+    expected_body = {
+        "data": {
+            "workspace": "ws1",
+            "name": "Tagged Task",
+            "assignee": "user123",
+            "projects": ["p1"],
+            "tags": ["tag1", "tag2"],
+            "followers": ["user456"],
+            "notes": "Initial description"
+        }
+    }
+    mock_tasks.create_task.assert_called_once_with(expected_body, opts={})
+    mock_tasks.add_tag_for_task.assert_not_called()
+
 def test_log_time_comment(client, mock_asana_lib):
     mock_stories = MagicMock()
     mock_asana_lib.StoriesApi.return_value = mock_stories
@@ -134,6 +159,26 @@ def test_post_comment(client, mock_asana_lib):
     assert "<body>Hello" in text
     assert "gittask cli tool" in text
 
+def test_post_comment_with_idempotency_key(client, mock_asana_lib):
+    client.stories_api = MagicMock()
+    
+    client.post_comment('t1', 'Hello', idempotency_key='abc123')
+    
+    args, kwargs = client.stories_api.create_story_for_task.call_args
+    assert "?ref=abc123" in args[0]['data']['html_text']
+
+def test_has_comment_with_key(client, mock_asana_lib):
+    client.stories_api = MagicMock()
+    client.stories_api.get_stories_for_task.return_value = [
+        {'html_text': "<body>Other</body>"},
+        {'html_text': "<body>Hi <a href='https://github.com/AndreasLF/gittask?ref=abc123'>x</a></body>"},
+    ]
+    
+    assert client.has_comment_with_key('t1', 'abc123') is True
+    
+    client.stories_api.get_stories_for_task.return_value = [{'html_text': None}]
+    assert client.has_comment_with_key('t1', 'abc123') is False
+
 def test_complete_task(client, mock_asana_lib):
     mock_tasks = MagicMock()
     mock_asana_lib.TasksApi.return_value = mock_tasks
@@ -214,6 +259,7 @@ def test_get_project_tasks(client, mock_asana_lib):
     opts = kwargs['opts']
     assert opts['project'] == 'p1'
     assert opts['completed_since'] == 'now'
+    assert 'assignee.gid' in opts['opt_fields'].split(',')
 
 def test_assign_task(client, mock_asana_lib):
     mock_tasks = MagicMock()
@@ -286,3 +332,123 @@ def test_add_time_entry_rounding(client, mock_asana_lib):
     
     args, kwargs = mock_time.create_time_tracking_entry.call_args
     assert args[0]['data']['duration_minutes'] == 1
+
+def test_iter_tags_page_size_and_limit(client, mock_asana_lib):
+    mock_tags = MagicMock()
+    client.tags_api = mock_tags
+    
+    mock_tags.get_tags_for_workspace.return_value = iter([{'gid': 'tag1'}, {'gid': 'tag2'}])
+    
+    result = client.iter_tags('ws1', page_size=25, limit=2)
+    
+    assert list(result) == [{'gid': 'tag1'}, {'gid': 'tag2'}]
+    mock_tags.get_tags_for_workspace.assert_called_with(
+        'ws1', opts={'opt_fields': 'name,gid', 'limit': 25}, item_limit=2
+    )
+
+def test_iter_project_tasks_is_lazy(client, mock_asana_lib):
+    mock_tasks = MagicMock()
+    client.tasks_api = mock_tasks
+    
+    fetched = []
+    def pages():
+        for gid in ['t1', 't2', 't3']:
+            fetched.append(gid)
+            yield {'gid': gid}
+    mock_tasks.get_tasks.return_value = pages()
+    
+    tasks = client.iter_project_tasks('p1', page_size=1)
+    
+    # Early termination: only the consumed items are fetched
+    assert next(tasks) == {'gid': 't1'}
+    assert fetched == ['t1']
+    
+    args, kwargs = mock_tasks.get_tasks.call_args
+    assert kwargs['opts']['limit'] == 1
+    assert kwargs['opts']['project'] == 'p1'
+    assert 'item_limit' not in kwargs
+
+def test_iter_projects_and_workspaces(client, mock_asana_lib):
+    client.projects_api = MagicMock()
+    client.workspaces_api = MagicMock()
+    client.custom_fields_api = MagicMock()
+    
+    client.iter_projects('ws1', page_size=100)
+    client.projects_api.get_projects_for_workspace.assert_called_with('ws1', opts={'limit': 100})
+    
+    client.iter_workspaces(limit=5)
+    client.workspaces_api.get_workspaces.assert_called_with(opts={}, item_limit=5)
+    
+    client.iter_custom_fields('ws1', page_size=10, limit=10)
+    client.custom_fields_api.get_custom_fields_for_workspace.assert_called_with(
+        'ws1', opts={'opt_fields': 'name,gid,type,enum_options', 'limit': 10}, item_limit=10
+    )
+
+def test_iter_invalid_page_size(client):
+    with pytest.raises(ValueError):
+        client.iter_tags('ws1', page_size=0)
+    with pytest.raises(ValueError):
+        client.iter_tags('ws1', page_size=101)
+
+def test_get_time_entries(client, mock_asana_lib):
+    mock_time = MagicMock()
+    client.time_tracking_api = mock_time
+    
+    mock_time.get_time_tracking_entries_for_task.return_value = iter([{'gid': 'e1', 'duration_minutes': 5}])
+    
+    assert client.get_time_entries('t1') == [{'gid': 'e1', 'duration_minutes': 5}]
+    args, kwargs = mock_time.get_time_tracking_entries_for_task.call_args
+    assert args[0] == 't1'
+    assert 'created_by.gid' in kwargs['opts']['opt_fields']
+
+def test_reads_are_cached_across_clients(mock_asana_lib):
+    """
+    Test identical reads are served from the shared cache and writes invalidate it.
+    """
+    mock_users_api = MagicMock()
+    mock_asana_lib.UsersApi.return_value = mock_users_api
+    mock_users_api.get_user.return_value = {'gid': 'user123'}
+    mock_tags_api = MagicMock()
+    mock_asana_lib.TagsApi.return_value = mock_tags_api
+    mock_tags_api.get_tags_for_workspace.side_effect = lambda *args, **kwargs: iter([{'gid': 'tag1', 'name': 'Tag 1'}])
+    
+    with AsanaClient("token") as first:
+        assert first.get_tags('ws1') == [{'gid': 'tag1', 'name': 'Tag 1'}]
+    with AsanaClient("token") as second:
+        assert second.get_tags('ws1') == [{'gid': 'tag1', 'name': 'Tag 1'}]
+        
+        assert mock_users_api.get_user.call_count == 1
+        assert mock_tags_api.get_tags_for_workspace.call_count == 1
+        
+        second.create_tag('ws1', 'Tag 2')
+        second.get_tags('ws1')
+        assert mock_tags_api.get_tags_for_workspace.call_count == 2
+    
+    # Another token never sees these results
+    with AsanaClient("other_token") as other:
+        other.get_tags('ws1')
+    assert mock_tags_api.get_tags_for_workspace.call_count == 3
+
+def test_no_worker_pool_until_needed(fake, mocker):
+    thread_pool = mocker.patch("multiprocessing.pool.ThreadPool")
+    sdk_thread_pool = mocker.patch("asana.api_client.ThreadPool")
+    mocker.patch("gittask.asana_client._shared_pool", None)
+
+    with AsanaClient("token", host=fake.url) as client:
+        assert client.get_user_gid() == fake.me['gid']
+    thread_pool.assert_not_called()
+    sdk_thread_pool.assert_not_called()
+
+    # The SDK's ThreadPool is back in place for plain ApiClients
+    import asana
+    assert asana.api_client.ThreadPool is sdk_thread_pool
+
+    # Everything else is set up by the SDK's own __init__, as it is now
+    mocker.patch("asana.api_client.urlencode", return_value="patched")
+    assert LazyPoolApiClient().default_headers['X-Asana-Client-Lib'] == "patched"
+    assert client.api_client.user_agent == asana.ApiClient().user_agent
+
+    # async_req calls get one pool, shared by all clients
+    other = LazyPoolApiClient()
+    assert client.api_client.pool is other.pool
+    thread_pool.assert_called_once()
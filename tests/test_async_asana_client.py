@@ -0,0 +1,131 @@
+import pytest
+import asyncio
+import datetime
+from gittask.async_asana_client import AsyncAsanaClient, AsanaAPIError
+from gittask import metrics
+
+@pytest.fixture
+async def client(fake):
+    async with AsyncAsanaClient("token", host=fake.url) as c:
+        yield c
+
+async def test_search_tasks(fake, client):
+    fake.add_task("Fix login bug")
+    fake.add_task("Write docs")
+
+    tasks = await client.search_tasks(fake.workspace['gid'], "login")
+
+    assert [t['name'] for t in tasks] == ["Fix login bug"]
+
+async def test_pagination(fake, client):
+    for i in range(25):
+        fake.add_tag(fake.workspace['gid'], f"tag-{i}")
+
+    tags = [t async for t in client.iter_tags(fake.workspace['gid'], page_size=10)]
+    assert len(tags) == 25
+    assert fake.request_count("GET", r"/tags$") == 3
+
+    fake.requests.clear()
+    tags = [t async for t in client.iter_tags(fake.workspace['gid'], page_size=10, limit=5)]
+    assert len(tags) == 5
+    # The full listing above is cached
+    assert fake.request_count("GET", r"/tags$") == 0
+
+    client.cache.invalidate()
+    tags = [t async for t in client.iter_tags(fake.workspace['gid'], page_size=10, limit=5)]
+    assert len(tags) == 5
+    assert fake.request_count("GET", r"/tags$") == 1
+
+async def test_page_size_validation(client):
+    with pytest.raises(ValueError):
+        [t async for t in client.iter_tags("w1", page_size=101)]
+
+async def test_create_task_with_tags(fake, client):
+    tag = await client.create_tag(fake.workspace['gid'], "bug")
+
+    task = await client.create_task(fake.workspace['gid'], fake.project['gid'], "New", tag_gids=[tag['gid']])
+
+    stored = fake.tasks[task['gid']]
+    assert stored['assignee'] == {'gid': fake.me['gid']}
+    assert [t['gid'] for t in stored['tags']] == [tag['gid']]
+
+async def test_writes_match_sync_client(fake, client):
+    task = fake.add_task("Task")
+
+    await client.log_time_comment(task['gid'], 3900, "feature/x", idempotency_key="k1")
+    entry = await client.add_time_entry(task['gid'], 30, entered_on=datetime.date(2024, 1, 2))
+    await client.assign_task(task['gid'], fake.me['gid'])
+    await client.complete_task(task['gid'])
+
+    assert await client.has_comment_with_key(task['gid'], "k1")
+    assert "Worked 1h 5m on branch <code>feature/x</code>" in fake.stories[task['gid']][0]['html_text']
+    assert entry['duration_minutes'] == 1
+    assert await client.get_time_entries(task['gid']) == [entry]
+    assert fake.tasks[task['gid']]['completed'] is True
+
+async def test_concurrent_requests(fake, client):
+    """
+    Test requests overlap on the event loop instead of running one after another.
+    """
+    fake.latency = 0.2
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(*(client.get_workspaces() for _ in range(5)))
+    assert asyncio.get_running_loop().time() - start < 0.8
+
+async def test_rate_limit_retried(fake, client, metrics_file):
+    task = fake.add_task("Task")
+    fake.inject_rate_limit(times=1, retry_after=0, method="POST", path=r"/stories$")
+
+    await client.post_comment(task['gid'], "Hello")
+
+    assert fake.request_count("POST", r"/stories$") == 2
+    assert len(fake.stories[task['gid']]) == 1
+    statuses = [r['status'] for r in metrics.load_records() if r['endpoint'] == "POST /tasks/{gid}/stories"]
+    assert statuses == [429, 201]
+
+async def test_error_raises_with_status(fake, client):
+    fake.inject_error(400, method="POST", path=r"/time_tracking_entries$")
+    task = fake.add_task("Task")
+
+    with pytest.raises(AsanaAPIError) as exc:
+        await client.add_time_entry(task['gid'], 600)
+    assert exc.value.status == 400
+
+async def test_cancel_in_flight_search(fake, client):
+    fake.latency = 1.0
+    search = asyncio.create_task(client.search_tasks(fake.workspace['gid'], "slow"))
+    await asyncio.sleep(0.1)
+    search.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await search
+
+    # The client stays usable after a cancelled request
+    fake.latency = 0
+    assert await client.get_user_gid() == fake.me['gid']
+
+async def test_concurrent_identical_reads_share_one_request(fake, client):
+    fake.add_task("Fix login bug")
+    fake.latency = 0.1
+
+    results = await asyncio.gather(*(client.search_tasks(fake.workspace['gid'], "login") for _ in range(5)))
+
+    assert all(r == results[0] for r in results)
+    assert fake.request_count("GET", "typeahead") == 1
+
+    # Repeating the search is served from the cache
+    await client.search_tasks(fake.workspace['gid'], "login")
+    assert fake.request_count("GET", "typeahead") == 1
+
+async def test_reopened_tag_list_is_cached_until_a_write(fake, client):
+    fake.add_tag(fake.workspace['gid'], "bug")
+
+    first = [t async for t in client.iter_tags(fake.workspace['gid'])]
+    second = [t async for t in client.iter_tags(fake.workspace['gid'])]
+    assert first == second
+    assert fake.request_count("GET", r"/tags$") == 1
+
+    await client.create_tag(fake.workspace['gid'], "feature")
+    tags = await client.get_tags(fake.workspace['gid'])
+    assert [t['name'] for t in tags] == ["bug", "feature"]
+    assert fake.request_count("GET", r"/tags$") == 2
@@ -47,6 +47,30 @@ def test_checkout_new_branch_create_task(mock_db, mock_asana, mock_config, mock_
     assert len(sessions) == 1
     assert sessions[0]['branch'] == "feature-branch"
 
+def test_checkout_new_task_with_tags_single_request(mock_db, mock_asana, mock_config, mock_git, mocker):
+    """
+    Test that tags are set in the create request instead of one call per tag.
+    """
+    mocker.patch("gittask.commands.checkout.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.checkout.GitHandler", return_value=mock_git)
+    
+    client = mock_asana.__enter__.return_value
+    client.get_project_tasks.return_value = []
+    client.create_task.return_value = {'gid': 'new_task_gid', 'name': 'feature-branch'}
+    
+    mock_questionary = mocker.patch("gittask.commands.checkout.questionary")
+    mock_questionary.text.return_value.ask.return_value = "feature-branch"
+    mock_questionary.confirm.return_value.ask.return_value = True
+    mocker.patch("gittask.commands.checkout.select_and_create_tags", return_value=["tag1", "tag2"])
+    
+    result = runner.invoke(app, ["checkout", "-b", "feature-branch"])
+    
+    assert result.exit_code == 0
+    client.create_task.assert_called_once_with(
+        "mock_workspace_gid", "mock_project_gid", "feature-branch", tag_gids=["tag1", "tag2"]
+    )
+    client.add_tag_to_task.assert_not_called()
+
 def test_checkout_existing_branch_already_linked(mock_db, mock_asana, mock_config, mock_git, mocker):
     """
     Test checking out an existing branch that is already linked.
@@ -115,3 +139,79 @@ def test_checkout_stops_current_session(mock_db, mock_asana, mock_config, mock_g
     new_session = mock_db.time_sessions.get(doc_id=2)
     assert new_session['branch'] == "target-branch"
     assert new_session['end_time'] is None
+
+def test_checkout_picks_project_when_no_default(mock_db, mock_asana, mock_config, mock_git, mocker):
+    """
+    Test a project is picked from the cached project list when no default project is set.
+    """
+    mocker.patch("gittask.commands.checkout.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.checkout.GitHandler", return_value=mock_git)
+    mock_config.get_default_project.return_value = None
+    mock_db.cache_projects("mock_workspace_gid", [{'gid': 'p2', 'name': 'Backend'}])
+    
+    client = mock_asana.__enter__.return_value
+    client.get_project_tasks.return_value = [{'gid': 'task1', 'name': 'Existing Task'}]
+    
+    mock_picker = mocker.patch("gittask.utils.questionary")
+    mock_picker.select.return_value.ask.return_value = 'p2'
+    mock_questionary = mocker.patch("gittask.commands.checkout.questionary")
+    mock_questionary.text.return_value.ask.return_value = "Existing Task"
+    mock_questionary.confirm.return_value.ask.return_value = False
+    
+    result = runner.invoke(app, ["checkout", "-b", "feature-branch"])
+    
+    assert result.exit_code == 0
+    client.get_projects.assert_not_called()
+    client.get_project_tasks.assert_called_once_with('p2')
+    assert mock_db.get_task_for_branch("feature-branch", "/tmp/mock_repo")['project_gid'] == 'p2'
+
+def test_checkout_existing_task_skips_redundant_writes(mock_db, mock_asana, mock_config, mock_git, mocker, mock_background_delivery):
+    """
+    Test no assign or tag writes are queued when the task already has them.
+    """
+    mocker.patch("gittask.commands.checkout.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.checkout.GitHandler", return_value=mock_git)
+    
+    client = mock_asana.__enter__.return_value
+    client.get_user_gid.return_value = 'me'
+    client.get_project_tasks.return_value = [{
+        'gid': 'task1',
+        'name': 'Existing Task',
+        'completed': False,
+        'assignee': {'gid': 'me'},
+        'tags': [{'gid': 'tag1', 'name': 'bug'}],
+        'permalink_url': 'https://app.asana.com/0/0/task1',
+    }]
+    
+    mock_questionary = mocker.patch("gittask.commands.checkout.questionary")
+    mock_questionary.text.return_value.ask.return_value = "Existing Task"
+    mock_questionary.confirm.return_value.ask.return_value = True
+    mocker.patch("gittask.commands.checkout.select_and_create_tags", return_value=['tag1', 'tag2'])
+    
+    result = runner.invoke(app, ["checkout", "-b", "feature-branch"])
+    
+    assert result.exit_code == 0
+    assert "already assigned to you" in result.stdout
+    entries = mock_db.get_outbox_entries()
+    assert [(e['op'], e['args']) for e in entries] == [('add_tag_to_task', {'tag_gid': 'tag2'})]
+    assert mock_db.get_cached_task('task1')['tag_gids'] == ['tag1', 'tag2']
+    mock_background_delivery.assert_called_once()
+
+def test_checkout_existing_task_assigns_when_unassigned(mock_db, mock_asana, mock_config, mock_git, mocker, mock_background_delivery):
+    mocker.patch("gittask.commands.checkout.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.checkout.GitHandler", return_value=mock_git)
+    
+    client = mock_asana.__enter__.return_value
+    client.get_user_gid.return_value = 'me'
+    client.get_project_tasks.return_value = [{'gid': 'task1', 'name': 'Existing Task', 'assignee': None}]
+    
+    mock_questionary = mocker.patch("gittask.commands.checkout.questionary")
+    mock_questionary.text.return_value.ask.return_value = "Existing Task"
+    mock_questionary.confirm.return_value.ask.return_value = False
+    
+    result = runner.invoke(app, ["checkout", "-b", "feature-branch"])
+    
+    assert result.exit_code == 0
+    entries = mock_db.get_outbox_entries()
+    assert [(e['op'], e['args']) for e in entries] == [('assign_task', {'assignee_gid': 'me'})]
+    assert mock_db.get_cached_task('task1')['assignee_gid'] == 'me'
@@ -0,0 +1,53 @@
+import pytest
+from gittask import config as config_module
+from gittask import daemon
+from gittask.config import ConfigManager, SECRET_CACHE
+
+@pytest.fixture
+def keyring(mocker, mock_db):
+    mocker.patch("gittask.config.DBManager", return_value=mock_db)
+    keyring = mocker.patch("gittask.config.keyring")
+    keyring.get_password.side_effect = lambda service, name: f"{name}-secret"
+    return keyring
+
+def test_tokens_read_from_keyring_once(keyring):
+    assert ConfigManager().get_api_token() == "api_token-secret"
+    # Another manager in the same process, e.g. the next TUI worker
+    assert ConfigManager().get_api_token() == "api_token-secret"
+    assert ConfigManager().get_github_token() == "github_token-secret"
+
+    assert keyring.get_password.call_count == 2
+
+def test_login_and_logout_invalidate(keyring, mocker):
+    send = mocker.patch("gittask.daemon.send")
+    config = ConfigManager()
+    config.get_api_token()
+
+    keyring.get_password.side_effect = lambda service, name: "new-token"
+    config.set_api_token("new-token")
+    assert config.get_api_token() == "new-token"
+    send.assert_called_with({'op': "forget_secrets"}, timeout=daemon.REPLY_TIMEOUT)
+
+    keyring.get_password.side_effect = lambda service, name: None
+    config.logout()
+    assert config.get_api_token() is None
+    assert send.call_count == 2
+
+def test_cache_expires(keyring, monkeypatch):
+    monkeypatch.setenv("GITTASK_SECRET_TTL", "0")
+    config = ConfigManager()
+
+    config.get_api_token()
+    config.get_api_token()
+
+    assert keyring.get_password.call_count == 2
+    assert SECRET_CACHE.get((config.SERVICE_NAME, "api_token")) is None
+
+def test_daemon_keeps_tokens_longer(mocker):
+    mocker.patch("gittask.daemon.serving", return_value=True)
+    send = mocker.patch("gittask.daemon.send")
+
+    assert config_module.secret_ttl() == config_module.DAEMON_SECRET_TTL
+    # Inside the daemon there is no other daemon to notify
+    config_module.forget_secrets(everywhere=True)
+    send.assert_not_called()
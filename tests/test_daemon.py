@@ -0,0 +1,208 @@
+import io
+import os
+import stat
+import threading
+import time
+import pytest
+from rich.console import Console
+from gittask import daemon, output
+from gittask.commands import status as status_command
+
+@pytest.fixture
+def server(daemon_socket, mock_db, mocker):
+    mocker.patch("gittask.commands.status.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.session.db", mock_db)
+    resident = daemon.Daemon(str(daemon_socket))
+    resident.bind()
+    thread = threading.Thread(target=resident.serve_forever, daemon=True)
+    thread.start()
+    yield resident
+    daemon.send({'op': "shutdown"})
+    thread.join(timeout=5)
+
+def test_forward_runs_command_in_daemon(server, mock_db, capsys):
+    mock_db.start_session("feature", "/tmp/repo", "t1")
+
+    assert daemon.forward(["status"]) == 0
+
+    assert "feature" in capsys.readouterr().out
+    assert server.served == 1
+    # Modules keep the shared console; only the command's context was redirected
+    assert status_command.console is output.console
+
+def test_command_runs_with_client_settings(server, mock_db, mocker, monkeypatch):
+    # Set where the daemon was started, not where the command is run
+    monkeypatch.setenv("GITTASK_SECRET_TTL", "5")
+    seen = {}
+
+    def open_db():
+        seen.update({name: os.environ.get(name) for name in ("GITTASK_SECRET_TTL", "GITTASK_AUTOSYNC")})
+        return mock_db
+
+    mocker.patch("gittask.commands.status.DBManager", side_effect=open_db)
+
+    exit_code, _ = daemon.run_command(["status"], os.getcwd(), env={'GITTASK_AUTOSYNC': "0"})
+
+    assert exit_code == 0
+    assert seen == {'GITTASK_SECRET_TTL': None, 'GITTASK_AUTOSYNC': "0"}
+    # The daemon's own settings are back afterwards
+    assert os.environ["GITTASK_SECRET_TTL"] == "5"
+    assert "GITTASK_AUTOSYNC" not in os.environ
+
+def test_forward_sends_client_settings(mocker, monkeypatch):
+    monkeypatch.setenv("GITTASK_AUTOSYNC", "0")
+    send = mocker.patch("gittask.daemon.send", return_value={'exit_code': 0, 'output': ""})
+
+    daemon.forward(["stop"])
+
+    assert send.call_args.args[0]['env']['GITTASK_AUTOSYNC'] == "0"
+    assert all(name.startswith("GITTASK_") for name in send.call_args.args[0]['env'])
+
+def test_capture_only_applies_to_its_own_thread(capsys):
+    buffer = io.StringIO()
+    captured = threading.Event()
+    printed = threading.Event()
+
+    def command():
+        with output.capture(Console(file=buffer)):
+            output.console.print("from the command")
+            captured.set()
+            printed.wait(timeout=5)
+
+    thread = threading.Thread(target=command)
+    thread.start()
+    captured.wait(timeout=5)
+    output.console.print("from elsewhere")
+    print("plain print")
+    printed.set()
+    thread.join(timeout=5)
+
+    assert buffer.getvalue() == "from the command\n"
+    out = capsys.readouterr().out
+    assert "from elsewhere" in out and "plain print" in out
+
+def test_exit_code_and_cwd_forwarded(server, tmp_path, monkeypatch, capsys):
+    # Not a git repository: `start` fails in the daemon just like it would locally
+    monkeypatch.chdir(tmp_path)
+
+    assert daemon.forward(["start"]) == 1
+    assert "Not in a git repository" in capsys.readouterr().out
+
+def test_usage_errors_are_reported(server, capsys):
+    assert daemon.forward(["status", "--bogus"]) == 2
+    assert "No such option" in capsys.readouterr().out
+
+def test_socket_is_private(server, daemon_socket):
+    assert stat.S_IMODE(os.stat(daemon_socket).st_mode) & 0o077 == 0
+
+def test_ping_and_shutdown(server):
+    info = daemon.send({'op': "ping"})
+    assert info['served'] == 1
+
+    assert daemon.send({'op': "shutdown"}) == {'ok': True}
+    time.sleep(0.2)
+    assert daemon.send({'op': "ping"}) is None
+
+def test_detached_run_does_not_wait(server, mocker):
+    popen = mocker.patch("subprocess.Popen")
+    popen.return_value.poll.return_value = None
+
+    assert daemon.forward(["outbox", "flush", "--quiet"], detach=True) == 0
+    # The job runs in its own process, so the daemon answers right away
+    assert daemon.send({'op': "ping"})['served'] == 2
+
+    command = popen.call_args.args[0]
+    assert command[1:] == ["-m", "gittask.main", "outbox", "flush", "--quiet"]
+    assert popen.call_args.kwargs['cwd'] == os.getcwd()
+    assert popen.call_args.kwargs['env']['GITTASK_DAEMON_SOCKET'] == os.environ['GITTASK_DAEMON_SOCKET']
+    assert server._jobs == [popen.return_value]
+
+def test_outbox_delivery_goes_to_daemon(mocker, mock_background_delivery):
+    forward = mocker.patch("gittask.daemon.forward", return_value=0)
+    from gittask import outbox
+
+    outbox.deliver_in_background()
+
+    forward.assert_called_once_with(["outbox", "flush", "--quiet"], detach=True)
+    mock_background_delivery.assert_not_called()
+
+def test_outbox_delivery_inside_daemon_runs_after_request(server, mocker, mock_background_delivery):
+    after_request = mocker.patch("gittask.daemon.after_request")
+    forward = mocker.patch("gittask.daemon.forward")
+    from gittask import outbox
+
+    outbox.deliver_in_background()
+
+    after_request.assert_called_once_with(["outbox", "flush", "--quiet"])
+    forward.assert_not_called()
+    mock_background_delivery.assert_not_called()
+
+def test_busy_daemon_does_not_hold_up_background_work(daemon_socket, mocker, mock_background_delivery):
+    import socket
+    from gittask import outbox
+    mocker.patch("gittask.daemon.REPLY_TIMEOUT", 0.2)
+    # Listening, but busy with another command: nothing is accepted
+    busy = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    busy.bind(str(daemon_socket))
+    busy.listen()
+
+    with busy:
+        assert daemon.forward(["outbox", "flush", "--quiet"], detach=True) is None
+        outbox.deliver_in_background()
+
+    # Delivered by a local process instead
+    mock_background_delivery.assert_called_once()
+
+def test_second_daemon_refused(server, daemon_socket):
+    with pytest.raises(RuntimeError):
+        daemon.Daemon(str(daemon_socket)).bind()
+
+def test_stale_socket_replaced(daemon_socket):
+    import socket
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(daemon_socket))
+    stale.close()
+
+    resident = daemon.Daemon(str(daemon_socket))
+    resident.bind()
+    resident._server.close()
+
+def test_fallback_without_daemon(mocker, monkeypatch):
+    app = mocker.patch("gittask.main.app")
+    monkeypatch.setattr("sys.argv", ["gt", "status"])
+
+    assert daemon.forward(["status"]) is None
+    daemon.cli()
+
+    app.assert_called_once()
+
+def test_only_whitelisted_commands_forwarded(mocker, monkeypatch):
+    assert daemon.is_forwarded(["outbox", "flush", "--quiet"])
+    assert daemon.is_forwarded(["stop"])
+    assert not daemon.is_forwarded(["outbox"])
+    assert not daemon.is_forwarded(["checkout", "-b", "x"])
+    assert not daemon.is_forwarded([])
+
+    monkeypatch.setenv("GITTASK_DAEMON", "0")
+    assert not daemon.is_forwarded(["stop"])
+
+def test_forget_secrets(server):
+    from gittask.config import SECRET_CACHE
+    SECRET_CACHE.set(("gittask_asana_pat", "api_token"), "old-token")
+
+    assert daemon.send({'op': "forget_secrets"}) == {'ok': True}
+
+    assert SECRET_CACHE.get(("gittask_asana_pat", "api_token")) is None
+
+def test_idle_daemon_checks_auto_sync(daemon_socket, mocker):
+    mocker.patch("gittask.database.DBManager")
+    checked = threading.Event()
+    mocker.patch("gittask.scheduler.trigger", side_effect=lambda db: checked.set())
+    resident = daemon.Daemon(str(daemon_socket), tick_interval=0.05)
+    thread = threading.Thread(target=resident.serve_forever, daemon=True)
+    thread.start()
+
+    assert checked.wait(timeout=5)
+
+    daemon.send({'op': "shutdown"})
+    thread.join(timeout=5)
@@ -0,0 +1,41 @@
+from textual.app import App
+from gittask.tui.screens.dashboard import Dashboard
+
+class DashboardApp(App):
+    def on_mount(self) -> None:
+        self.push_screen(Dashboard())
+
+async def test_refresh_updates_cards_in_place(mock_db, mock_git, mocker):
+    mocker.patch("gittask.tui.screens.dashboard.DBManager", return_value=mock_db)
+    mocker.patch("gittask.tui.widgets.task_card.DBManager", return_value=mock_db)
+    mocker.patch("gittask.tui.screens.dashboard.GitHandler", return_value=mock_git)
+    for n in range(3):
+        mock_db.link_branch_to_task(f"b{n}", "/tmp/mock_repo", f"t{n}", f"Task {n}", "p1", "w1")
+    mock_db.start_session("b0", "/tmp/mock_repo", "t0")
+
+    app = DashboardApp()
+    async with app.run_test() as pilot:
+        dashboard = app.screen
+        cards = dict(dashboard.cards)
+        assert [card.branch_name for card in dashboard.query_one("#task-grid").children] == ["b0", "b1", "b2"]
+        assert cards["b0"].is_active
+
+        # Another task becomes active: the same cards are updated and reordered
+        mock_db.start_session("b2", "/tmp/mock_repo", "t2")
+        dashboard.refresh_tasks()
+        await pilot.pause()
+
+        grid = dashboard.query_one("#task-grid")
+        assert list(grid.children) == [cards["b2"], cards["b0"], cards["b1"]]
+        assert cards["b2"].is_active and not cards["b0"].is_active
+        assert cards["b2"].query_one("#stop-btn").display
+        assert not cards["b0"].query_one("#stop-btn").display
+        assert cards["b0"].query_one("#start-btn").display
+
+        # Unlinking removes only that card
+        mock_db.remove_branch_link("b1", "/tmp/mock_repo")
+        dashboard.refresh_tasks()
+        await pilot.pause()
+
+        assert list(grid.children) == [cards["b2"], cards["b0"]]
+        assert dashboard.cards == {'b2': cards["b2"], 'b0': cards["b0"]}
@@ -11,10 +11,12 @@ def db(tmp_path):
     db_path = tmp_path / "test_db.json"
     return DBManager(str(db_path))
 
-def test_init_default_path(mocker):
+def test_init_default_path(mocker, tmp_path, monkeypatch):
     """
     Test initialization with default path.
     """
+    # The mocked path is relative: keep the files it creates out of the working tree
+    monkeypatch.chdir(tmp_path)
     mock_path = mocker.patch("gittask.database.Path")
     mock_home = mock_path.home.return_value
     mock_config_dir = mock_home / ".gittask"
@@ -155,3 +157,59 @@ def test_unsynced_sessions(db):
     
     unsynced = db.get_unsynced_sessions()
     assert len(unsynced) == 0
+
+def test_cache_projects_is_incremental(db):
+    """
+    Test refreshing the project cache only adds, renames and removes what changed.
+    """
+    counts = db.cache_projects('ws1', [{'gid': 'p1', 'name': 'One'}, {'gid': 'p2', 'name': 'Two'}])
+    assert counts == {'added': 2, 'updated': 0, 'removed': 0}
+    db.cache_projects('ws2', [{'gid': 'p9', 'name': 'Other'}])
+    
+    counts = db.cache_projects('ws1', [{'gid': 'p1', 'name': 'One (renamed)'}, {'gid': 'p3', 'name': 'Three'}])
+    
+    assert counts == {'added': 1, 'updated': 1, 'removed': 1}
+    assert sorted(p['name'] for p in db.get_cached_projects('ws1')) == ['One (renamed)', 'Three']
+    assert [p['name'] for p in db.get_cached_projects('ws2')] == ['Other']
+    assert db.get_listing_refreshed_at('projects', 'ws1') is not None
+    assert db.get_listing_refreshed_at('projects', 'ws3') is None
+
+def test_concurrent_writers_do_not_lose_rows(tmp_path):
+    """
+    Test processes writing the same db.json at once keep each other's writes.
+    """
+    import subprocess
+    import sys
+    db_path = tmp_path / "db.json"
+    DBManager(str(db_path))
+    code = (
+        "import sys\n"
+        "from gittask.database import DBManager\n"
+        "db = DBManager(sys.argv[1])\n"
+        "for n in range(50):\n"
+        "    db.outbox.insert({'writer': sys.argv[2], 'n': n})\n"
+    )
+    writers = [
+        subprocess.Popen([sys.executable, "-c", code, str(db_path), str(w)])
+        for w in range(3)
+    ]
+    assert [p.wait(timeout=60) for p in writers] == [0, 0, 0]
+
+    rows = DBManager(str(db_path)).outbox.all()
+    assert len(rows) == 150
+    assert len({row.doc_id for row in rows}) == 150
+
+def test_cache_tasks_writes_once_per_call(db, mocker):
+    db.cache_tasks([{'gid': '1', 'name': "Old", 'completed': False}])
+    write = mocker.spy(db.db.storage, 'write')
+
+    db.cache_tasks([
+        {'gid': str(n), 'name': f"Task {n}", 'assignee': {'gid': 'me'}, 'tags': [{'gid': 't1'}]}
+        for n in range(1, 201)
+    ])
+
+    assert write.call_count <= 2
+    assert len(db.tasks.all()) == 200
+    assert db.get_cached_task('1')['name'] == "Task 1"
+    assert db.get_cached_task('7')['assignee_gid'] == 'me'
+    assert db.get_cached_task('7')['tag_gids'] == ['t1']
@@ -0,0 +1,122 @@
+import pytest
+import datetime
+import asana
+from typer.testing import CliRunner
+from unittest.mock import MagicMock
+from gittask.asana_client import AsanaClient
+from gittask.commands.sync import sync
+from gittask import metrics
+import typer
+
+runner = CliRunner()
+
+@pytest.fixture
+def client(fake):
+    with AsanaClient("token", host=fake.url) as c:
+        yield c
+
+def test_client_talks_to_fake(fake, client):
+    assert client.get_user_gid() == fake.me['gid']
+    assert [w['name'] for w in client.get_workspaces()] == ["Test Workspace"]
+
+def test_host_from_environment(fake, monkeypatch):
+    monkeypatch.setenv("GITTASK_ASANA_HOST", fake.url)
+    with AsanaClient("token") as c:
+        assert c.get_user_gid() == fake.me['gid']
+
+def test_pagination(fake, client):
+    """
+    Test collections are fetched page by page and item_limit stops fetching early.
+    """
+    for i in range(25):
+        fake.add_task(f"Task {i}", project_gid=fake.project['gid'])
+    fake.add_task("Done", project_gid=fake.project['gid'], completed=True)
+
+    tasks = list(client.iter_project_tasks(fake.project['gid'], page_size=10))
+    assert len(tasks) == 25
+    assert fake.request_count("GET", r"^/tasks$") == 3
+
+    fake.requests.clear()
+    assert len(list(client.iter_project_tasks(fake.project['gid'], page_size=10, limit=5))) == 5
+    assert fake.request_count("GET", r"^/tasks$") == 1
+
+def test_create_task_with_tags_is_one_request(fake, client):
+    tag = fake.add_tag(fake.workspace['gid'], "bug")
+    fake.requests.clear()
+
+    task = client.create_task(fake.workspace['gid'], fake.project['gid'], "Fix it", tag_gids=[tag['gid']])
+
+    assert fake.tasks[task['gid']]['tags'] == [{'gid': tag['gid'], 'name': "bug"}]
+    assert fake.request_count() == 1
+
+def test_rate_limit_is_retried(fake, client, metrics_file):
+    """
+    Test a 429 on a read is retried by the SDK and the retry shows up in the metrics.
+    """
+    fake.inject_rate_limit(times=1, retry_after=0, method="GET", path=r"^/workspaces$")
+
+    assert len(client.get_workspaces()) == 1
+
+    assert fake.request_count("GET", r"^/workspaces$") == 2
+    records = [r for r in metrics.load_records() if r['endpoint'] == "GET /workspaces"]
+    assert records[0]['retries'] == 1
+
+def test_rate_limited_write_is_not_retried(fake, client):
+    """
+    urllib3 only retries idempotent methods, so a 429 on a write reaches the caller.
+    """
+    task = fake.add_task("Task")
+    fake.inject_rate_limit(times=1, retry_after=0, method="POST", path=r"/stories$")
+
+    with pytest.raises(asana.rest.ApiException) as exc:
+        client.post_comment(task['gid'], "Hello", idempotency_key="k1")
+
+    assert exc.value.status == 429
+    assert fake.request_count("POST", r"/stories$") == 1
+    assert not client.has_comment_with_key(task['gid'], "k1")
+
+def test_injected_error_surfaces_status(fake, client):
+    task = fake.add_task("Task")
+    fake.inject_error(403, method="PUT", path=r"^/tasks/\d+$")
+
+    with pytest.raises(asana.rest.ApiException) as exc:
+        client.complete_task(task['gid'])
+    assert exc.value.status == 403
+
+    client.complete_task(task['gid'])
+    assert fake.tasks[task['gid']]['completed'] is True
+
+def test_latency(fake, client):
+    fake.latency = 0.05
+    start = datetime.datetime.now()
+    client.get_workspaces()
+    assert (datetime.datetime.now() - start).total_seconds() >= 0.05
+
+def test_sync_against_fake(fake, mock_db, mocker, monkeypatch):
+    """
+    Test `gt sync` end to end over HTTP, including a time entry the server rejects.
+    """
+    monkeypatch.setenv("GITTASK_ASANA_HOST", fake.url)
+    config = MagicMock()
+    config.get_api_token.return_value = "token"
+    config.get_paid_plan_status.return_value = True
+    mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.sync.ConfigManager", return_value=config)
+
+    ok = fake.add_task("Ok")
+    rejected = fake.add_task("Rejected")
+    now = datetime.datetime.now().timestamp()
+    for task, branch in ((ok, "feature/ok"), (rejected, "feature/rejected")):
+        mock_db.start_session(branch, "/repo", task['gid'])
+        session = mock_db.get_active_session()
+        mock_db.time_sessions.update({'start_time': now - 600, 'end_time': now, 'duration_seconds': 600}, doc_ids=[session.doc_id])
+    fake.inject_error(400, method="POST", path=rf"/tasks/{rejected['gid']}/time_tracking_entries")
+
+    app = typer.Typer()
+    app.command()(sync)
+    result = runner.invoke(app, [])
+
+    assert result.exit_code == 0
+    assert [e['duration_minutes'] for e in fake.time_entries[ok['gid']]] == [10]
+    assert fake.time_entries[rejected['gid']] == []
+    assert [s['task_gid'] for s in mock_db.get_unsynced_sessions()] == [rejected['gid']]
@@ -22,7 +22,7 @@ def test_finish_full_flow(mock_db, mock_git, mock_config, mock_asana, mocker):
     mock_pr.number = 1
     mock_pr.title = "Test PR"
     mock_repo.owner.login = "owner"
-    mock_repo.get_pulls.return_value = MagicMock(totalCount=1, __getitem__=lambda s, i: mock_pr)
+    mock_repo.get_pulls.return_value = [mock_pr]
     
     mocker.patch("gittask.commands.finish.get_github_client", return_value=mock_gh_client)
     mocker.patch("gittask.commands.finish.get_github_repo", return_value=mock_repo)
@@ -37,6 +37,7 @@ def test_finish_full_flow(mock_db, mock_git, mock_config, mock_asana, mocker):
     # Setup Data
     mock_git.get_current_branch.return_value = "feature-branch"
     mock_config.get_paid_plan_status.return_value = False
+    mock_asana.__enter__.return_value.get_task.return_value = {'gid': 'task123', 'completed': False}
     
     mocker.patch.object(mock_db, 'get_task_for_branch', return_value={
         'asana_task_gid': 'task123',
@@ -64,8 +65,9 @@ def test_finish_full_flow(mock_db, mock_git, mock_config, mock_asana, mocker):
     # 2. Merge PR
     mock_pr.merge.assert_called_once()
     
-    # 3. Close Asana Task
-    mock_asana.__enter__.return_value.complete_task.assert_called_with('task123')
+    # 3. Close Asana Task (queued for background delivery)
+    entries = mock_db.get_outbox_entries(['pending'])
+    assert [(e['op'], e['task_gid']) for e in entries] == [('complete_task', 'task123')]
     
     # 4. Cleanup
     mock_git.checkout_branch.assert_called_with("main")
@@ -107,7 +109,7 @@ def test_finish_no_pr_found(mock_db, mock_git, mock_config, mock_asana, mocker):
     mock_gh_client = MagicMock()
     mock_repo = MagicMock()
     mock_repo.owner.login = "owner"
-    mock_repo.get_pulls.return_value = MagicMock(totalCount=0) # No PRs
+    mock_repo.get_pulls.return_value = [] # No PRs
     
     mocker.patch("gittask.commands.finish.get_github_client", return_value=mock_gh_client)
     mocker.patch("gittask.commands.finish.get_github_repo", return_value=mock_repo)
@@ -116,6 +118,7 @@ def test_finish_no_pr_found(mock_db, mock_git, mock_config, mock_asana, mocker):
     mock_questionary.confirm.return_value.ask.return_value = True
     
     mocker.patch.object(mock_db, 'get_task_for_branch', return_value={'asana_task_gid': '123', 'asana_task_name': 'Task'})
+    mock_asana.__enter__.return_value.get_task.return_value = {'gid': '123', 'completed': False}
     mocker.patch.object(mock_db, 'stop_current_session', return_value={'duration_seconds': 100})
     mocker.patch.object(mock_db, 'get_unsynced_sessions', return_value=[])
     
@@ -135,7 +138,7 @@ def test_finish_cleanup_failure(mock_db, mock_git, mock_config, mock_asana, mock
     
     # Mock GitHub to return no PRs to skip that part
     mock_repo = MagicMock()
-    mock_repo.get_pulls.return_value = MagicMock(totalCount=0)
+    mock_repo.get_pulls.return_value = []
     mocker.patch("gittask.commands.finish.get_github_repo", return_value=mock_repo)
     mocker.patch("gittask.commands.finish.get_github_client")
 
@@ -143,6 +146,7 @@ def test_finish_cleanup_failure(mock_db, mock_git, mock_config, mock_asana, mock
     mock_questionary.confirm.return_value.ask.return_value = True
     
     mocker.patch.object(mock_db, 'get_task_for_branch', return_value={'asana_task_gid': '123', 'asana_task_name': 'Task'})
+    mock_asana.__enter__.return_value.get_task.return_value = {'gid': '123', 'completed': False}
     mocker.patch.object(mock_db, 'stop_current_session', return_value={'duration_seconds': 100})
     mocker.patch.object(mock_db, 'get_unsynced_sessions', return_value=[])
     
@@ -154,3 +158,122 @@ def test_finish_cleanup_failure(mock_db, mock_git, mock_config, mock_asana, mock
     
     assert result.exit_code == 0
     assert "Cleanup failed: Git error" in result.stdout
+
+def test_finish_prefetches_in_parallel(mock_db, mock_git, mock_config, mock_asana, mocker):
+    """
+    Test the PR and task lookups overlap with syncing, and a completed task isn't offered again.
+    """
+    import threading
+    mocker.patch("gittask.commands.finish.db", mock_db)
+    mocker.patch("gittask.commands.finish.git", mock_git)
+    mocker.patch("gittask.commands.finish.config", mock_config)
+    mocker.patch("gittask.commands.finish.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.commands.finish.subprocess.run")
+    mock_git.get_current_branch.return_value = "feature-branch"
+    mock_config.get_paid_plan_status.return_value = False
+    mocker.patch.object(mock_db, 'get_task_for_branch', return_value={'asana_task_gid': '123', 'asana_task_name': 'Task'})
+    mocker.patch.object(mock_db, 'stop_current_session', return_value=None)
+    mocker.patch.object(mock_db, 'get_unsynced_sessions', return_value=[
+        {'id': 1, 'task_gid': '123', 'duration_seconds': 600, 'branch': 'feature-branch', 'end_time': 1234567890}
+    ])
+
+    # Each lookup blocks until the other two have started: this only finishes if they run concurrently
+    started = threading.Barrier(3, timeout=5)
+    client = mock_asana.__enter__.return_value
+    client.log_time_comment.side_effect = lambda *args, **kwargs: started.wait()
+
+    def get_task(task_gid):
+        started.wait()
+        return {'gid': task_gid, 'completed': True}
+    client.get_task.side_effect = get_task
+
+    mock_repo = MagicMock()
+    def get_pulls(**kwargs):
+        started.wait()
+        return []
+    mock_repo.get_pulls.side_effect = get_pulls
+    mocker.patch("gittask.commands.finish.get_github_client")
+    mocker.patch("gittask.commands.finish.get_github_repo", return_value=mock_repo)
+
+    mock_questionary = mocker.patch("gittask.commands.finish.questionary")
+    mock_questionary.confirm.return_value.ask.return_value = False
+
+    result = runner.invoke(app, ["finish"])
+
+    assert result.exit_code == 0, result.output
+    assert "Synced 1 sessions" in result.stdout
+    assert "already completed" in result.stdout
+    assert mock_db.get_cached_task('123')['completed'] is True
+    # Only the cleanup question is asked
+    assert mock_questionary.confirm.call_count == 1
+
+def test_sync_branch_time_reconciles_in_flight(mock_db, mock_config, mock_asana, mocker):
+    """
+    Test a session an interrupted sync left in flight is not posted twice.
+    """
+    from gittask.commands import finish
+    from gittask.sync_engine import delivery_key
+    mocker.patch("gittask.commands.finish.db", mock_db)
+    mocker.patch("gittask.commands.finish.config", mock_config)
+    mocker.patch("gittask.commands.finish.AsanaClient", return_value=mock_asana)
+    mock_config.get_paid_plan_status.return_value = False
+    client = mock_asana.__enter__.return_value
+    client.has_comment_with_key.return_value = True
+
+    session_id = mock_db.start_session("feature-branch", "/tmp/repo", "t1")
+    mock_db.stop_current_session("feature-branch", "/tmp/repo")
+    mock_db.set_sessions_in_flight([session_id], delivery_key([session_id]), "2024-01-01")
+
+    assert finish.sync_branch_time("token", "feature-branch") == 0
+
+    client.log_time_comment.assert_not_called()
+    assert mock_db.get_unsynced_sessions() == []
+
+def test_sync_branch_time_skips_while_sync_runs(mock_db, mock_config, mock_asana, mocker):
+    from gittask import outbox
+    from gittask.commands import finish
+    mocker.patch("gittask.commands.finish.db", mock_db)
+    mocker.patch("gittask.commands.finish.config", mock_config)
+    mocker.patch("gittask.commands.finish.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.commands.finish.SYNC_LOCK_TIMEOUT", 0.2)
+    trigger = mocker.patch("gittask.commands.finish.scheduler.trigger")
+    mock_db.start_session("feature-branch", "/tmp/repo", "t1")
+    mock_db.stop_current_session("feature-branch", "/tmp/repo")
+
+    with outbox.delivery_lock(mock_db, "sync.lock"):
+        assert finish.sync_branch_time("token", "feature-branch") is None
+
+    mock_asana.__enter__.assert_not_called()
+    assert len(mock_db.get_unsynced_sessions()) == 1
+    # Left to the next sync, which is scheduled if due
+    trigger.assert_called_once_with(mock_db)
+
+def test_sync_branch_time_waits_for_running_sync(mock_db, mock_config, mock_asana, mocker):
+    import threading
+    from gittask import outbox
+    from gittask.commands import finish
+    mocker.patch("gittask.commands.finish.db", mock_db)
+    mocker.patch("gittask.commands.finish.config", mock_config)
+    mocker.patch("gittask.commands.finish.AsanaClient", return_value=mock_asana)
+    mock_config.get_paid_plan_status.return_value = False
+    mock_db.start_session("feature-branch", "/tmp/repo", "t1")
+    mock_db.stop_current_session("feature-branch", "/tmp/repo")
+    held = threading.Event()
+    release = threading.Event()
+
+    def running_sync():
+        with outbox.delivery_lock(mock_db, "sync.lock"):
+            held.set()
+            release.wait(timeout=5)
+
+    thread = threading.Thread(target=running_sync)
+    thread.start()
+    held.wait(timeout=5)
+    threading.Timer(0.3, release.set).start()
+
+    # The running sync finishes without this session: finish posts it itself
+    assert finish.sync_branch_time("token", "feature-branch") == 1
+    thread.join(timeout=5)
+
+    mock_asana.__enter__.return_value.log_time_comment.assert_called_once()
+    assert mock_db.get_unsynced_sessions() == []
@@ -0,0 +1,129 @@
+import subprocess
+import sys
+import pytest
+from gittask.git_handler import GitHandler, RepoProbe
+
+def run_git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    path = tmp_path / "repo"
+    path.mkdir()
+    run_git(path, "init", "-q", "-b", "main")
+    run_git(path, "commit", "-q", "--allow-empty", "-m", "init")
+    return path
+
+def test_probe_from_subdirectory(repo):
+    sub = repo / "a" / "b"
+    sub.mkdir(parents=True)
+
+    git = GitHandler(str(sub))
+
+    assert git.get_repo_root() == str(repo)
+    assert git.get_current_branch() == "main"
+
+def test_probe_unborn_branch(repo):
+    run_git(repo, "checkout", "-q", "-b", "feature/new")
+    run_git(repo, "checkout", "-q", "--orphan", "unborn")
+
+    assert GitHandler(str(repo)).get_current_branch() == "unborn"
+
+def test_probe_detached_head(repo):
+    run_git(repo, "checkout", "-q", "--detach")
+
+    assert GitHandler(str(repo)).get_current_branch() == "DETACHED_HEAD"
+
+def test_probe_worktree(repo, tmp_path):
+    worktree = tmp_path / "wt"
+    run_git(repo, "worktree", "add", "-q", "-b", "feature/wt", str(worktree))
+
+    git = GitHandler(str(worktree))
+
+    assert git.get_repo_root() == str(worktree)
+    assert git.get_current_branch() == "feature/wt"
+    # GitPython-backed operations see the same repository
+    assert "feature/wt" in git.list_branches()
+
+def test_not_a_repository(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    assert RepoProbe.find(str(tmp_path)) is None
+    with pytest.raises(Exception, match="Not a git repository"):
+        GitHandler(str(tmp_path))
+
+def test_branch_and_root_without_gitpython(repo):
+    code = (
+        "import sys\n"
+        "from gittask.git_handler import GitHandler\n"
+        "g = GitHandler()\n"
+        "print(g.get_current_branch(), g.get_repo_root())\n"
+        "assert 'git' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=repo, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["main", str(repo)]
+
+def test_log_range(repo):
+    run_git(repo, "branch", "base")
+    run_git(repo, "checkout", "-q", "-b", "feature")
+    for i in range(3):
+        run_git(repo, "commit", "-q", "--allow-empty", "-m", f"Change {i}\n\nDetails {i}")
+
+    git = GitHandler(str(repo))
+    commits = git.log_range("base", "HEAD")
+
+    assert [c['summary'] for c in commits] == ["Change 2", "Change 1", "Change 0"]
+    assert commits[0]['message'].strip() == "Change 2\n\nDetails 2"
+    assert commits[0]['sha'] == git.resolve_ref("HEAD")
+    assert commits[-1]['parents'] == [git.resolve_ref("base")]
+    assert git.log_range("HEAD", "base") == []
+    assert len(git.log_range("base", limit=2)) == 2
+    git.close()
+
+def test_log_range_after_merge(repo):
+    run_git(repo, "checkout", "-q", "-b", "side")
+    run_git(repo, "commit", "-q", "--allow-empty", "-m", "Side")
+    run_git(repo, "checkout", "-q", "main")
+    run_git(repo, "commit", "-q", "--allow-empty", "-m", "Main")
+    run_git(repo, "merge", "-q", "--no-edit", "side")
+
+    git = GitHandler(str(repo))
+
+    assert [c['summary'] for c in git.log_range("side")] == ["Merge branch 'side'", "Main"]
+
+def test_log_range_with_skewed_dates(repo, monkeypatch):
+    """
+    Test commits reachable from base are left out even when its commits claim to be older.
+    """
+    def commit(message, timestamp):
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"@{1_000_000_000 + timestamp} +0000")
+        run_git(repo, "commit", "-q", "--allow-empty", "-m", message)
+
+    commit("Shared", 4000)
+    run_git(repo, "checkout", "-q", "-b", "base")
+    commit("Base 1", 50)
+    commit("Base 2", 100)
+    run_git(repo, "checkout", "-q", "main")
+    commit("Head", 5000)
+
+    git = GitHandler(str(repo))
+
+    assert [c['summary'] for c in git.log_range("base", "main")] == ["Head"]
+    git.close()
+
+def test_resolve_ref_reuses_one_process(repo):
+    git = GitHandler(str(repo))
+
+    assert git.resolve_ref("main") == git.resolve_ref("HEAD")
+    assert git.resolve_ref("origin/main") is None
+    process = git.cat_file._process
+    git.read_commit("HEAD")
+    assert git.cat_file._process is process
+    with pytest.raises(ValueError):
+        git.log_range("does-not-exist")
+    git.close()
@@ -0,0 +1,137 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+import pytest
+from typer.testing import CliRunner
+from gittask.main import app
+from gittask import hook
+
+runner = CliRunner()
+
+# Extra time the hook may add to `git checkout` on top of starting Python
+HOOK_LATENCY_BUDGET = 0.05
+
+def run_git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    path = tmp_path / "repo"
+    path.mkdir()
+    run_git(path, "init", "-q", "-b", "main")
+    run_git(path, "commit", "-q", "--allow-empty", "-m", "init")
+    return path
+
+def test_switch_to_linked_branch(repo, mock_db):
+    mock_db.link_branch_to_task("feature", str(repo), "t2", "Feature", "p1", "w1")
+    mock_db.link_branch_to_task("main", str(repo), "t1", "Main", "p1", "w1")
+    mock_db.start_session("main", str(repo), "t1")
+    run_git(repo, "checkout", "-q", "-b", "feature")
+
+    message = hook.post_checkout("a", "b", "1", db=mock_db, path=str(repo))
+
+    assert message == "gittask: tracking time for 'feature' -> 'Feature'"
+    active = mock_db.get_active_session()
+    assert active['branch'] == "feature"
+    assert active['task_gid'] == "t2"
+    assert len(mock_db.time_sessions.all()) == 2
+
+def test_same_branch_keeps_session(repo, mock_db):
+    mock_db.link_branch_to_task("main", str(repo), "t1", "Main", "p1", "w1")
+    session_id = mock_db.start_session("main", str(repo), "t1")
+
+    assert hook.post_checkout("a", "a", "1", db=mock_db, path=str(repo)) is None
+    assert mock_db.get_active_session()['id'] == session_id
+
+def test_unlinked_branch_stops_session(repo, mock_db):
+    mock_db.start_session("main", str(repo), "t1")
+    run_git(repo, "checkout", "-q", "-b", "spike")
+
+    message = hook.post_checkout("a", "b", "1", db=mock_db, path=str(repo))
+
+    assert "stopped tracking time for 'main'" in message
+    assert mock_db.get_active_session() is None
+
+def test_global_session_survives_unlinked_branch(repo, mock_db):
+    mock_db.start_session("@global:Meeting", "GLOBAL", "t9")
+    run_git(repo, "checkout", "-q", "-b", "spike")
+
+    assert hook.post_checkout("a", "b", "1", db=mock_db, path=str(repo)) is None
+    assert mock_db.get_active_session()['branch'] == "@global:Meeting"
+
+def test_file_checkout_and_detached_head_ignored(repo, mock_db):
+    mock_db.start_session("main", str(repo), "t1")
+
+    assert hook.post_checkout("a", "a", "0", db=mock_db, path=str(repo)) is None
+    run_git(repo, "checkout", "-q", "--detach")
+    assert hook.post_checkout("a", "a", "1", db=mock_db, path=str(repo)) is None
+    assert mock_db.get_active_session()['branch'] == "main"
+
+def test_main_never_fails(mocker, capsys):
+    mocker.patch.dict(hook.HOOKS, {'post-checkout': mocker.Mock(side_effect=RuntimeError("boom"))})
+
+    assert hook.main(["post-checkout", "a", "b", "1"]) == 0
+    assert "boom" in capsys.readouterr().err
+    assert hook.main(["pre-commit"]) == 2
+
+def test_install_and_uninstall(repo, monkeypatch):
+    monkeypatch.chdir(repo)
+    path = repo / ".git" / "hooks" / "post-checkout"
+
+    result = runner.invoke(app, ["hook", "install"])
+
+    assert result.exit_code == 0
+    assert os.access(path, os.X_OK)
+    assert "-m gittask.hook post-checkout" in path.read_text()
+
+    result = runner.invoke(app, ["hook", "uninstall"])
+    assert result.exit_code == 0
+    assert not path.exists()
+
+def test_install_keeps_foreign_hook(repo, monkeypatch):
+    monkeypatch.chdir(repo)
+    path = repo / ".git" / "hooks" / "post-checkout"
+    path.write_text("#!/bin/sh\necho mine\n")
+
+    result = runner.invoke(app, ["hook", "install"])
+    assert result.exit_code == 1
+    assert path.read_text() == "#!/bin/sh\necho mine\n"
+
+    result = runner.invoke(app, ["hook", "install", "--force"])
+    assert result.exit_code == 0
+    assert hook.HOOK_MARKER in path.read_text()
+
+def test_hook_imports_stay_minimal(repo, tmp_path):
+    code = (
+        "import sys\n"
+        "from gittask import hook\n"
+        "hook.main(['post-checkout', 'a', 'b', '1'])\n"
+        "heavy = {'typer', 'rich', 'asana', 'git', 'questionary', 'textual', 'httpx'} & set(sys.modules)\n"
+        "assert not heavy, heavy\n"
+    )
+    env = {**os.environ, 'HOME': str(tmp_path)}
+    result = subprocess.run([sys.executable, "-c", code], cwd=repo, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+def test_hook_latency_budget(repo, tmp_path):
+    env = {**os.environ, 'HOME': str(tmp_path)}
+
+    def median_runtime(args):
+        runs = []
+        for _ in range(5):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], cwd=repo, env=env, check=True, capture_output=True)
+            runs.append(time.perf_counter() - start)
+        return statistics.median(runs)
+
+    baseline = median_runtime(["-c", "pass"])
+    hook_run = median_runtime(["-m", "gittask.hook", "post-checkout", "a", "b", "1"])
+
+    assert hook_run - baseline < HOOK_LATENCY_BUDGET
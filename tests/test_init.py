@@ -8,14 +8,16 @@ runner = CliRunner()
 app = typer.Typer()
 app.command()(init)
 
-def test_init_success(mock_config, mock_asana, mocker):
+def test_init_success(mock_config, mock_asana, mock_db, mocker):
     """
     Test successful initialization.
     """
     mocker.patch("gittask.commands.init.ConfigManager", return_value=mock_config)
+    mocker.patch("gittask.commands.init.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.init.AsanaClient", return_value=mock_asana)
     
     mock_questionary = mocker.patch("gittask.commands.init.questionary")
+    mock_picker = mocker.patch("gittask.utils.questionary")
     
     # Mock Asana data
     mock_asana.__enter__.return_value.me = {'name': 'Test User'}
@@ -24,7 +26,7 @@ def test_init_success(mock_config, mock_asana, mocker):
     
     # Mock user input
     # 1. Select Workspace
-    mock_questionary.select.return_value.ask.side_effect = ['ws1', 'p1'] 
+    mock_picker.select.return_value.ask.side_effect = ['ws1', 'p1'] 
     # 2. Paid plan confirm
     mock_questionary.confirm.return_value.ask.return_value = True
     
@@ -37,6 +39,43 @@ def test_init_success(mock_config, mock_asana, mocker):
     mock_config.set_default_workspace.assert_called_with('ws1')
     mock_config.set_paid_plan_status.assert_called_with(True)
     mock_config.set_default_project.assert_called_with('p1')
+    
+    # Listings are cached for the next run
+    assert mock_db.get_cached_workspaces() == [{'gid': 'ws1', 'name': 'Workspace 1'}]
+    assert mock_db.get_cached_projects('ws1') == [{'gid': 'p1', 'name': 'Project 1', 'workspace_gid': 'ws1'}]
+
+def test_init_uses_cached_listings(mock_config, mock_asana, mock_db, mocker):
+    """
+    Test a second init reads workspaces and projects from the local cache,
+    and --refresh reloads them.
+    """
+    mocker.patch("gittask.commands.init.ConfigManager", return_value=mock_config)
+    mocker.patch("gittask.commands.init.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.init.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.commands.init.questionary")
+    mock_picker = mocker.patch("gittask.utils.questionary")
+    
+    client = mock_asana.__enter__.return_value
+    client.me = {'name': 'Test User'}
+    client.get_workspaces.return_value = [{'gid': 'ws1', 'name': 'Workspace 1'}]
+    client.get_projects.return_value = [{'gid': 'p1', 'name': 'Project 1'}]
+    mock_db.cache_workspaces(client.get_workspaces.return_value)
+    mock_db.cache_projects('ws1', client.get_projects.return_value)
+    mock_picker.select.return_value.ask.side_effect = ['ws1', ''] * 2
+    
+    result = runner.invoke(app, [])
+    
+    assert result.exit_code == 0
+    client.get_workspaces.assert_not_called()
+    client.get_projects.assert_not_called()
+    # Choosing "None" does not set a default project
+    mock_config.set_default_project.assert_not_called()
+    
+    result = runner.invoke(app, ["--refresh"])
+    
+    assert result.exit_code == 0
+    client.get_workspaces.assert_called_once()
+    client.get_projects.assert_called_once_with('ws1')
 
 def test_init_not_authenticated(mock_config, mocker):
     """
@@ -50,11 +89,12 @@ def test_init_not_authenticated(mock_config, mocker):
     assert result.exit_code == 1
     assert "Not authenticated" in result.stdout
 
-def test_init_no_workspaces(mock_config, mock_asana, mocker):
+def test_init_no_workspaces(mock_config, mock_asana, mock_db, mocker):
     """
     Test init fails if no workspaces found.
     """
     mocker.patch("gittask.commands.init.ConfigManager", return_value=mock_config)
+    mocker.patch("gittask.commands.init.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.init.AsanaClient", return_value=mock_asana)
     
     mock_asana.__enter__.return_value.me = {'name': 'Test User'}
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import pytest
+from typer.testing import CliRunner
+from gittask.main import app, COMMANDS
+
+runner = CliRunner()
+
+def run_cli(code, cwd, home):
+    env = {**os.environ, 'HOME': str(home)}
+    env.pop("GIT_DIR", None)
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+
+def test_help_lists_commands_without_importing_them(tmp_path):
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from gittask.main import app\n"
+        "result = CliRunner().invoke(app, ['--help'])\n"
+        "print(result.output)\n"
+        "loaded = [m for m in sys.modules if m.startswith('gittask.commands.')]\n"
+        "assert not loaded, loaded\n"
+        "assert 'github' not in sys.modules\n"
+    )
+    result = run_cli(code, tmp_path, tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    for name in COMMANDS:
+        assert name in result.stdout
+    assert "Pull Request commands" in result.stdout
+
+def test_command_loads_only_its_module(tmp_path):
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from gittask.main import app\n"
+        "result = CliRunner().invoke(app, ['stop'])\n"
+        "print(result.output)\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith('gittask.commands.'))\n"
+        "assert loaded == ['gittask.commands.session'], loaded\n"
+    )
+    # Outside a git repository: commands that need one must not get in the way
+    result = run_cli(code, tmp_path, tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    assert "No active session found" in result.stdout
+
+@pytest.mark.parametrize("name", list(COMMANDS))
+def test_every_command_loads(name):
+    result = runner.invoke(app, [name, "--help"])
+
+    assert result.exit_code == 0, result.output
+    assert "Usage" in result.output
+
+def test_load_failure_is_reported(mocker):
+    mocker.patch("gittask.main.load_command", side_effect=Exception("Not a git repository"))
+
+    result = runner.invoke(app, ["push"])
+
+    assert result.exit_code == 1
+    assert "Not a git repository" in result.output
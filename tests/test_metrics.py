@@ -0,0 +1,83 @@
+import pytest
+from typer.testing import CliRunner
+from gittask.main import app
+from gittask import metrics
+from unittest.mock import MagicMock
+
+runner = CliRunner()
+
+def test_percentile():
+    values = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+    assert metrics.percentile(values, 50) == 50
+    assert metrics.percentile(values, 95) == 100
+    assert metrics.percentile([], 50) == 0.0
+
+def test_asana_endpoint_collapses_gids():
+    url = "https://app.asana.com/api/1.0/tasks/1234567/stories?opt_fields=html_text"
+    assert metrics.asana_endpoint("get", url) == "GET /tasks/{gid}/stories"
+
+def test_instrument_asana_records_calls(metrics_file):
+    """
+    Test the wrapped rest client records endpoint, status, retries and rate limit headers.
+    """
+    raw = MagicMock()
+    raw.headers = {'Retry-After': '30', 'Content-Type': 'application/json'}
+    raw.retries.history = ('first', 'second')
+    response = MagicMock(status=200, urllib3_response=raw, data=b'{"data": {}}')
+
+    api_client = MagicMock()
+    api_client.rest_client.request.return_value = response
+    metrics.instrument_asana(api_client)
+
+    assert api_client.rest_client.request("POST", "https://app.asana.com/api/1.0/tasks/42/addTag", body={'data': {}}) is response
+
+    records = metrics.load_records()
+    assert len(records) == 1
+    assert records[0]['service'] == "asana"
+    assert records[0]['endpoint'] == "POST /tasks/{gid}/addTag"
+    assert records[0]['status'] == 200
+    assert records[0]['retries'] == 2
+    assert records[0]['response_bytes'] == 12
+    assert records[0]['rate_limit'] == {'retry-after': '30'}
+
+def test_instrument_asana_records_errors(metrics_file):
+    error = Exception("Forbidden")
+    error.status = 403
+    api_client = MagicMock()
+    api_client.rest_client.request.side_effect = error
+    metrics.instrument_asana(api_client)
+
+    with pytest.raises(Exception):
+        api_client.rest_client.request("GET", "https://app.asana.com/api/1.0/users/me")
+
+    rows = metrics.summarize(metrics.load_records())
+    assert rows[0]['key'] == "asana GET /users/me"
+    assert rows[0]['errors'] == 1
+
+def test_summarize_by_command(metrics_file):
+    metrics.set_command("sync")
+    metrics.record("asana", "POST /tasks/{gid}/time_tracking_entries", 100)
+    metrics.record("asana", "POST /tasks/{gid}/time_tracking_entries", 300)
+    metrics.set_command("push")
+    metrics.record("asana", "POST /tasks/{gid}/stories", 50)
+    metrics.set_command(None)
+
+    rows = metrics.summarize(metrics.load_records(), by="command")
+    assert [(r['key'], r['calls'], r['total_ms']) for r in rows] == [("sync", 2, 400), ("push", 1, 50)]
+
+def test_api_stats_command(metrics_file):
+    metrics.record("github", "GET /repos/{owner}/{repo}/pulls", 120, status=200)
+
+    result = runner.invoke(app, ["debug", "api-stats"])
+
+    assert result.exit_code == 0
+    assert "/repos/{owner}/{repo}/pulls" in result.stdout
+
+    result = runner.invoke(app, ["debug", "api-stats", "--clear"])
+    assert result.exit_code == 0
+    assert not metrics_file.exists()
+
+def test_api_stats_empty(metrics_file):
+    result = runner.invoke(app, ["debug", "api-stats"])
+    assert result.exit_code == 0
+    assert "No API calls recorded yet" in result.stdout
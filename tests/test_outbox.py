@@ -0,0 +1,161 @@
+import pytest
+from typer.testing import CliRunner
+from gittask.main import app
+from gittask import outbox
+from unittest.mock import MagicMock, call
+
+runner = CliRunner()
+
+def test_enqueue_rejects_unknown_operation(mock_db):
+    with pytest.raises(ValueError):
+        outbox.enqueue(mock_db, 'delete_task', 't1')
+
+def test_deliver_in_order(mock_db):
+    """
+    Test entries are delivered in the order they were queued and then purged.
+    """
+    client = MagicMock()
+    outbox.enqueue(mock_db, 'assign_task', 't1', assignee_gid='me')
+    outbox.enqueue(mock_db, 'add_tag_to_task', 't1', tag_gid='tag1')
+    outbox.enqueue(mock_db, 'complete_task', 't2')
+    
+    delivered, failed = outbox.deliver(mock_db, client)
+    
+    assert (delivered, failed) == (3, 0)
+    assert client.mock_calls == [
+        call.assign_task('t1', assignee_gid='me'),
+        call.add_tag_to_task('t1', tag_gid='tag1'),
+        call.complete_task('t2'),
+    ]
+    assert mock_db.get_outbox_entries() == []
+
+def test_failure_blocks_later_entries_for_same_task(mock_db):
+    """
+    Test a failing entry holds back later writes to the same task only.
+    """
+    client = MagicMock()
+    client.assign_task.side_effect = Exception("API Error")
+    outbox.enqueue(mock_db, 'assign_task', 't1', assignee_gid='me')
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+    outbox.enqueue(mock_db, 'complete_task', 't2')
+    
+    delivered, failed = outbox.deliver(mock_db, client)
+    
+    assert (delivered, failed) == (1, 1)
+    client.complete_task.assert_called_once_with('t2')
+    
+    pending = mock_db.get_outbox_entries(['pending'])
+    assert [e['op'] for e in pending] == ['assign_task', 'complete_task']
+    assert pending[0]['attempts'] == 1
+    assert pending[0]['last_error'] == "API Error"
+
+def test_gives_up_after_max_attempts(mock_db):
+    client = MagicMock()
+    client.complete_task.side_effect = Exception("API Error")
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+    
+    for _ in range(outbox.MAX_ATTEMPTS):
+        outbox.deliver(mock_db, client)
+    
+    failed = mock_db.get_outbox_entries(['failed'])
+    assert len(failed) == 1
+    assert failed[0]['attempts'] == outbox.MAX_ATTEMPTS
+    
+    # Failed entries are not retried automatically
+    outbox.deliver(mock_db, client)
+    assert client.complete_task.call_count == outbox.MAX_ATTEMPTS
+
+def test_comment_carries_idempotency_key(mock_db):
+    client = MagicMock()
+    entry_id = outbox.enqueue(mock_db, 'post_comment', 't1', text='Hello')
+    
+    outbox.deliver(mock_db, client)
+    
+    client.post_comment.assert_called_once_with('t1', text='Hello', idempotency_key=entry_id)
+    client.has_comment_with_key.assert_not_called()
+
+def test_comment_retry_skips_when_already_posted(mock_db):
+    """
+    Test a comment interrupted mid-delivery is not posted twice.
+    """
+    client = MagicMock()
+    entry_id = outbox.enqueue(mock_db, 'post_comment', 't1', text='Hello')
+    mock_db.update_outbox_entry(entry_id, status='in_flight')
+    client.has_comment_with_key.return_value = True
+    
+    delivered, failed = outbox.deliver(mock_db, client)
+    
+    assert (delivered, failed) == (1, 0)
+    client.has_comment_with_key.assert_called_once_with('t1', entry_id)
+    client.post_comment.assert_not_called()
+
+def test_deliver_in_background(mock_background_delivery):
+    outbox.deliver_in_background()
+    
+    args, kwargs = mock_background_delivery.call_args
+    assert args[0][-4:] == ["gittask.main", "outbox", "flush", "--quiet"]
+    assert kwargs['start_new_session'] is True
+
+def test_outbox_flush_command(mock_db, mock_config, mock_asana, mocker):
+    mocker.patch("gittask.commands.outbox.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.outbox.ConfigManager", return_value=mock_config)
+    mocker.patch("gittask.commands.outbox.AsanaClient", return_value=mock_asana)
+    
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+    
+    result = runner.invoke(app, ["outbox", "flush"])
+    
+    assert result.exit_code == 0
+    assert "Delivered 1 updates" in result.stdout
+    mock_asana.__enter__.return_value.complete_task.assert_called_once_with('t1')
+
+def test_outbox_status_command(mock_db, mocker):
+    mocker.patch("gittask.commands.outbox.DBManager", return_value=mock_db)
+    
+    result = runner.invoke(app, ["outbox", "status"])
+    assert "Outbox is empty" in result.stdout
+    
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+    result = runner.invoke(app, ["outbox", "status"])
+    
+    assert result.exit_code == 0
+    assert "complete_task" in result.stdout
+    assert "pending" in result.stdout
+
+def test_failed_entry_keeps_blocking_its_task(mock_db):
+    client = MagicMock()
+    entry_id = outbox.enqueue(mock_db, 'assign_task', 't1', assignee_gid='me')
+    mock_db.update_outbox_entry(entry_id, status='failed', attempts=outbox.MAX_ATTEMPTS)
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+    outbox.enqueue(mock_db, 'complete_task', 't2')
+
+    delivered, failed = outbox.deliver(mock_db, client)
+
+    assert (delivered, failed) == (1, 0)
+    client.complete_task.assert_called_once_with('t2')
+    client.assign_task.assert_not_called()
+    assert [e['op'] for e in mock_db.get_outbox_entries(['pending'])] == ['complete_task']
+
+def test_entries_queued_during_delivery_are_delivered(mock_db):
+    """
+    Test a flush that found the lock held does not leave its entries waiting.
+    """
+    client = MagicMock()
+    client.complete_task.side_effect = lambda task_gid: outbox.enqueue(mock_db, 'post_comment', 't2', text='Late')
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+
+    delivered, failed = outbox.deliver(mock_db, client)
+
+    assert (delivered, failed) == (2, 0)
+    client.post_comment.assert_called_once()
+    assert mock_db.get_outbox_entries() == []
+
+def test_deliver_skips_when_locked(mock_db):
+    client = MagicMock()
+    outbox.enqueue(mock_db, 'complete_task', 't1')
+
+    with outbox.delivery_lock(mock_db) as acquired:
+        assert acquired
+        assert outbox.deliver(mock_db, client) == (0, 0)
+
+    client.complete_task.assert_not_called()
@@ -13,7 +13,6 @@ def test_pr_create_success(mock_db, mock_git, mock_config, mock_asana, mocker):
     mocker.patch("gittask.commands.pr.db", mock_db)
     mocker.patch("gittask.commands.pr.git", mock_git)
     mocker.patch("gittask.commands.pr.config", mock_config)
-    mocker.patch("gittask.commands.pr.AsanaClient", return_value=mock_asana)
     
     # Mock GitHub
     mock_gh_client = MagicMock()
@@ -44,10 +43,13 @@ def test_pr_create_success(mock_db, mock_git, mock_config, mock_asana, mocker):
     
     assert result.exit_code == 0
     assert "PR Created Successfully" in result.stdout
-    assert "Posted PR link" in result.stdout
+    assert "Queued PR link" in result.stdout
     
     mock_repo.create_pull.assert_called_once()
-    mock_asana.__enter__.return_value.post_comment.assert_called_once()
+    entries = mock_db.get_outbox_entries(['pending'])
+    assert len(entries) == 1
+    assert entries[0]['op'] == 'post_comment'
+    assert "http://github.com/owner/repo/pull/1" in entries[0]['args']['text']
 
 def test_pr_create_already_exists(mock_db, mock_git, mock_config, mock_asana, mocker):
     """
@@ -56,7 +58,6 @@ def test_pr_create_already_exists(mock_db, mock_git, mock_config, mock_asana, mo
     mocker.patch("gittask.commands.pr.db", mock_db)
     mocker.patch("gittask.commands.pr.git", mock_git)
     mocker.patch("gittask.commands.pr.config", mock_config)
-    mocker.patch("gittask.commands.pr.AsanaClient", return_value=mock_asana)
     
     mock_gh_client = MagicMock()
     mock_repo = MagicMock()
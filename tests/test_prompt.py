@@ -0,0 +1,129 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import pytest
+from typer.testing import CliRunner
+from gittask import prompt
+from gittask.main import app
+
+runner = CliRunner()
+
+# Extra time `gittask prompt` may take over a bare interpreter, in seconds
+PROMPT_LATENCY_BUDGET = 0.02
+
+def read_state_file(db):
+    with open(db.state_path) as f:
+        return json.load(f)
+
+def test_state_follows_sessions(mock_db):
+    assert read_state_file(mock_db) == {'active': False}
+
+    mock_db.link_branch_to_task("feature", "/tmp/repo", "t1", "Fix login", "p1", "w1")
+    mock_db.start_session("feature", "/tmp/repo", "t1")
+    state = read_state_file(mock_db)
+    assert state['active'] is True
+    assert state['task'] == "Fix login"
+    assert state['branch'] == "feature"
+    assert state['task_gid'] == "t1"
+
+    mock_db.start_session("@global:Meeting", "GLOBAL", "t9")
+    assert read_state_file(mock_db)['task'] == "Meeting"
+
+    mock_db.stop_any_active_session()
+    assert read_state_file(mock_db) == {'active': False}
+    assert not [f for f in os.listdir(os.path.dirname(mock_db.state_path)) if f.endswith(".tmp")]
+
+def test_state_matches_database_after_concurrent_changes(mock_db):
+    import threading
+    from gittask.database import DBManager
+
+    def toggle(n):
+        # Its own DBManager, like another process (e.g. the post-checkout hook)
+        db = DBManager(mock_db.db_path)
+        for _ in range(20):
+            db.start_session(f"b{n}", "/tmp/repo", f"t{n}")
+            db.stop_any_active_session()
+        db.start_session(f"b{n}", "/tmp/repo", f"t{n}")
+
+    threads = [threading.Thread(target=toggle, args=(n,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    active = mock_db.get_active_session()
+    assert read_state_file(mock_db)['branch'] == active['branch']
+    assert not [f for f in os.listdir(os.path.dirname(mock_db.state_path)) if f.endswith(".tmp")]
+
+def test_render():
+    state = {'active': True, 'branch': "feature", 'repo_path': "/src/app", 'task': "Fix login", 'start_time': 1000}
+
+    assert prompt.render(state, now=1000 + 12 * 60) == "Fix login 12m"
+    assert prompt.render(state, "{repo}:{branch} {minutes}", now=1000 + 3900) == "app:feature 65"
+    assert prompt.render(state, now=1000 + 3900) == "Fix login 1h05m"
+    assert prompt.render({**state, 'task': "x" * 40}, "{task}", max_length=10) == "x" * 9 + "…"
+    assert prompt.render({'active': False}, empty="idle") == "idle"
+
+def test_main_reads_state_file(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "state.json"
+    monkeypatch.setenv("GITTASK_STATE_FILE", str(path))
+
+    # No state file yet: nothing is tracked
+    assert prompt.main([]) == 0
+    assert capsys.readouterr().out == ""
+
+    prompt.write_state(str(path), {'active': True, 'branch': "feature", 'task': "Fix login", 'start_time': time.time()})
+    assert prompt.main(["--format", "[{task}]"]) == 0
+    assert capsys.readouterr().out == "[Fix login]\n"
+
+    assert prompt.main(["--format={nope}"]) == 2
+    assert prompt.main(["--bogus"]) == 2
+
+def test_prompt_command(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITTASK_STATE_FILE", str(tmp_path / "state.json"))
+
+    result = runner.invoke(app, ["prompt", "--empty", "idle"])
+
+    assert result.exit_code == 0
+    assert result.output == "idle\n"
+
+def test_cli_renders_without_typer(tmp_path):
+    env = {**os.environ, 'HOME': str(tmp_path)}
+    code = (
+        "import sys\n"
+        "sys.argv = ['gt', 'prompt', '--empty', 'idle']\n"
+        "from gittask import daemon\n"
+        "try:\n"
+        "    daemon.cli()\n"
+        "finally:\n"
+        "    heavy = [m for m in ('typer', 'rich', 'tinydb', 'git', 'keyring') if m in sys.modules]\n"
+        "    assert not heavy, heavy\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "idle\n"
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    os.environ.get("GITTASK_BENCHMARK") != "1",
+    reason="timing depends on the machine: set GITTASK_BENCHMARK=1 to run",
+)
+def test_prompt_latency_budget(tmp_path):
+    env = {**os.environ, 'HOME': str(tmp_path)}
+
+    def median_runtime(args):
+        runs = []
+        for _ in range(5):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], env=env, check=True, capture_output=True)
+            runs.append(time.perf_counter() - start)
+        return statistics.median(runs)
+
+    baseline = median_runtime(["-c", "pass"])
+    prompt_run = median_runtime(["-m", "gittask.prompt"])
+
+    assert prompt_run - baseline < PROMPT_LATENCY_BUDGET
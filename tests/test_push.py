@@ -13,10 +13,9 @@ def test_push_success_with_upstream(mock_db, mock_git, mock_config, mock_asana,
     mocker.patch("gittask.commands.push.db", mock_db)
     mocker.patch("gittask.commands.push.git", mock_git)
     mocker.patch("gittask.commands.push.config", mock_config)
-    mocker.patch("gittask.commands.push.AsanaClient", return_value=mock_asana)
     
     # Mock subprocess
-    mock_subprocess = mocker.patch("gittask.commands.push.subprocess")
+    mock_subprocess = mocker.patch("gittask.services.push.subprocess")
     mock_subprocess.CalledProcessError = subprocess.CalledProcessError
     mock_subprocess.DEVNULL = subprocess.DEVNULL
     mock_subprocess.CalledProcessError = subprocess.CalledProcessError
@@ -28,10 +27,13 @@ def test_push_success_with_upstream(mock_db, mock_git, mock_config, mock_asana,
     mock_git.get_remote_url.return_value = "https://github.com/owner/repo.git"
     
     # Mock upstream check (success)
-    mock_subprocess.run.return_value.returncode = 0
+    mock_git.resolve_ref.return_value = "abc123"
     
     # Mock log output
-    mock_subprocess.check_output.return_value = "hash1|Commit 1\nhash2|Commit 2"
+    mock_git.log_range.return_value = [
+        {'sha': "hash1aaaaaa", 'summary': "Commit 1"},
+        {'sha': "hash2bbbbbb", 'summary': "Commit 2"},
+    ]
     
     # Mock DB task
     mocker.patch.object(mock_db, 'get_task_for_branch', return_value={
@@ -44,17 +46,21 @@ def test_push_success_with_upstream(mock_db, mock_git, mock_config, mock_asana,
     assert result.exit_code == 0
     assert "Pushing to origin/feature-branch" in result.stdout
     assert "Push successful" in result.stdout
-    assert "Posted push summary" in result.stdout
+    assert "Queued push summary" in result.stdout
     
     # Verify push command
+    mock_git.log_range.assert_called_with("origin/feature-branch", "HEAD")
     mock_subprocess.run.assert_any_call(["git", "push", "origin", "feature-branch"], check=True)
     
-    # Verify Asana comment
-    mock_asana.__enter__.return_value.post_comment.assert_called_once()
-    args, _ = mock_asana.__enter__.return_value.post_comment.call_args
-    assert args[0] == 'task123'
-    assert "Commit 1" in args[1]
-    assert "Commit 2" in args[1]
+    # Verify Asana comment is queued, not posted inline
+    mock_asana.__enter__.return_value.post_comment.assert_not_called()
+    entries = mock_db.get_outbox_entries(['pending'])
+    assert len(entries) == 1
+    assert entries[0]['op'] == 'post_comment'
+    assert entries[0]['task_gid'] == 'task123'
+    assert "Commit 1" in entries[0]['args']['text']
+    assert "/commit/hash1aa" in entries[0]['args']['text']
+    assert "Commit 2" in entries[0]['args']['text']
 
 def test_push_success_no_upstream(mock_db, mock_git, mock_config, mock_asana, mocker):
     """
@@ -63,9 +69,8 @@ def test_push_success_no_upstream(mock_db, mock_git, mock_config, mock_asana, mo
     mocker.patch("gittask.commands.push.db", mock_db)
     mocker.patch("gittask.commands.push.git", mock_git)
     mocker.patch("gittask.commands.push.config", mock_config)
-    mocker.patch("gittask.commands.push.AsanaClient", return_value=mock_asana)
     
-    mock_subprocess = mocker.patch("gittask.commands.push.subprocess")
+    mock_subprocess = mocker.patch("gittask.services.push.subprocess")
     mock_subprocess.CalledProcessError = subprocess.CalledProcessError
     mock_subprocess.DEVNULL = subprocess.DEVNULL
     
@@ -74,15 +79,11 @@ def test_push_success_no_upstream(mock_db, mock_git, mock_config, mock_asana, mo
     mock_git.get_remote_url.return_value = "git@github.com:owner/repo.git"
     
     # Mock upstream check failure (no upstream)
-    def run_side_effect(cmd, **kwargs):
-        if "rev-parse" in cmd:
-            raise subprocess.CalledProcessError(1, cmd)
-        return MagicMock(returncode=0)
-    
-    mock_subprocess.run.side_effect = run_side_effect
+    mock_git.resolve_ref.return_value = None
+    mock_subprocess.run.return_value = MagicMock(returncode=0)
     
     # Mock log output
-    mock_subprocess.check_output.return_value = "hash1|Init"
+    mock_git.log_range.return_value = [{'sha': "hash1aaaaaa", 'summary': "Init"}]
     
     mocker.patch.object(mock_db, 'get_task_for_branch', return_value={
         'asana_task_gid': 'task123',
@@ -94,6 +95,7 @@ def test_push_success_no_upstream(mock_db, mock_git, mock_config, mock_asana, mo
     assert result.exit_code == 0
     
     # Verify push with --set-upstream
+    mock_git.log_range.assert_called_with("origin/main", "HEAD")
     mock_subprocess.run.assert_any_call(["git", "push", "--set-upstream", "origin", "new-branch"], check=True)
 
 def test_push_failure(mock_db, mock_git, mocker):
@@ -103,7 +105,7 @@ def test_push_failure(mock_db, mock_git, mocker):
     mocker.patch("gittask.commands.push.db", mock_db)
     mocker.patch("gittask.commands.push.git", mock_git)
     
-    mock_subprocess = mocker.patch("gittask.commands.push.subprocess")
+    mock_subprocess = mocker.patch("gittask.services.push.subprocess")
     mock_subprocess.CalledProcessError = subprocess.CalledProcessError
     
     mock_git.get_current_branch.return_value = "main"
@@ -127,10 +129,9 @@ def test_push_no_task_linked(mock_db, mock_git, mock_config, mock_asana, mocker)
     mocker.patch("gittask.commands.push.db", mock_db)
     mocker.patch("gittask.commands.push.git", mock_git)
     mocker.patch("gittask.commands.push.config", mock_config)
-    mocker.patch("gittask.commands.push.AsanaClient", return_value=mock_asana)
     
-    mock_subprocess = mocker.patch("gittask.commands.push.subprocess")
-    mock_subprocess.check_output.return_value = "hash|msg"
+    mock_subprocess = mocker.patch("gittask.services.push.subprocess")
+    mock_git.log_range.return_value = [{'sha': "hash", 'summary': "msg"}]
     
     mock_git.get_current_branch.return_value = "branch"
     mock_git.get_repo_root.return_value = "/tmp/repo"
@@ -0,0 +1,90 @@
+import pytest
+import threading
+import time
+from unittest.mock import MagicMock
+from gittask.request_cache import ResponseCache
+
+def test_get_or_load_caches_until_ttl(mocker):
+    clock = mocker.patch("gittask.request_cache.time.monotonic", return_value=100.0)
+    cache = ResponseCache(ttl=10)
+    loader = MagicMock(return_value=['a'])
+    
+    assert cache.get_or_load(('s', 'k'), loader) == ['a']
+    assert cache.get_or_load(('s', 'k'), loader) == ['a']
+    assert loader.call_count == 1
+    
+    clock.return_value = 111.0
+    cache.get_or_load(('s', 'k'), loader)
+    assert loader.call_count == 2
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.set(('s', 1), 'one')
+    cache.set(('s', 2), 'two')
+    cache.get(('s', 1))
+    cache.set(('s', 3), 'three')
+    
+    assert cache.get(('s', 1)) == 'one'
+    assert cache.get(('s', 2)) is None
+    assert cache.get(('s', 3)) == 'three'
+
+def test_invalidate_scope():
+    cache = ResponseCache()
+    cache.set(('a', 1), 'x')
+    cache.set(('b', 1), 'y')
+    
+    cache.invalidate('a')
+    
+    assert cache.get(('a', 1)) is None
+    assert cache.get(('b', 1)) == 'y'
+
+def test_concurrent_loads_are_single_flight():
+    cache = ResponseCache()
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'value'
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(('s', 'k'), loader))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+
+def test_failed_load_is_not_cached():
+    cache = ResponseCache()
+    loader = MagicMock(side_effect=[Exception("API Error"), 'value'])
+    
+    with pytest.raises(Exception):
+        cache.get_or_load(('s', 'k'), loader)
+    assert cache.get_or_load(('s', 'k'), loader) == 'value'
+
+def test_load_started_before_invalidate_is_not_cached():
+    cache = ResponseCache()
+    
+    def loader():
+        # A write lands while the read is on the wire
+        cache.invalidate('s')
+        return 'stale'
+    
+    assert cache.get_or_load(('s', 'k'), loader) == 'stale'
+    assert cache.get(('s', 'k')) is None
+    assert cache.get_or_load(('s', 'k'), lambda: 'fresh') == 'fresh'
+    assert cache.get(('s', 'k')) == 'fresh'
+
+def test_cached_values_are_copies():
+    cache = ResponseCache()
+    
+    first = cache.get_or_load(('s', 'k'), lambda: [{'gid': '1'}])
+    first.append({'gid': '2'})
+    first[0]['gid'] = 'changed'
+    
+    assert cache.get(('s', 'k')) == [{'gid': '1'}]
+    cache.get(('s', 'k'))[0]['gid'] = 'changed'
+    assert cache.get(('s', 'k')) == [{'gid': '1'}]
@@ -0,0 +1,131 @@
+import time
+from unittest.mock import MagicMock
+from typer.testing import CliRunner
+from gittask import scheduler
+from gittask.main import app
+
+runner = CliRunner()
+
+def _closed_sessions(db, count, ended_ago=0):
+    for i in range(count):
+        db.start_session(f"b{i}", "/tmp/repo", f"t{i}")
+    db.stop_any_active_session()
+    db.time_sessions.update({'end_time': time.time() - ended_ago, 'duration_seconds': 600})
+
+def _rate_limited(retry_after):
+    error = Exception("Too Many Requests")
+    error.status = 429
+    error.headers = {'Retry-After': str(retry_after)}
+    return error
+
+def test_due_by_size_or_age(mock_db):
+    assert not scheduler.is_due(mock_db)
+
+    _closed_sessions(mock_db, 2)
+    assert not scheduler.is_due(mock_db)
+    assert scheduler.is_due(mock_db, now=time.time() + scheduler.MAX_AGE)
+
+    _closed_sessions(mock_db, scheduler.BATCH_SIZE)
+    assert scheduler.is_due(mock_db)
+
+def test_open_session_not_counted(mock_db):
+    mock_db.start_session("b1", "/tmp/repo", "t1")
+
+    assert not scheduler.is_due(mock_db, now=time.time() + scheduler.MAX_AGE)
+
+def test_trigger_starts_one_background_sync(mock_db, mock_background_delivery):
+    _closed_sessions(mock_db, scheduler.BATCH_SIZE)
+
+    assert scheduler.trigger(mock_db)
+    # The next command shortly after does not start another one
+    assert not scheduler.trigger(mock_db)
+
+    mock_background_delivery.assert_called_once()
+    assert mock_background_delivery.call_args[0][0][-2:] == ["sync", "--auto"]
+
+def test_trigger_disabled(mock_db, mock_background_delivery, monkeypatch):
+    monkeypatch.setenv("GITTASK_AUTOSYNC", "0")
+    _closed_sessions(mock_db, scheduler.BATCH_SIZE)
+
+    assert not scheduler.trigger(mock_db)
+    mock_background_delivery.assert_not_called()
+
+def test_run_delivers_batch(mock_db):
+    _closed_sessions(mock_db, 3)
+    client = MagicMock()
+    client.add_time_entry.return_value = {'gid': "e1"}
+
+    assert scheduler.run(mock_db, client, paid_plan=True) == (3, 0)
+
+    assert mock_db.get_unsynced_sessions() == []
+    assert mock_db.get_sync_schedule()['failures'] == 0
+
+def test_failures_back_off(mock_db):
+    _closed_sessions(mock_db, scheduler.BATCH_SIZE)
+    client = MagicMock()
+    client.add_time_entry.side_effect = ConnectionError("offline")
+    now = time.time()
+
+    assert scheduler.run(mock_db, client, paid_plan=True, now=now) == (0, 1)
+    assert mock_db.get_sync_schedule()['next_attempt_at'] == now + scheduler.BACKOFF_BASE
+    assert not scheduler.is_due(mock_db, now=now + 1)
+
+    # Retried sessions were reconciled back to pending; the next failure waits twice as long
+    client.get_time_entries = MagicMock(return_value=[])
+    scheduler.run(mock_db, client, paid_plan=True, now=now)
+    assert mock_db.get_sync_schedule()['failures'] == 2
+    assert mock_db.get_sync_schedule()['next_attempt_at'] == now + 2 * scheduler.BACKOFF_BASE
+
+def test_rate_limit_respects_retry_after(mock_db):
+    _closed_sessions(mock_db, 1)
+    client = MagicMock()
+    client.add_time_entry.side_effect = _rate_limited(900)
+    now = time.time()
+
+    scheduler.run(mock_db, client, paid_plan=True, now=now)
+
+    assert mock_db.get_sync_schedule()['next_attempt_at'] == now + 900
+    assert mock_db.get_unsynced_sessions()[0]['delivery_state'] == 'pending'
+
+def test_rejected_delivery_does_not_block_the_rest(mock_db):
+    _closed_sessions(mock_db, 3)
+    client = MagicMock()
+    not_found = Exception("Not Found")
+    not_found.status = 404
+    client.add_time_entry.side_effect = [not_found, {'gid': "e2"}, {'gid': "e3"}]
+    now = time.time()
+
+    assert scheduler.run(mock_db, client, paid_plan=True, now=now) == (2, 1)
+
+    # No backoff, and the rejected task's session is parked for auto-sync
+    schedule = mock_db.get_sync_schedule()
+    assert schedule['failures'] == 0
+    assert schedule['next_attempt_at'] == 0
+    assert schedule['last_error'] == "Not Found"
+    [rejected] = mock_db.get_unsynced_sessions()
+    assert rejected['task_gid'] == "t0" and rejected['delivery_state'] == 'pending'
+    assert not scheduler.is_due(mock_db, now=now + scheduler.MAX_AGE)
+
+    client.add_time_entry.reset_mock()
+    assert scheduler.run(mock_db, client, paid_plan=True, now=now) == (0, 0)
+    client.add_time_entry.assert_not_called()
+
+def test_sync_auto_skips_when_not_due(mock_db, mocker):
+    mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
+    config = mocker.patch("gittask.commands.sync.ConfigManager")
+
+    result = runner.invoke(app, ["sync", "--auto"])
+
+    assert result.exit_code == 0
+    assert result.output == ""
+    config.assert_not_called()
+
+def test_stop_triggers_auto_sync(mock_db, mocker):
+    mocker.patch("gittask.commands.session.db", mock_db)
+    trigger = mocker.patch("gittask.scheduler.trigger")
+    mock_db.start_session("@global:Meeting", "GLOBAL", "t9")
+
+    result = runner.invoke(app, ["stop"])
+
+    assert result.exit_code == 0
+    trigger.assert_called_once_with(mock_db)
@@ -0,0 +1,95 @@
+import pytest
+import subprocess
+from unittest.mock import MagicMock
+from gittask.services import ServiceError
+from gittask.services.checkout import checkout_branch
+from gittask.services.push import push_branch
+from gittask.services.sync import sync_time
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, message, level="info", done=None, total=None):
+        self.calls.append((message, level, done, total))
+
+    def messages(self, level):
+        return [message for message, lvl, _, total in self.calls if lvl == level and total is None]
+
+    def steps(self):
+        return [(done, total) for _, _, done, total in self.calls if total is not None]
+
+def test_sync_reports_steps_and_errors(mock_db, mock_config, mock_asana, mocker):
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
+    mock_config.get_paid_plan_status.return_value = True
+    client = mock_asana.__enter__.return_value
+    client.add_time_entry.side_effect = [None, Exception("Rate limited")]
+    mocker.patch.object(mock_db, 'get_unsynced_sessions', return_value=[
+        {'id': 1, 'task_gid': 't1', 'duration_seconds': 60, 'end_time': 100, 'branch': 'b1'},
+        {'id': 2, 'task_gid': 't2', 'duration_seconds': 60, 'end_time': 100, 'branch': 'b2'},
+    ])
+    progress = Recorder()
+
+    result = sync_time(mock_db, mock_config, progress)
+
+    assert result['synced'] == 1
+    assert result['failed'] == 1
+    assert progress.steps() == [(1, 2), (2, 2)]
+    assert progress.messages("error") == ["Failed to sync session 2: Rate limited"]
+
+def test_sync_requires_token(mock_db, mock_config):
+    mock_config.get_api_token.return_value = None
+
+    with pytest.raises(ServiceError, match="Not authenticated"):
+        sync_time(mock_db, mock_config)
+
+def test_push_captures_git_output(mock_db, mock_git, mock_config, mocker):
+    mock_subprocess = mocker.patch("gittask.services.push.subprocess")
+    mock_subprocess.run.return_value = subprocess.CompletedProcess(
+        [], 1, stdout="", stderr="rejected: non-fast-forward",
+    )
+    mock_git.get_current_branch.return_value = "feature"
+    mock_git.resolve_ref.return_value = "abc123"
+    mock_git.log_range.return_value = []
+    progress = Recorder()
+
+    with pytest.raises(ServiceError, match="non-fast-forward"):
+        push_branch(mock_db, mock_git, mock_config, progress=progress, capture_output=True)
+
+    assert progress.messages("detail") == ["rejected: non-fast-forward"]
+    assert mock_subprocess.run.call_args.kwargs['capture_output'] is True
+
+def test_checkout_branch_starts_tracking_linked_branch(mock_db, mock_git, mocker):
+    trigger = mocker.patch("gittask.services.checkout.scheduler.trigger")
+    mock_db.link_branch_to_task("feature", "/tmp/mock_repo", "t1", "Task 1", "p1", "w1")
+    progress = Recorder()
+
+    checkout_branch(mock_db, mock_git, "feature", progress=progress)
+
+    mock_git.checkout_branch.assert_called_once_with("feature", create_new=False)
+    assert mock_db.get_active_session()['branch'] == "feature"
+    assert progress.messages("success")[-1] == "Started tracking time for 'feature' -> 'Task 1'"
+    trigger.assert_called_once_with(mock_db)
+
+def test_checkout_current_branch_is_not_a_warning(mock_db, mock_git, mocker):
+    mocker.patch("gittask.services.checkout.scheduler.trigger")
+    mock_git.get_current_branch.return_value = "feature"
+    mock_db.link_branch_to_task("feature", "/tmp/mock_repo", "t1", "Task 1", "p1", "w1")
+    mock_db.start_session("feature", "/tmp/mock_repo", "t1")
+    progress = Recorder()
+
+    checkout_branch(mock_db, mock_git, "feature", progress=progress)
+
+    assert progress.messages("info") == [
+        "Already on branch feature",
+        "Already tracking time for 'feature'",
+    ]
+    assert progress.messages("warning") == []
+
+def test_checkout_branch_failure(mock_db, mock_git):
+    mock_git.checkout_branch.side_effect = Exception("local changes would be overwritten")
+
+    with pytest.raises(ServiceError, match="local changes"):
+        checkout_branch(mock_db, mock_git, "feature", progress=MagicMock())
+
+    assert mock_db.get_active_session() is None
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import pytest
+from typer.testing import CliRunner
+from gittask.main import app, COMMANDS
+from gittask import startup
+
+runner = CliRunner()
+
+# Commands that only touch the local database: they get the tightest budget
+LOCAL_COMMANDS = [startup.HELP, "status", "stop", "start"]
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       300 |        420 | json
+import time:      2000 |       2000 |     rich.style
+import time:      1000 |       3000 |   rich.console
+import time:       500 |       3920 | gittask.main
+"""
+
+@pytest.fixture(scope="module", autouse=True)
+def compiled():
+    """
+    Installed packages ship bytecode: don't time compiling gittask (e.g. under PYTHONDONTWRITEBYTECODE).
+    """
+    import compileall
+    import gittask
+    compileall.compile_dir(os.path.dirname(gittask.__file__), quiet=1)
+
+@pytest.fixture
+def home_env(tmp_path):
+    env = {**os.environ, 'HOME': str(tmp_path)}
+    env.pop("GIT_DIR", None)
+    return env
+
+def test_parse_importtime():
+    rows = startup.parse_importtime(SAMPLE)
+
+    assert rows[0] == {'module': "_json", 'self_us': 120, 'cumulative_us': 120}
+    assert len(rows) == 5
+    assert startup.package_breakdown(rows, top=2) == [("rich", 3.0), ("gittask", 0.5)]
+
+def test_budgets_override(monkeypatch):
+    monkeypatch.setenv("GITTASK_STARTUP_BUDGETS", "status=80, checkout=450")
+
+    budgets = startup.budgets()
+
+    assert budgets["status"] == 80
+    assert budgets["checkout"] == 450
+    assert budgets["finish"] == startup.BUDGETS_MS["finish"]
+    assert set(budgets) == {startup.HELP, *COMMANDS}
+
+def test_check_reports_budget_and_heavy_imports():
+    result = {'command': "status", 'ms': 120.0, 'heavy': ["asana"], 'imports': []}
+
+    problems = startup.check(result, budget_ms=80)
+
+    assert problems == ["status: takes 120 ms, budget is 80 ms", "status: imports asana"]
+    assert startup.check({**result, 'command': "sync", 'ms': 10.0}, budget_ms=80) == []
+
+@pytest.mark.parametrize("command", [startup.HELP, *COMMANDS])
+def test_commands_only_import_the_libraries_they_use(command, home_env):
+    result = subprocess.run(
+        [sys.executable, "-c", startup.entry_code(command)],
+        capture_output=True, text=True, env=home_env,
+    )
+
+    assert result.returncode == 0, result.stderr
+    heavy = {m for m in result.stdout.strip().split(",") if m}
+    assert heavy <= startup.ALLOWED_HEAVY.get(command, set())
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    os.environ.get("GITTASK_BENCHMARK") != "1",
+    reason="timing depends on the machine: set GITTASK_BENCHMARK=1 to run",
+)
+def test_local_commands_within_budget(home_env):
+    budgets = startup.budgets()
+
+    problems = []
+    for command in LOCAL_COMMANDS:
+        # A regression is over budget on every attempt, a busy machine only on some
+        for _ in range(3):
+            base = startup.baseline(runs=5, env=home_env)
+            result = startup.measure(command, runs=5, base=base, env=home_env)
+            command_problems = startup.check(result, budgets[command])
+            if not command_problems:
+                break
+        problems += command_problems
+
+    assert problems == []
+
+def test_debug_startup_command(mocker):
+    mocker.patch("gittask.startup.baseline", return_value=0.05)
+    mocker.patch("gittask.startup.measure", return_value={
+        'command': "status", 'ms': 500.0, 'heavy': [], 'imports': startup.parse_importtime(SAMPLE),
+    })
+
+    result = runner.invoke(app, ["debug", "startup", "status", "--runs", "1"])
+
+    assert result.exit_code == 1
+    assert "rich 3" in result.output
+    assert "status: takes 500 ms" in result.output
+
+    result = runner.invoke(app, ["debug", "startup", "nope"])
+    assert result.exit_code == 1
+    assert "Unknown command" in result.output
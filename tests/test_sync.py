@@ -2,7 +2,9 @@ import pytest
 from typer.testing import CliRunner
 from gittask.commands.sync import sync
 import typer
+import datetime
 from unittest.mock import MagicMock, call
+from gittask.sync_engine import delivery_key
 
 runner = CliRunner()
 app = typer.Typer()
@@ -14,7 +16,7 @@ def test_sync_success_paid_plan(mock_db, mock_config, mock_asana, mocker):
     """
     mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
-    mocker.patch("gittask.commands.sync.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
     
     # Mock unsynced sessions
     sessions = [
@@ -34,9 +36,10 @@ def test_sync_success_paid_plan(mock_db, mock_config, mock_asana, mocker):
     assert "Sync complete!" in result.stdout
     
     # Verify Asana calls
+    # Entries are dated by the session's own day, not the day of the sync
     mock_asana.__enter__.return_value.add_time_entry.assert_has_calls([
-        call('t1', 3600),
-        call('t2', 1800)
+        call('t1', 3600, entered_on=datetime.date.fromtimestamp(123)),
+        call('t2', 1800, entered_on=datetime.date.fromtimestamp(456))
     ])
     
     # Verify DB calls
@@ -51,7 +54,7 @@ def test_sync_success_free_plan(mock_db, mock_config, mock_asana, mocker):
     """
     mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
-    mocker.patch("gittask.commands.sync.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
     
     sessions = [
         {'id': 1, 'task_gid': 't1', 'duration_seconds': 3600, 'end_time': 123, 'branch': 'b1'}
@@ -66,7 +69,9 @@ def test_sync_success_free_plan(mock_db, mock_config, mock_asana, mocker):
     assert result.exit_code == 0
     assert "Sync complete!" in result.stdout
     
-    mock_asana.__enter__.return_value.log_time_comment.assert_called_with('t1', 3600, 'b1')
+    mock_asana.__enter__.return_value.log_time_comment.assert_called_with(
+        't1', 3600, 'b1', idempotency_key=delivery_key([1])
+    )
     mock_db.mark_session_synced.assert_called_with(1)
 
 def test_sync_no_token(mock_config, mocker):
@@ -87,7 +92,7 @@ def test_sync_nothing_to_sync(mock_db, mock_config, mock_asana, mocker):
     """
     mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
-    mocker.patch("gittask.commands.sync.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
     
     mocker.patch.object(mock_db, 'get_unsynced_sessions', return_value=[])
     
@@ -102,7 +107,7 @@ def test_sync_only_active_sessions(mock_db, mock_config, mock_asana, mocker):
     """
     mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
-    mocker.patch("gittask.commands.sync.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
     
     sessions = [
         {'id': 1, 'end_time': None}
@@ -120,7 +125,7 @@ def test_sync_failure(mock_db, mock_config, mock_asana, mocker):
     """
     mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
     mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
-    mocker.patch("gittask.commands.sync.AsanaClient", return_value=mock_asana)
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
     
     sessions = [
         {'id': 1, 'task_gid': 't1', 'duration_seconds': 3600, 'end_time': 123, 'branch': 'b1'},
@@ -142,3 +147,56 @@ def test_sync_failure(mock_db, mock_config, mock_asana, mocker):
     
     # Verify only second session marked synced
     mock_db.mark_session_synced.assert_called_once_with(2)
+
+def test_sync_coalesces_sessions_per_task_per_day(mock_db, mock_config, mock_asana, mocker):
+    """
+    Test many short sessions on one task and day become a single time entry.
+    """
+    mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
+    mocker.patch("gittask.services.sync.AsanaClient", return_value=mock_asana)
+    
+    day1 = datetime.datetime(2024, 5, 1, 9, 0).timestamp()
+    day2 = datetime.datetime(2024, 5, 2, 9, 0).timestamp()
+    sessions = [
+        {'id': 1, 'task_gid': 't1', 'duration_seconds': 20, 'start_time': day1, 'end_time': day1 + 20, 'branch': 'b1'},
+        {'id': 2, 'task_gid': 't1', 'duration_seconds': 30, 'start_time': day1 + 600, 'end_time': day1 + 630, 'branch': 'b1'},
+        {'id': 3, 'task_gid': 't1', 'duration_seconds': 50, 'start_time': day1 + 3600, 'end_time': day1 + 3650, 'branch': 'b1'},
+        {'id': 4, 'task_gid': 't1', 'duration_seconds': 120, 'start_time': day2, 'end_time': day2 + 120, 'branch': 'b1'},
+    ]
+    mocker.patch.object(mock_db, 'get_unsynced_sessions', return_value=sessions)
+    mocker.patch.object(mock_db, 'mark_session_synced')
+    mock_config.get_paid_plan_status.return_value = True
+    
+    result = runner.invoke(app, [])
+    
+    assert result.exit_code == 0
+    assert "Combined into 2 entries" in result.stdout
+    
+    client = mock_asana.__enter__.return_value
+    # 100 seconds in total on day 1: rounded once, not three times
+    assert client.add_time_entry.call_args_list == [
+        call('t1', 100, entered_on=datetime.date(2024, 5, 1)),
+        call('t1', 120, entered_on=datetime.date(2024, 5, 2)),
+    ]
+    assert mock_db.mark_session_synced.call_count == 4
+
+def test_sync_plan_does_not_touch_network(mock_db, mock_config, mocker):
+    mocker.patch("gittask.commands.sync.DBManager", return_value=mock_db)
+    mocker.patch("gittask.commands.sync.ConfigManager", return_value=mock_config)
+    client = mocker.patch("gittask.services.sync.AsanaClient")
+    mock_config.get_paid_plan_status.return_value = True
+    mock_db.link_branch_to_task("b1", "/tmp/repo", "t1", "Fix login", "p1", "w1")
+    mock_db.start_session("b1", "/tmp/repo", "t1")
+    mock_db.stop_any_active_session()
+
+    result = runner.invoke(app, ["--plan"])
+
+    assert result.exit_code == 0
+    assert "Fix login" in result.output
+    assert "time entry" in result.output
+    assert "1 HTTP requests" in result.output
+    assert "Estimated duration" in result.output
+    client.assert_not_called()
+    mock_config.get_api_token.assert_not_called()
+    assert mock_db.get_unsynced_sessions()[0]['delivery_state'] == 'pending'
@@ -0,0 +1,183 @@
+import pytest
+import datetime
+from unittest.mock import MagicMock
+from gittask import sync_engine
+
+def _closed_session(db, branch="b1", task_gid="t1", duration=600):
+    session_id = db.start_session(branch, "/tmp/repo", task_gid)
+    db.stop_any_active_session()
+    db.time_sessions.update({'duration_seconds': duration}, lambda s: s['id'] == session_id)
+    return db.time_sessions.get(lambda s: s['id'] == session_id)
+
+def test_delivery_key_is_deterministic():
+    assert sync_engine.delivery_key(['a', 'b']) == sync_engine.delivery_key(['b', 'a'])
+    assert sync_engine.delivery_key(['a']) != sync_engine.delivery_key(['b'])
+    assert sync_engine.delivery_key(['a']).startswith("gt-")
+
+def test_new_sessions_are_pending(mock_db):
+    session = _closed_session(mock_db)
+    assert session['delivery_state'] == 'pending'
+
+def test_deliver_marks_delivered(mock_db):
+    session = _closed_session(mock_db)
+    client = MagicMock()
+    client.add_time_entry.return_value = {'gid': 'entry1'}
+    
+    sync_engine.deliver_sessions(mock_db, client, [session], paid_plan=True, entered_on=datetime.date(2024, 5, 1))
+    
+    client.add_time_entry.assert_called_once_with('t1', 600, entered_on=datetime.date(2024, 5, 1))
+    stored = mock_db.time_sessions.get(doc_id=session.doc_id)
+    assert stored['delivery_state'] == 'delivered'
+    assert stored['synced_to_asana'] is True
+    assert stored['asana_entry_gid'] == 'entry1'
+
+def test_failure_leaves_session_in_flight(mock_db):
+    """
+    Test a request that may have reached Asana keeps the session in flight.
+    """
+    session = _closed_session(mock_db)
+    client = MagicMock()
+    client.add_time_entry.side_effect = TimeoutError("timed out")
+    
+    with pytest.raises(TimeoutError):
+        sync_engine.deliver_sessions(mock_db, client, [session], paid_plan=True)
+    
+    assert mock_db.get_unsynced_sessions()[0]['delivery_state'] == 'in_flight'
+
+def test_rejected_request_goes_back_to_pending(mock_db):
+    session = _closed_session(mock_db)
+    client = MagicMock()
+    error = Exception("Bad Request")
+    error.status = 400
+    client.add_time_entry.side_effect = error
+    
+    with pytest.raises(Exception):
+        sync_engine.deliver_sessions(mock_db, client, [session], paid_plan=True)
+    
+    assert mock_db.get_unsynced_sessions()[0]['delivery_state'] == 'pending'
+
+def test_reconcile_finds_posted_comment(mock_db):
+    """
+    Test a comment posted before a crash is detected by its idempotency key.
+    """
+    session = _closed_session(mock_db)
+    key = sync_engine.delivery_key([session['id']])
+    mock_db.set_sessions_in_flight([session['id']], key, '2024-05-01')
+    
+    client = MagicMock()
+    client.has_comment_with_key.return_value = True
+    
+    assert sync_engine.reconcile_in_flight(mock_db, client, paid_plan=False) == 1
+    client.has_comment_with_key.assert_called_once_with('t1', key)
+    assert mock_db.get_unsynced_sessions() == []
+
+def test_reconcile_finds_time_entry(mock_db):
+    session = _closed_session(mock_db, duration=600)
+    mock_db.set_sessions_in_flight([session['id']], 'key', '2024-05-01')
+    
+    client = MagicMock()
+    client.get_user_gid.return_value = 'me'
+    client.get_time_entries.return_value = [
+        {'gid': 'other_user', 'duration_minutes': 10, 'entered_on': '2024-05-01', 'created_by': {'gid': 'someone'}},
+        {'gid': 'wrong_day', 'duration_minutes': 10, 'entered_on': '2024-05-02', 'created_by': {'gid': 'me'}},
+        {'gid': 'match', 'duration_minutes': 10, 'entered_on': '2024-05-01', 'created_by': {'gid': 'me'}},
+    ]
+    
+    assert sync_engine.reconcile_in_flight(mock_db, client, paid_plan=True) == 1
+    stored = mock_db.time_sessions.get(doc_id=session.doc_id)
+    assert stored['delivery_state'] == 'delivered'
+    assert stored['asana_entry_gid'] == 'match'
+
+def test_reconcile_ignores_claimed_entries(mock_db):
+    """
+    Test an entry already matched to another session is not claimed twice.
+    """
+    first = _closed_session(mock_db, duration=600)
+    mock_db.set_session_entry_gid(first['id'], 'entry1')
+    mock_db.mark_session_synced(first['id'])
+    
+    second = _closed_session(mock_db, duration=600)
+    mock_db.set_sessions_in_flight([second['id']], 'key', '2024-05-01')
+    
+    client = MagicMock()
+    client.get_user_gid.return_value = 'me'
+    client.get_time_entries.return_value = [
+        {'gid': 'entry1', 'duration_minutes': 10, 'entered_on': '2024-05-01', 'created_by': {'gid': 'me'}},
+    ]
+    
+    assert sync_engine.reconcile_in_flight(mock_db, client, paid_plan=True) == 0
+    assert mock_db.get_unsynced_sessions()[0]['delivery_state'] == 'pending'
+
+def test_group_sessions_by_task_and_day():
+    day1 = datetime.datetime(2024, 5, 1, 23, 0).timestamp()
+    day2 = datetime.datetime(2024, 5, 2, 1, 0).timestamp()
+    sessions = [
+        {'id': 1, 'task_gid': 't1', 'start_time': day1, 'end_time': day1 + 60},
+        {'id': 2, 'task_gid': 't2', 'start_time': day1, 'end_time': day1 + 60},
+        {'id': 3, 'task_gid': 't1', 'start_time': day2, 'end_time': day2 + 60},
+        {'id': 4, 'task_gid': 't1', 'start_time': day1 + 60, 'end_time': day1 + 120},
+    ]
+    
+    groups = sync_engine.group_sessions(sessions)
+    
+    assert [[s['id'] for s in g] for g in groups] == [[1, 4], [2], [3]]
+
+def test_deliver_group_as_single_comment(mock_db):
+    first = _closed_session(mock_db, branch="b1", duration=20)
+    second = _closed_session(mock_db, branch="b2", duration=30)
+    client = MagicMock()
+    
+    sync_engine.deliver_sessions(mock_db, client, [first, second], paid_plan=False)
+    
+    key = sync_engine.delivery_key([first['id'], second['id']])
+    client.log_time_comment.assert_called_once_with('t1', 50, 'b1, b2', idempotency_key=key)
+    assert mock_db.get_unsynced_sessions() == []
+
+def test_plan_groups_and_counts_requests(mock_db):
+    _closed_session(mock_db, branch="b1", task_gid="t1")
+    _closed_session(mock_db, branch="b2", task_gid="t1")
+    _closed_session(mock_db, branch="b3", task_gid="t2")
+    mock_db.start_session("b4", "/tmp/repo", "t3")
+    mock_db.enqueue_outbox('complete_task', "t2", {})
+
+    plan = sync_engine.plan_sync(mock_db, paid_plan=True, batch_size=1)
+
+    assert [(d['task_gid'], d['kind'], len(d['sessions'])) for d in plan['deliveries']] == [
+        ("t1", 'time_entry', 2), ("t2", 'time_entry', 1),
+    ]
+    assert plan['deliveries'][0]['minutes'] == 20
+    assert len(plan['batches']) == 2
+    assert plan['queued'] == 1
+    assert plan['requests'] == [
+        "PUT /tasks/{gid}",
+        "POST /tasks/{gid}/time_tracking_entries",
+        "POST /tasks/{gid}/time_tracking_entries",
+    ]
+
+def test_plan_includes_reconciling_interrupted_sync(mock_db):
+    session = _closed_session(mock_db)
+    mock_db.set_sessions_in_flight([session['id']], "gt-key", "2024-05-01")
+
+    plan = sync_engine.plan_sync(mock_db, paid_plan=False)
+
+    assert plan['deliveries'] == []
+    assert plan['interrupted'] == 1
+    assert plan['requests'] == ["GET /tasks/{gid}/stories"]
+
+def test_estimate_uses_measured_latency_and_rate_limits():
+    plan = {'paid_plan': False, 'requests': ["POST /tasks/{gid}/stories"] * 300}
+    records = [
+        {'service': "asana", 'endpoint': "POST /tasks/{gid}/stories", 'duration_ms': 100.0, 'status': 201},
+        {'service': "asana", 'endpoint': "GET /tasks/{gid}", 'duration_ms': 50.0, 'status': 429,
+         'ts': 1000.0, 'rate_limit': {'retry-after': "30"}},
+    ]
+
+    estimate = sync_engine.estimate_duration(plan, records, now=1010.0)
+
+    # 300 requests on the free plan's 150/min: the second half waits a minute
+    assert estimate['seconds'] == 60 + 20
+    assert estimate['retry_wait'] == 20
+    assert estimate['measured'] == 1
+
+    estimate = sync_engine.estimate_duration({'paid_plan': True, 'requests': ["GET /users/me"] * 10}, [], now=0)
+    assert estimate['seconds'] == 10 * sync_engine.DEFAULT_LATENCY_MS / 1000
@@ -105,10 +105,11 @@ def test_tags_add_success(mock_db, mock_git, mock_config, mock_asana, mocker):
     assert "Applying 2 tags..." in result.stdout
     assert "Tags added successfully" in result.stdout
     
-    mock_asana.__enter__.return_value.add_tag_to_task.assert_has_calls([
-        mocker.call('task123', 'tag1'),
-        mocker.call('task123', 'tag2')
-    ])
+    entries = mock_db.get_outbox_entries(['pending'])
+    assert [(e['op'], e['args']) for e in entries] == [
+        ('add_tag_to_task', {'tag_gid': 'tag1'}),
+        ('add_tag_to_task', {'tag_gid': 'tag2'})
+    ]
 
 def test_tags_add_not_linked(mock_db, mock_git, mocker):
     """
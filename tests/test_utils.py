@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import MagicMock
+from gittask import utils
+
+PROJECTS = [
+    {'gid': 'p1', 'name': 'Mobile App Redesign'},
+    {'gid': 'p2', 'name': 'Backend Platform'},
+    {'gid': 'p3', 'name': 'Marketing Website'},
+]
+
+def test_fuzzy_pick():
+    assert utils.fuzzy_pick(PROJECTS, "backend platform")['gid'] == 'p2'
+    assert utils.fuzzy_pick(PROJECTS, "mobile redesign")['gid'] == 'p1'
+    assert utils.fuzzy_pick(PROJECTS, "zzzz") is None
+
+def test_fuzzy_completer_ranks_matches():
+    from prompt_toolkit.document import Document
+    completer = utils.FuzzyCompleter([p['name'] for p in PROJECTS])
+    
+    completions = list(completer.get_completions(Document("markting"), None))
+    
+    assert completions[0].text == "Marketing Website"
+
+def test_load_projects_uses_fresh_cache(mock_db, mocker):
+    client = MagicMock()
+    client.get_projects.return_value = PROJECTS
+    
+    assert len(utils.load_projects(client, mock_db, 'ws1')) == 3
+    assert len(utils.load_projects(client, mock_db, 'ws1')) == 3
+    client.get_projects.assert_called_once_with('ws1')
+    
+    # Stale caches are refreshed
+    mocker.patch("gittask.utils.time.time", return_value=mock_db.get_listing_refreshed_at('projects', 'ws1') + utils.LISTING_MAX_AGE + 1)
+    utils.load_projects(client, mock_db, 'ws1')
+    assert client.get_projects.call_count == 2
+
+def test_load_projects_falls_back_to_cache(mock_db):
+    mock_db.cache_projects('ws1', PROJECTS)
+    client = MagicMock()
+    client.get_projects.side_effect = Exception("API Error")
+    
+    assert len(utils.load_projects(client, mock_db, 'ws1', refresh=True)) == 3
+
+def test_large_lists_use_fuzzy_prompt(mocker):
+    items = [{'gid': str(i), 'name': f"Project {i}"} for i in range(utils.SELECT_MENU_LIMIT + 5)]
+    mock_questionary = mocker.patch("gittask.utils.questionary")
+    mock_questionary.autocomplete.return_value.ask.side_effect = ["nothing like it", "Project 17"]
+    
+    assert utils.select_from_listing("Pick:", items) == '17'
+    mock_questionary.select.assert_not_called()
+    assert mock_questionary.autocomplete.call_count == 2